@@ -3,10 +3,11 @@ from parapy.core import *
 from parapy.geom import *
 
 from Geometry.section import Section
-import warnings
+from Geometry.component import Component
+from HelperFunction.help_fucntions import report_clamp
 
 
-class HorizontalTail(GeomBase):
+class HorizontalTail(Component):
     name = Input("horizontal_tail")
     htp_root_airfoil = Input("Boeing29root")  # Airfoil input for the root chord of the horizontal tail
     htp_tip_airfoil = Input("lockheedtip")  # Airfoil input for the tip chord of the horizontal tail
@@ -17,13 +18,9 @@ class HorizontalTail(GeomBase):
     starting_point_mac = Input()  # starting position of the wing M.A.C
     wing_sweep_025c = Input()  # Quarter chord wing sweep
     MAC_chord_length = Input()  # The mean aerodynamic chord length of the wing
+    Vh = Input(1.)  # Horizontal tail volume coefficient
 
     # ******************* Fixed value *******************
-    @Attribute
-    # Horizontal tail volume coefficient
-    def Vh(self):
-        return 1
-
     # horizontal tail aspect ratio
     @Attribute
     def htp_aspect(self):
@@ -85,7 +82,8 @@ class HorizontalTail(GeomBase):
     def solid(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
 
     #########################################################################################
     # Calculating the MAC of the HTP
@@ -114,7 +112,8 @@ class HorizontalTail(GeomBase):
         return LineSegment(Point(self.starting_point_mac_htp, self.htp_mac_y_pos, 2.5),
                            Point(self.starting_point_mac_htp + self.htp_mac, self.htp_mac_y_pos, 2.5),
                            line_thickness=5,
-                           color="red")
+                           color="red",
+                           suppress=self.analysis_only)
 
     # states the coordinates of the aerodynamic center of the horizontal tail
     @Attribute
@@ -129,7 +128,8 @@ class HorizontalTail(GeomBase):
     def htp_ac(self):
         return Sphere(radius=0.2,
                       position=Position(self.ac_pnt_htp),
-                      color="green")
+                      color="green",
+                      suppress=self.analysis_only)
 
     # ******************** Warnings *********************
     popup_gui = Input(True)
@@ -138,9 +138,7 @@ class HorizontalTail(GeomBase):
     def h_taper_ratio(self):
         if self.htp_taper < 0.24 or self.htp_taper > 0.4:
             msg = "The horizontal tail taper ratio value must be between 0.24 - 0.4"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: htp_taper value changed", msg)
+            report_clamp("htp_taper", self.htp_taper, 0.256, [0.24, 0.4], msg, self.popup_gui)
             return 0.256
         else:
             return self.htp_taper
@@ -150,9 +148,7 @@ class HorizontalTail(GeomBase):
         if self.htp_area < 30 or self.htp_area > 37:
             msg = "Area of horizontal tail if greater than 37 has a small tail arm moment and if less than 30 has " \
                   "insufficient fuselage length "
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: htp_area value changed", msg)
+            report_clamp("htp_area", self.htp_area, 31, [30, 37], msg, self.popup_gui)
             return 31
         else:
             return self.htp_area
@@ -161,44 +157,12 @@ class HorizontalTail(GeomBase):
     def dihedral_htp(self):
         if self.htp_dihedral < 0 or self.htp_dihedral > 7:
             msg = "Invalid dihedral value. Input should be between 0 - 7"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: htp_dihedral value changed", msg)
+            report_clamp("htp_dihedral", self.htp_dihedral, 5, [0, 7], msg, self.popup_gui)
             return 5
         else:
             return self.htp_dihedral
 
 
-def generate_warning(warning_header, msg):
-    from tkinter import Tk, messagebox
-
-    # initializing
-    window = Tk()
-    window.withdraw()
-
-    # generates message box
-    messagebox.showwarning(warning_header, msg)
-
-    # kills the GUI
-    window.deiconify()
-    window.destroy()
-    window.quit()
-    # ***************************************************
-
-    '''
-    @Part
-    def avl_surface(self):
-        return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.cosine,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.cosine,
-                           y_duplicate=self.position.point[1],
-                           sections=[section.avl_section
-                                     for section in self.sections])
-    '''
-
-
 '''
 if __name__ == '__main__':
         from parapy.gui import display
@@ -2,32 +2,28 @@ from __future__ import division
 from math import sqrt
 from Geometry.wing import *
 from Geometry.fuselage import *
+from Geometry.component import Component
 from HelperFunction.help_fucntions import *
 
 
-class VerticalTail(GeomBase):
+class VerticalTail(Component):
     name = Input()  # Specifies name of the part
     vtp_root_airfoil = Input()  # Vertical tail root airfoil NACA input
     vtp_tip_airfoil = Input()  # Vertical tail tip airfoil NACA input
     vtp_aspect_ratio = Input()  # Vertical tail aspect ratio
     vtp_sweep = Input()  # Vertical tail sweep input
     vtp_area = Input()  # Vertical tail area
-    htp_area = Input()  # Horizontal tail area calculated in the class HorizontalTail. Used here for calculations
-    lh = Input()  # Horizontal tail, arm length calculated in class HorizontalTail. Used here for calculations
-    Vh = Input()  # Horizontal tail volume coefficient. Calculated in class HorizontalTail. Used here for calculations
+    wing_area = Input()  # Total wing area taken from class Wing. Used here for calculations
     MAC_chord_length = Input()  # Wing mach length
     starting_point_mac = Input()  # Starting position of the wing MAC line w.r.t (0,0,0)
     cabin_d = Input()  # Cabin diameter taken from class Fuselage
     wing_span = Input()  # Wing span taken from class Wing.
 
-    # ******************* Fixed values *******************
-
-    # This input value has been set to a fixed value because according to the reference material:
-    # For a commercial jet transport, typical value for the tail volume
+    # According to the reference material: for a commercial jet transport, typical value for the tail volume
     # coefficient is around 0.083  for the vertical tail.
-    @Attribute
-    def Vv(self):
-        return 0.083
+    Vv = Input(0.083)
+
+    # ******************* Fixed values *******************
 
     # For a typical jet transport, according to the reference material:
     # the taper ratio for must be 0.3 for a vertical tail with low set horizontal tail
@@ -50,10 +46,11 @@ class VerticalTail(GeomBase):
     def vtp_c_tip(self):
         return self.vtp_c_root * self.vtp_taper
 
-    # Calculating the tail arm (lv)
+    # Calculating the tail arm (lv) from the vertical tail volume coefficient Vv = Sv * lv / (S * b). It does not
+    # depend on the horizontal tail, so both tails are sized independently from the wing
     @Attribute
     def vtp_tailarm(self):
-        return (self.Vv * self.htp_area * self.lh * self.wing_span) / (self.Vh * self.MAC_chord_length * self.area_vtp)
+        return (self.Vv * self.wing_area * self.wing_span) / self.area_vtp
 
         #########################################################################################
 
@@ -90,7 +87,8 @@ class VerticalTail(GeomBase):
     def solid(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
 
     # *********************************************************************************
     # Calculating MAC length and the aerodynamic center for the vertical tail
@@ -120,7 +118,8 @@ class VerticalTail(GeomBase):
                            Point((self.starting_pt_mac_vtp + self.MAC_length_vtp), 1,
                                  (0.5 * self.cabin_d + (self.mac_y_pos_vtp))),
                            line_thickness=5,
-                           color="orange")
+                           color="orange",
+                           suppress=self.analysis_only)
 
     # States the  aerodynamic center of the vertical tail
     @Attribute
@@ -135,7 +134,8 @@ class VerticalTail(GeomBase):
     def vtp_ac(self):
         return Sphere(radius=0.2,
                       position=Position(self.ac_pt_vtp),
-                      color="green")
+                      color="green",
+                      suppress=self.analysis_only)
 
     # ***************************************** Warnings************************************************
     popup_gui = Input(True)
@@ -144,9 +144,7 @@ class VerticalTail(GeomBase):
     def sweep_vtp(self):
         if self.vtp_sweep < 35 or self.vtp_sweep > 40:
             msg = "The vertical tail sweep should be between 35 and 40 degrees"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: vtp_sweep value changed", msg)
+            report_clamp("vtp_sweep", self.vtp_sweep, 35, [35, 40], msg, self.popup_gui)
             return 35
         else:
             return self.vtp_sweep
@@ -155,9 +153,7 @@ class VerticalTail(GeomBase):
     def aspect_vtp(self):
         if self.vtp_aspect_ratio < 1.7 or self.vtp_aspect_ratio > 1.95:
             msg = "Aspect ratio of vertical tail must be between 1.7 and 1.95"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: Vtp_aspect_ratio value changed", msg)
+            report_clamp("vtp_aspect_ratio", self.vtp_aspect_ratio, 1.82, [1.7, 1.95], msg, self.popup_gui)
             return 1.82
         else:
             return self.vtp_aspect_ratio
@@ -166,30 +162,12 @@ class VerticalTail(GeomBase):
     def area_vtp(self):
         if self.vtp_area < 21.5 or self.vtp_area > 26.5:
             msg = "Vertical tail area must be in the range 21.5 and 26.5"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: vtp_area value changed", msg)
+            report_clamp("vtp_area", self.vtp_area, 21.5, [21.5, 26.5], msg, self.popup_gui)
             return 21.5
         else:
             return self.vtp_area
 
 
-def generate_warning(warning_header, msg):
-    from tkinter import Tk, messagebox
-
-    # initialization
-    window = Tk()
-    window.withdraw()
-
-    # generates the message box
-    messagebox.showwarning(warning_header, msg)
-
-    # kills the GUI
-    window.deiconify()
-    window.destroy()
-    window.quit()
-
-
 ''' 
 if__name__ == '__main__':
     from parapy.gui import display
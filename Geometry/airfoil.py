@@ -15,6 +15,7 @@
 from parapy.geom import *
 from parapy.core import *
 from Geometry.ref_frame import Frame
+from Geometry.airfoil_library import load_airfoil, place_airfoil
 import os
 import pathlib
 
@@ -24,27 +25,30 @@ class Airfoil(FittedCurve):  # note the use of FittedCurve as superclass
     airfoil_name = Input("whitcomb")
     thickness_factor = Input(1.)
     mesh_deflection = Input(0.0001)
+    analysis_only = Input(False)  # skip the reference frame, which is only needed for display
 
     cur_path = pathlib.Path().absolute()
 
     @Attribute
     def points(self):  # required input to the FittedCurve superclass
-        airfoils_path = os.path.join(self.cur_path, 'Airfoils', self.airfoil_name)
-        with open(airfoils_path + ".dat", 'r') as f:
-            point_lst = []
-            for line in f:
-                x, z = line.split(' ', 1)  # the cartesian coordinates are directly interpreted as X and Z coordinates
-                point_lst.append(self.position.translate(
-                   "x", float(x)*self.chord,  # the x points are scaled according to the airfoil chord length
-                   "z", float(z)*self.chord*self.thickness_factor)) # the y points are scaled according to the /
-                # thickness factor
-        return point_lst
-
+        # the coordinates are read once per process and shared by all airfoils with the same name
+        coordinates = load_airfoil(self.airfoil_name, os.path.join(str(self.cur_path), 'Airfoils'))
+        # the x points are scaled according to the airfoil chord length, the z points according to the thickness
+        # factor, and both are directly interpreted as coordinates along the X and Z axis of the airfoil position
+        pos = self.position
+        points = place_airfoil(coordinates,
+                               (pos.point.x, pos.point.y, pos.point.z),
+                               (pos.Vx.x, pos.Vx.y, pos.Vx.z),
+                               (pos.Vz.x, pos.Vz.y, pos.Vz.z),
+                               self.chord,
+                               self.thickness_factor)
+        return [Point(x, y, z) for x, y, z in points.tolist()]
 
     @Part
     def airfoil_frame(self):  # to visualize the given airfoil reference frame
         return Frame(pos=self.position,
-                     hidden=False)
+                     hidden=False,
+                     suppress=self.analysis_only)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+import glob
+import os
+from functools import lru_cache
+
+import numpy as np
+
+
+def _read_dat(path):
+    # the .dat files hold one "x z" pair per line, running from the trailing edge over the upper side to the
+    # leading edge and back over the lower side
+    return np.loadtxt(path, dtype=float, ndmin=2)
+
+
+def _validate(coordinates, name):
+    # the coordinates are used as they are in the file, e.g. simm_airfoil runs to x = 1.01, like the original reader
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2 or coordinates.shape[0] < 3:
+        raise ValueError("Airfoil '{:}' must have at least 3 points with two coordinates each".format(name))
+    if not np.all(np.isfinite(coordinates)):
+        raise ValueError("Airfoil '{:}' contains coordinates that are not finite numbers".format(name))
+    if coordinates[:, 0].max() <= coordinates[:, 0].min():
+        raise ValueError("Airfoil '{:}' has no chord length".format(name))
+    return coordinates
+
+
+@lru_cache(maxsize=None)
+def load_airfoil(name, directory):
+    """
+    This function loads the coordinates of an airfoil once per process. A pre-converted binary file (name.npy, see
+    convert_airfoils) is memory-mapped when it is at least as new as the .dat file.
+    :param name: name of the airfoil, i.e. the file name without extension
+    :param directory: folder holding the airfoil files
+    :return: read-only array of shape (number of points, 2) with the x and z coordinates of the file, for unit chord
+    """
+    dat_path = os.path.join(directory, name + ".dat")
+    npy_path = os.path.join(directory, name + ".npy")
+    if os.path.exists(npy_path) and (not os.path.exists(dat_path) or
+                                     os.path.getmtime(npy_path) >= os.path.getmtime(dat_path)):
+        coordinates = np.load(npy_path, mmap_mode="r")
+    else:
+        coordinates = _read_dat(dat_path)
+    coordinates = _validate(coordinates, name)
+    if coordinates.flags.writeable:
+        coordinates.setflags(write=False)
+    return coordinates
+
+
+def convert_airfoils(directory):
+    """
+    This function writes the coordinates of every .dat file in a folder to a binary .npy file next to it
+    :param directory: folder holding the airfoil files
+    :return: list of the written files
+    """
+    written = []
+    for dat_path in sorted(glob.glob(os.path.join(directory, "*.dat"))):
+        name = os.path.splitext(os.path.basename(dat_path))[0]
+        npy_path = os.path.join(directory, name + ".npy")
+        np.save(npy_path, _validate(_read_dat(dat_path), name))
+        written.append(npy_path)
+    return written
+
+
+def place_airfoil(coordinates, origin, x_axis, z_axis, chord=1., thickness_factor=1.):
+    """
+    This function scales airfoil coordinates and places them in 3D in one vectorized operation
+    :param coordinates: unit chord airfoil coordinates, array of shape (n, 2)
+    :param origin: position of the leading edge, (x, y, z)
+    :param x_axis: direction of the chord, (x, y, z)
+    :param z_axis: direction of the thickness, (x, y, z)
+    :param chord: chord length
+    :param thickness_factor: scaling of the thickness
+    :return: array of shape (n, 3)
+    """
+    return (np.asarray(origin, dtype=float) +
+            np.outer(coordinates[:, 0] * chord, np.asarray(x_axis, dtype=float)) +
+            np.outer(coordinates[:, 1] * chord * thickness_factor, np.asarray(z_axis, dtype=float)))
@@ -0,0 +1,21 @@
+from parapy.geom import *
+from parapy.core import *
+from HelperFunction.panel_policy import surface_panels
+
+
+class Component(GeomBase):
+    """Base of the components of the Aircraft. With analysis_only, a component only builds what the AVL analysis
+    needs: the solids and markers that are only needed for display and export are suppressed."""
+    analysis_only = Input(False)
+
+
+class LiftingSurface(Component):
+    """Base of the wing and the winglets, of which the AVL surface is discretized with a PanelPolicy
+    (HelperFunction/panel_policy.py). The default panel counts are used when panel_policy is None. Subclasses have
+    sections, from root to tip."""
+    panel_policy = Input(None)
+
+    @Attribute
+    # panel counts and spacings of the AVL surface, see PanelPolicy
+    def avl_panels(self):
+        return surface_panels(self.panel_policy, self.sections)
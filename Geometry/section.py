@@ -4,6 +4,29 @@ from parapy.geom import *
 from parapy.core import *
 from Geometry import Airfoil
 import kbeutils.avl as avl
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def unit_airfoil_curve(airfoil_name, mesh_deflection):
+    """
+    This function builds the unit chord curve of an airfoil at the origin once per process, so that sections and
+    aircraft with the same airfoil share it, e.g. the blended sections of the Sharklet. The curve is not part of any
+    product tree and its inputs never change, so it is never invalidated; a Section only places and scales it.
+    :param airfoil_name: "NACA" followed by 4 or 5 digits, or the name of a file in the Airfoils folder
+    :param mesh_deflection: mesh deflection of the curve
+    :return: curve with the leading edge at the origin
+    """
+    if airfoil_name[0:4] == "NACA":
+        designation = airfoil_name[4:]
+        return (Naca5AirfoilCurve if len(designation) == 5 else Naca4AirfoilCurve)(designation=designation,
+                                                                                   mesh_deflection=mesh_deflection,
+                                                                                   hidden=True)
+    # the coordinates of the file are read once per process, see Geometry/airfoil_library.py
+    return Airfoil(airfoil_name=airfoil_name,
+                   mesh_deflection=mesh_deflection,
+                   analysis_only=True,
+                   hidden=True)
 
 
 class Section(GeomBase):
@@ -11,6 +34,8 @@ class Section(GeomBase):
     # airfoil_name = Input(validator=_len_4_or_5)
     airfoil_name = Input("NACA2410")
     chord = Input()
+    n_spanwise = Input(None)  # spanwise AVL panels from this section to the next one, None for those of the surface
+    span_spacing = Input(None)
 
 
     @Attribute
@@ -21,17 +46,12 @@ class Section(GeomBase):
     def airfoil_code(self):
         return self.airfoil_name[4:len(self.airfoil_name)] if self.isNACA == True else 0
 
-    @Part(parse=False)
-    def airfoil(self):
-        if self.isNACA:
-            return DynamicType(type=Naca5AirfoilCurve if len(self.airfoil_name) == 5 else Naca4AirfoilCurve,
-                               designation=self.airfoil_code,
-                               mesh_deflection=0.00001,
-                               hidden=True)
-        else:
-            return Airfoil(airfoil_name=self.airfoil_name,
-                           mesh_deflection=0.0001,
-                           hidden=True)
+    @Part
+    def airfoil(self):  # the shared unit chord curve (see unit_airfoil_curve), placed at this section
+        return TransformedCurve(curve_in=unit_airfoil_curve(self.airfoil_name, 0.00001 if self.isNACA else 0.0001),
+                                from_position=Position(ORIGIN),
+                                to_position=self.position,
+                                hidden=True)
 
     @Part
     def curve(self):
@@ -56,7 +76,9 @@ class Section(GeomBase):
 
     @Part  # the camber of the airfoil is accounted. Any curve is allowed. It includes avl_section_by_points
     def avl_section(self):
-        return avl.SectionFromCurve(curve_in=self.curve)
+        return avl.SectionFromCurve(curve_in=self.curve,
+                                    n_spanwise=self.n_spanwise,
+                                    span_spacing=self.span_spacing)
 
 
 if __name__ == '__main__':
@@ -4,12 +4,12 @@ from parapy.geom import *
 from parapy.core import *
 from HelperFunction.help_fucntions import *
 from Geometry.section import Section
-import warnings
+from Geometry.component import LiftingSurface
 
 
 # This class generates a wing shaped profile
 
-class Wing(GeomBase):
+class Wing(LiftingSurface):
     name = Input("Wing")  # name of the part generated
     # supercritical: 1, NACA-6: 2, Conventional: 3.
     TYPE_airfoil = Input()  # This lets the user switch between the type of airfoil thus changing the mach technology factor
@@ -166,7 +166,8 @@ class Wing(GeomBase):
         return LineSegment(Point(self.starting_point_mac, self.y_mac, 0),
                            Point((self.starting_point_mac + self.MAC_chord_length), self.y_mac, 0),
                            line_thickness=5,
-                           color="red")
+                           color="red",
+                           suppress=self.analysis_only)
 
     # gives the coordinates of the aerodynamic center of the wing
     @Attribute
@@ -181,7 +182,8 @@ class Wing(GeomBase):
     def wing_ac(self):
         return Sphere(radius=0.2,
                       position=Position(self.ac_pnt_wing),
-                      color="green")
+                      color="green",
+                      suppress=self.analysis_only)
 
     @Attribute
     def chords(self):
@@ -227,15 +229,16 @@ class Wing(GeomBase):
     @Part
     def solid(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
-                           ruled=True)
+                           ruled=True,
+                           suppress=self.analysis_only)
 
     @Part
     def avl_surface(self):
         return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.equal,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.equal,
+                           n_chordwise=self.avl_panels[0],
+                           chord_spacing=self.avl_panels[1],
+                           n_spanwise=self.avl_panels[2],
+                           span_spacing=self.avl_panels[3],
                            y_duplicate=self.position.point[1],
                            sections=[section.avl_section
                                      for section in self.sections])
@@ -248,9 +251,7 @@ class Wing(GeomBase):
     def cruise_mach(self):
         if self.M_cruise < 0.68 or self.M_cruise > 0.92:
             msg = "Invalid mach number. Accepted values between 0.68 - 0.92"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: M_cruise Value changed", msg)
+            report_clamp("M_cruise", self.M_cruise, 0.756, [0.68, 0.92], msg, self.popup_gui)
             return 0.756
         else:
             return self.M_cruise
@@ -259,9 +260,7 @@ class Wing(GeomBase):
     def wing_twist(self):
         if self.twist < -5 or self.twist > 0:
             msg = "Invalid wing twist value. it must range from -5 to 0"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: twist value of wing is changed", msg)
+            report_clamp("twist", self.twist, -5, [-5, 0], msg, self.popup_gui)
             return -5
         else:
             return self.twist
@@ -270,9 +269,7 @@ class Wing(GeomBase):
     def wing_incidence(self):
         if self.incidence < 0 or self.incidence > 5:
             msg = "Invalid wing incidence. it must range from 0 to 5"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: incidence value of wing is changed", msg)
+            report_clamp("incidence", self.incidence, 3, [0, 5], msg, self.popup_gui)
             return 3
         else:
             return self.incidence
@@ -281,9 +278,7 @@ class Wing(GeomBase):
     def span_wing(self):
         if self.wing_span < 32 or self.wing_span > 34.5:
             msg = "invalid wing span. It must range from 32 - 34.5"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: wing_span value changed", msg)
+            report_clamp("wing_span", self.wing_span, 34, [32, 34.5], msg, self.popup_gui)
             return 34
         else:
             return self.wing_span
@@ -292,9 +287,7 @@ class Wing(GeomBase):
     def inboard_taper(self):
         if self.wing_taper_ratio_inboard < 0.38 or self.wing_taper_ratio_inboard > 0.48:
             msg = "invalid inboard wing taper ratio. Must be between 0.38 - 0.48"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: wing_taper_ratio_inboard value changed", msg)
+            report_clamp("wing_taper_ratio_inboard", self.wing_taper_ratio_inboard, 0.48, [0.38, 0.48], msg, self.popup_gui)
             return 0.48
         else:
             return self.wing_taper_ratio_inboard
@@ -303,9 +296,7 @@ class Wing(GeomBase):
     def chord_wingroot(self):
         if self.wing_c_root < 6.3 or self.wing_c_root > 7.5:
             msg = "invalid wing root chord length. Must be between 6.3 - 7.5"
-            warnings.warn(msg)
-            if self.popup_gui:
-                generate_warning("Warning: wing_c_root value changed", msg)
+            report_clamp("wing_c_root", self.wing_c_root, 7, [6.3, 7.5], msg, self.popup_gui)
             return 7
         else:
             return self.wing_c_root
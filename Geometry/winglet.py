@@ -1,13 +1,14 @@
 from parapy.geom import *
 from parapy.core import *
 from Geometry.section import Section
+from Geometry.component import LiftingSurface
 import kbeutils.avl as avl
 import numpy as np
 from HelperFunction.help_fucntions import *
 from parapy.core.validate import *
 
 
-class CantedWinglet(GeomBase):
+class CantedWinglet(LiftingSurface):
     name = Input("Canted Wingelet")
     airfoil_root = Input()
     airfoil_tip = Input()
@@ -56,15 +57,16 @@ class CantedWinglet(GeomBase):
     def surface(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
 
     @Part
     def avl_surface(self):
         return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.equal,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.equal,
+                           n_chordwise=self.avl_panels[0],
+                           chord_spacing=self.avl_panels[1],
+                           n_spanwise=self.avl_panels[2],
+                           span_spacing=self.avl_panels[3],
                            y_duplicate=self.avl_duplicate_pos[1],
                            sections=[section.avl_section
                                      for section in self.sections])
@@ -95,7 +97,7 @@ class CantedWinglet(GeomBase):
         self.height_ratio = check_slot_change('height_ratio', new, old, [0.05, 0.1])
 
 
-class WingtipFence(GeomBase):
+class WingtipFence(LiftingSurface):
     name = Input("Wingtip Fence")
     # 0.1645 0.7862 0.1722 0.4778 0.5063 53 66 0 0
     airfoil_up = Input()
@@ -155,21 +157,22 @@ class WingtipFence(GeomBase):
     def surface(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
 
     @Part
     def avl_surface(self):
         return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.equal,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.equal,
+                           n_chordwise=self.avl_panels[0],
+                           chord_spacing=self.avl_panels[1],
+                           n_spanwise=self.avl_panels[2],
+                           span_spacing=self.avl_panels[3],
                            y_duplicate=self.avl_duplicate_pos[1],
                            sections=[section.avl_section
                                      for section in self.sections])
 
 
-class RakedWingtip(GeomBase):
+class RakedWingtip(LiftingSurface):
     name = Input("RakedWingtip")
 
     airfoil_start = Input()
@@ -213,15 +216,16 @@ class RakedWingtip(GeomBase):
     def surface(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
 
     @Part
     def avl_surface(self):
         return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.equal,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.equal,
+                           n_chordwise=self.avl_panels[0],
+                           chord_spacing=self.avl_panels[1],
+                           n_spanwise=self.avl_panels[2],
+                           span_spacing=self.avl_panels[3],
                            y_duplicate=self.avl_duplicate_pos[1],
                            sections=[section.avl_section
                                      for section in self.sections])
@@ -240,7 +244,7 @@ class RakedWingtip(GeomBase):
         self.taper_ratio = check_slot_change("taper_ratio", new, old, [0.15, 0.3])
 
 
-class Sharklet(GeomBase):
+class Sharklet(LiftingSurface):
     name = Input("Sharklet")
 
     airfoil_start = Input()
@@ -260,6 +264,7 @@ class Sharklet(GeomBase):
     twist = Input()
     dihedral = Input()
     nu_blended_sections = Input(10)  # number of sections between start and mid
+    max_panel_angle = Input(5.)  # largest turn of the surface across one spanwise AVL panel [deg]
 
     avl_duplicate_pos = Input()
 
@@ -353,21 +358,40 @@ class Sharklet(GeomBase):
         return Section(quantify=len(self.chords),
                        airfoil_name=self.airfoils[child.index],
                        chord=self.chords[child.index],
-                       position=self.section_positions[child.index])
+                       position=self.section_positions[child.index],
+                       n_spanwise=self.section_n_spanwise[child.index],
+                       span_spacing=self.avl_panels[3])
 
     @Part
     def surface(self):
         return LoftedSolid(profiles=[section.curve for section in self.sections],
                            ruled=True,
-                           mesh_deflection=0.0001)
+                           mesh_deflection=0.0001,
+                           suppress=self.analysis_only)
+
+    @Attribute
+    # spanwise AVL panels from every section to the next one (AVL ignores the count of the last section). The panels
+    # of the surface are distributed over the arc length, and the blended transition gets more of them where it turns,
+    # so that no panel spans more than max_panel_angle of the arc
+    def section_n_spanwise(self):
+        points = np.array([[pos.point.y, pos.point.z] for pos in self.section_positions])
+        lengths = np.hypot(*np.diff(points, axis=0).T)
+        # local dihedral of the sections, from their spanwise axis
+        angles = np.array([np.arctan2(pos.Vy.z, pos.Vy.y) for pos in self.section_positions])
+        turns = np.abs(np.diff(angles))
+        by_length = np.ceil(self.avl_panels[2] * lengths / lengths.sum())
+        by_turn = np.ceil(turns / np.deg2rad(self.max_panel_angle))
+        counts = np.maximum(np.maximum(by_length, by_turn), 1).astype(int)
+        return [int(count) for count in counts] + [1]
 
     @Part
     def avl_surface(self):
+        # no spanwise panels for the surface, as AVL would use those instead of the ones of the sections
         return avl.Surface(name=self.name,
-                           n_chordwise=12,
-                           chord_spacing=avl.Spacing.equal,
-                           n_spanwise=20,
-                           span_spacing=avl.Spacing.equal,
+                           n_chordwise=self.avl_panels[0],
+                           chord_spacing=self.avl_panels[1],
+                           n_spanwise=None,
+                           span_spacing=None,
                            y_duplicate=self.avl_duplicate_pos[1],
                            sections=[section.avl_section
                                      for section in self.sections])
@@ -1,13 +1,21 @@
 from kbeutils import avl
 from parapy.core import *
-import matplotlib.pyplot as plt
 import numpy as np
 from parapy.core.validate import *
 from parapy.core.decorators import action
-from parapy.gui.image import Image
 from HelperFunction.help_fucntions import *
+from HelperFunction.strip_loads import strip_loads, section_leading_edges
+from HelperFunction.avl_cache import AvlResultCache, configuration_key, DEFAULT_CACHE_PATH
+from HelperFunction.avl_results import AvlResults
+from HelperFunction.results_store import ResultsStore, flatten_record, DEFAULT_RESULTS_DIR
+from HelperFunction.avl_session import get_session, geometry_text
+from HelperFunction.atmosphere import isa, dynamic_pressure, H_MAX
+from HelperFunction.mission import parasite_drag, induced_drag_factor, cruise_fuel
 from fpdf import FPDF
 
+# names of the winglet surfaces that are attached to the wing tip
+WINGLET_NAMES = ['Canted Winglet', 'Wingtip Fence', 'Raked Wingtip', 'Sharklet']
+
 
 class Analysis(avl.Interface):
     # TYPE_winglet and altitude will be passed to interface for warning evaluation
@@ -17,25 +25,24 @@ class Analysis(avl.Interface):
     # supercritical: 1, NACA-6: 2, Conventional: 3.
     aircraft = Input(in_tree=True)
     case_settings = Input()
-    altitude = Input(validator=Range(0, 11000))
+    altitude = Input(validator=Range(0, H_MAX))
+    altitudes = Input([1000, 3000, 5000, 7000, 9000, 11000, 13000])  # altitudes of the altitude_sweep and its plot [m]
     plot_which = Input('altitude')
     TYPE_winglet = Input()
     TYPE_wing_airfoil = Input()
     configuration = Input()
+    use_cache = Input(True)  # reuse AVL results of configurations that have been solved before
+    cache_path = Input(DEFAULT_CACHE_PATH)
+    results_dir = Input(DEFAULT_RESULTS_DIR)  # directory of the ResultsStore used by save_results and the plot
+    use_session = Input(False)  # solve in the AVL process kept alive by this process, instead of a new one per run
+    avl_exe = Input('avl')  # AVL executable used by the session
+    drag_components = Input(None)  # wetted areas of the parasite drag build-up (HelperFunction/mission.py)
 
     @Attribute
     def air_property(self):
-        # barometric formula for air density (0-11000m)
-        g = 9.80665         # gravitational accel       [m/s2]
-        R = 8.3144598       # universal gas constant    [Nm]
-        M = 0.0289644       # molar mass of Earth's air [kg/mol]
-        T = 288.15          # standard temperature      [K]
-        L = -0.0065         # temperature lapse rate    [K/m]
-        rho_b = 1.225       # air density at sea level  [kg/m3]
-        gamma = 1.4
-        air_density = rho_b * (T / (T+L*int(self.altitude))) ** (1+(g*M) / (R*L))
-        speed_of_sound = np.sqrt(gamma * R * (T+L*int(self.altitude)) / M)
-        return air_density, speed_of_sound
+        # standard atmosphere, troposphere and lower stratosphere
+        temperature, pressure, air_density, speed_of_sound = isa(self.altitude)
+        return float(air_density), float(speed_of_sound)
 
     @Attribute
     # dynamic pressure
@@ -43,24 +50,6 @@ class Analysis(avl.Interface):
         rho = self.air_property[0]
         a = self.air_property[1]
         q = 0.5 * rho * (a * float(self.configuration.mach))**2
-
-        right_wing = self.aircraft.right_wing
-
-        with open("../output.txt", "a") as file:
-            file.write('Airfoil type\tWinglet type\tMach\tAltitude\tSweep 0.25c\t\tq\t'
-                       'M_root(fix AoA)\t\tM_root(fix Cl)\n\t\t')
-            file.write(str(self.TYPE_wing_airfoil))
-            file.write('\t\t\t\t')
-            file.write(str(self.TYPE_winglet))
-            file.write("\t\t")
-            file.write(str(self.configuration.mach))
-            file.write("\t\t")
-            file.write(str(4000*self.altitude-3000))
-            file.write("\t\t")
-            file.write(str(round(right_wing.wing_sweep_025c, 2)))
-            file.write("\t")
-            file.write(str(round(q, 2)))
-            file.write("\t")
         return q
 
     @Part
@@ -69,126 +58,179 @@ class Analysis(avl.Interface):
                         name=self.case_settings[child.index][0],
                         settings=self.case_settings[child.index][1])
 
+    @Attribute
+    # AVL results from the persistent session: the geometry is only reloaded when it changed, and cases that have
+    # been solved before on the same geometry are not run again
+    def session_results(self):
+        return get_session(self.avl_exe).run(geometry_text(self.configuration), self.case_settings)
+
+    @Attribute
+    # AVL results as contiguous arrays (see AvlResults), taken from the on-disk cache when this configuration and
+    # these cases have been solved before
+    def cached_results(self):
+        if not self.use_cache:
+            return AvlResults.from_dict(self.session_results if self.use_session else self.results)
+        cache = AvlResultCache(self.cache_path)
+        key = configuration_key(self.configuration, self.case_settings)
+        results = cache.get(key)
+        if results is None:
+            results = self.session_results if self.use_session else self.results
+            cache.put(key, results)
+        return AvlResults.from_dict(results)
+
+    @Attribute
+    def CD(self):
+        return self.cached_results.total_dict('CDtot')
+
     @Attribute
     def l_over_d(self):
-        return {case_name: result['Totals']['CLtot'] / result['Totals']['CDtot']
-                for case_name, result in self.results.items()}
+        results = self.cached_results
+        return dict(zip(results.case_names, (results.total('CLtot') / results.total('CDtot')).tolist()))
 
     @Attribute
     def CL(self):
-        return {case_name: result['Totals']['CLtot']
-                for case_name, result in self.results.items()}
+        return self.cached_results.total_dict('CLtot')
+
+    @Attribute
+    # zero-lift drag coefficient from the component build-up, which AVL does not compute; None without
+    # drag_components, e.g. for an Analysis that is not part of an Aircraft
+    def CD0(self):
+        if self.drag_components is None:
+            return None
+        return float(parasite_drag(self.drag_components, self.configuration.reference_area, self.altitude,
+                                   float(self.configuration.mach))[0])
+
+    @Attribute
+    # fuel burnt in the cruise of the default mission, with the induced drag of the fixed_cl case; None without
+    # drag_components, see CD0
+    def mission(self):
+        if self.CD0 is None:
+            return None
+        k = induced_drag_factor(self.CL['fixed_cl'], self.CD['fixed_cl'])
+        return {name: float(value) for name, value in
+                cruise_fuel(self.CD0, k, self.configuration.reference_area, self.altitude,
+                            float(self.configuration.mach)).items()}
+
+    @Attribute
+    # leading edges of the sections of every surface, from which the strips take their dihedral
+    def section_leading_edges(self):
+        return section_leading_edges(self.configuration)
+
+    @Attribute
+    # shear, bending and torsion distributions of the right wing and winglet for all cases
+    def load_distributions(self):
+        return strip_loads(self.cached_results, ['wing'] + WINGLET_NAMES, self.section_leading_edges, q=self.q)
 
     @Attribute
     def rootBendingMoment(self):
-        wlt_names = ['Canted Winglet', 'Wingtip Fence', 'Raked Wingtip']
-        wing_ccl = []
-        wing_yle = []
-        winglet_ccl = []
-        winglet_yle = []
-        for case_name, result in self.results.items():
-            ccl = result['StripForces']['wing']['c cl']
-            wing_ccl.append(ccl)
-            yle = result['StripForces']['wing']['Yle']
-            wing_yle.append(yle)
-            for idx_name in range(len(wlt_names)):
-                try:
-                    name = wlt_names[idx_name]
-                    ccl = result['StripForces'][name]['c cl']
-                    winglet_ccl.append(ccl)
-                    yle = result['StripForces'][name]['Yle']
-                    winglet_yle.append(yle)
-                    break
-                except KeyError:
-                    continue
-        nu_wing_strips = int(len(wing_ccl[1]) / 2)
-        nu_winglet_strips = int(len(winglet_ccl[1]) / 2)
-
-        wing_ccl = np.array(wing_ccl)
-        wing_ccl = wing_ccl[:, 0:nu_wing_strips]
-        wing_yle = np.array(wing_yle)
-        wing_yle = wing_yle[:, 0:nu_wing_strips]
-        winglet_ccl = np.array(winglet_ccl)
-        winglet_ccl = winglet_ccl[:, 0:nu_winglet_strips]
-        winglet_yle = np.array(winglet_yle)
-        winglet_yle = winglet_yle[:, 0:nu_winglet_strips]
-
-        M_root_wing = np.zeros(len(self.results.items()))
-        M_root_winglet = np.zeros(len(self.results.items()))
-        for i in range(0, len(self.results.items())):
-            if self.TYPE_winglet == 0:
-                # canted winglet
-                cant = self.aircraft.right_winglet.cant
-            elif self.TYPE_winglet == 1:
-                # wingtip fence
-                cant = 0
-            else:
-                # raked wingtip, ignore dihedral
-                cant = 90
-
-            dy_wing = wing_yle[0, 3] - wing_yle[0, 2]
-            dy_winglet = winglet_yle[0, 3] - winglet_yle[0, 2]
-            Sf_wing = np.array(wing_ccl[i, :] * self.q * dy_wing)
-            Sf_winglet = np.array(winglet_ccl[i, :] * self.q * dy_winglet)
-
-            M_root_wing[i] = sum(np.multiply(Sf_wing, wing_yle[i, :]))
-            M_root_winglet[i] = sum(np.multiply(Sf_winglet, winglet_yle[i, :]))
-
-        M_root = M_root_wing + M_root_winglet
-
-        file = open("../output.txt", "a")
-        for m in list(M_root):
-            file.write(str(int(m)))
-            file.write("\t\t\t")
-        file.write("\n")
-        file.close()
-
-        return list(M_root)
+        return list(self.load_distributions.root_bending)
+
+    @Attribute
+    # root bending moment per unit dynamic pressure [m3]. The AVL solution in coefficient form does not depend on the
+    # altitude, so the loads at any altitude follow from scaling this with the dynamic pressure
+    def unit_root_bending(self):
+        return strip_loads(self.cached_results, ['wing'] + WINGLET_NAMES, self.section_leading_edges).root_bending
+
+    def dimensional_loads(self, altitudes):
+        """
+        This function scales the results of a single AVL solve to a whole array of altitudes at the same Mach number
+        :param altitudes: array of altitudes [m]
+        :return: dictionary with the arrays 'altitude', 'q' (one value per altitude) and 'lift' [N], 'M_root' [Nm]
+        (one row per case, see 'case_names')
+        """
+        altitudes = np.atleast_1d(np.asarray(altitudes, dtype=float))
+        q = dynamic_pressure(altitudes, float(self.configuration.mach))
+        case_names = list(self.load_distributions.case_names)
+        CL = np.array([self.CL[case_name] for case_name in case_names])
+        return {'altitude': altitudes,
+                'q': q,
+                'case_names': case_names,
+                'lift': np.outer(CL, q) * self.configuration.reference_area,
+                'M_root': np.outer(self.unit_root_bending, q)}
+
+    @Attribute
+    def altitude_sweep(self):
+        return self.dimensional_loads(self.altitudes)
+
+    def altitude_records(self, altitudes):
+        """
+        :param altitudes: array of altitudes [m]
+        :return: one record per altitude, with the same columns as record, from a single AVL solve
+        """
+        loads = self.dimensional_loads(altitudes)
+        if self.drag_components is not None:
+            # the skin friction depends on the Reynolds number, so on the altitude
+            CD0 = parasite_drag(self.drag_components, self.configuration.reference_area, loads['altitude'],
+                                float(self.configuration.mach))[0]
+        records = []
+        for i, altitude in enumerate(loads['altitude']):
+            record = dict(self.record, altitude=float(altitude), q=float(loads['q'][i]))
+            if self.drag_components is not None:
+                record['CD0'] = float(CD0[i])
+            record.update({'M_root_' + case_name: float(loads['M_root'][j, i])
+                           for j, case_name in enumerate(loads['case_names'])})
+            records.append(record)
+        return records
+
+    @Attribute
+    # one flat record with the inputs and results of this analysis, as stored in the ResultsStore
+    def record(self):
+        record = {'TYPE_wing_airfoil': self.TYPE_wing_airfoil,
+                  'TYPE_winglet': self.TYPE_winglet,
+                  'mach': float(self.configuration.mach),
+                  'altitude': float(self.altitude),
+                  'sweep_025c': self.aircraft[0].wing_sweep_025c,
+                  'q': self.q,
+                  'CL': self.CL,
+                  'CD': self.CD,
+                  'l_over_d': self.l_over_d,
+                  'M_root': dict(zip(self.load_distributions.case_names, self.rootBendingMoment))}
+        if self.drag_components is not None:
+            record.update(reference_area=float(self.configuration.reference_area), CD0=self.CD0)
+        return flatten_record(record)
 
     @Attribute
     def plot_M_root_bending(self):
-        with open("../output.txt", 'r+') as f:
-            data = []
-            count = 0
-            for line in f:
-                if count % 2 == 1:
-                    temp = line.split('\t')
-                    temp = [x for x in temp if x != '' and x != '\n']
-                    data.append(temp)
-                count = count + 1
-            data = np.array(data)
-            if self.plot_which == 'altitude':
-                x_val = data[:, 3]
-                plt.xlabel('altitude (m)')
-            if self.plot_which == 'sweep':
-                x_val = data[:, 4]
-                plt.xlabel('sweep')
-            y_val = data[:, 7]
-            plt.plot(x_val, y_val)
-            plt.ylabel('Root bending moment (Nm) at Cl=0.5')
-            plt.show()
+        # imported here, so that batch runs without a display never load a GUI toolkit
+        import matplotlib.pyplot as plt
+        if self.plot_which == 'altitude':
+            # one AVL solve, scaled to all altitudes
+            loads = self.altitude_sweep
+            x_val = loads['altitude']
+            y_val = loads['M_root'][loads['case_names'].index('fixed_cl')]
+            plt.xlabel('altitude (m)')
+        if self.plot_which == 'sweep':
+            data = ResultsStore(self.results_dir).read(['sweep_025c', 'M_root_fixed_cl'])
+            x_val = data['sweep_025c']
+            y_val = data['M_root_fixed_cl']
+            plt.xlabel('sweep')
+        order = np.argsort(x_val)
+        plt.plot(x_val[order], y_val[order])
+        plt.ylabel('Root bending moment (Nm) at Cl=0.5')
+        plt.show()
         return 'Plot done'
 
     @Attribute
     def output_images(self):
+        from parapy.gui.image import Image
         image_1 = Image(shapes=self.aircraft[0].solid, view='top', width=400, height=400)
         image_2 = Image(shapes=self.aircraft[1].surface, view='top', width=400, height=400)
         return image_1, image_2
 
     @action(label='Check Inputs')
     def check(self):
-        if self.TYPE_winglet == 3:
-            msg1 = "Sharklet is not supported for AVL analysis"
-            warnings.warn(msg1)
-            generate_warning("Warning: ", msg1)
-        elif not 0 < self.altitude < 11000:
-            msg2 = "Altitude should not exceed 11000m"
+        if not 0 <= self.altitude <= H_MAX:
+            msg2 = "Altitude should not exceed {:.0f}m".format(H_MAX)
             warnings.warn(msg2)
             generate_warning("Warning: ", msg2)
         else:
             msg = "You are flying at " + str(self.altitude) + "m. All good! Launch it!"
             generate_warning(" ", msg)
 
+    @action(label='Save results')
+    def save_results(self):
+        ResultsStore(self.results_dir).append(self.record)
+
     @action(label='Print PDF')
     def printPDF(self):
         self.output_images[0].write('Output/test1.png')
@@ -0,0 +1,92 @@
+import numpy as np
+
+# International Standard Atmosphere, troposphere and lower stratosphere (0-20000m geopotential altitude)
+g0 = 9.80665            # gravitational acceleration     [m/s2]
+R = 287.05287           # specific gas constant of air   [J/(kg K)]
+gamma = 1.4             # ratio of specific heats
+T0 = 288.15             # sea level temperature          [K]
+p0 = 101325.            # sea level pressure             [Pa]
+L = -0.0065             # troposphere lapse rate         [K/m]
+H_TROPOPAUSE = 11000.   # altitude of the tropopause     [m]
+H_MAX = 20000.          # top of the isothermal layer    [m]
+MU_REF = 1.458e-6       # Sutherland constant            [kg/(m s K^0.5)]
+S_SUTHERLAND = 110.4    # Sutherland temperature         [K]
+T_TROPOPAUSE = T0 + L * H_TROPOPAUSE
+p_TROPOPAUSE = p0 * (T_TROPOPAUSE / T0) ** (-g0 / (L * R))
+
+
+def _check(altitude):
+    altitude = np.asarray(altitude, dtype=float)
+    if np.any((altitude < 0) | (altitude > H_MAX)):
+        raise ValueError("The standard atmosphere is only implemented between 0 and {:.0f}m".format(H_MAX))
+    return altitude
+
+
+def isa(altitude):
+    """
+    This function evaluates the standard atmosphere for a single altitude or an array of altitudes
+    :param altitude: altitude [m]
+    :return: temperature [K], pressure [Pa], density [kg/m3], speed of sound [m/s]
+    """
+    altitude = _check(altitude)
+    troposphere = altitude <= H_TROPOPAUSE
+    temperature = np.where(troposphere, T0 + L * altitude, T_TROPOPAUSE)
+    pressure = np.where(troposphere,
+                        p0 * (temperature / T0) ** (-g0 / (L * R)),
+                        p_TROPOPAUSE * np.exp(-g0 * (altitude - H_TROPOPAUSE) / (R * T_TROPOPAUSE)))
+    density = pressure / (R * temperature)
+    speed_of_sound = np.sqrt(gamma * R * temperature)
+    return temperature, pressure, density, speed_of_sound
+
+
+def dynamic_pressure(altitude, mach):
+    """
+    :param altitude: altitude [m], array that broadcasts with mach
+    :param mach: Mach number
+    :return: dynamic pressure [Pa], 0.5 * gamma * p * M^2
+    """
+    return 0.5 * gamma * isa(altitude)[1] * np.asarray(mach, dtype=float) ** 2
+
+
+def dynamic_viscosity(temperature):
+    """
+    :param temperature: temperature [K]
+    :return: dynamic viscosity of air [kg/(m s)], Sutherland's law
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    return MU_REF * temperature ** 1.5 / (temperature + S_SUTHERLAND)
+
+
+class AtmosphereTable:
+    """Pressure of the standard atmosphere tabulated on an equidistant altitude grid, together with the slope of every
+    interval. The dynamic pressure is then one multiply-add per altitude, without any search or power function, two to
+    three times faster than dynamic_pressure for large arrays; with the default step of 10m the relative error stays
+    below 1e-6. The other quantities are not tabulated: isa is about as fast as looking up all four of them."""
+
+    def __init__(self, step=10.):
+        self.step = step
+        self.altitude = np.arange(0., H_MAX + step / 2, step)
+        self.pressure = isa(self.altitude)[1]
+        self.slope = np.append(np.diff(self.pressure), 0.)
+
+    def dynamic_pressure(self, altitude, mach):
+        """
+        :return: dynamic pressure [Pa], see dynamic_pressure
+        """
+        position = _check(altitude) / self.step
+        index = np.minimum(position.astype(np.intp), len(self.altitude) - 2)
+        pressure = self.pressure[index] + (position - index) * self.slope[index]
+        return 0.5 * gamma * pressure * np.asarray(mach, dtype=float) ** 2
+
+
+_tables = {}
+
+
+def atmosphere_table(step=10.):
+    """
+    :return: the AtmosphereTable with this step, which is only computed once per process
+    """
+    if step not in _tables:
+        _tables[step] = AtmosphereTable(step)
+    return _tables[step]
+
@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+
+from HelperFunction.hashing import digest, plain
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "avl_cache.sqlite")
+
+
+def _section_data(section):
+    panels = {"n_spanwise": plain(getattr(section, "n_spanwise", None)),
+              "span_spacing": plain(getattr(section, "span_spacing", None))}
+    # SectionFromCurve derives everything else AVL sees from its input curve, so the curve points identify the section
+    curve = getattr(section, "curve_in", None)
+    if curve is not None:
+        return dict(panels, points=plain(curve.sample_points))
+    return dict(panels,
+                chord=plain(section.chord),
+                position=plain(section.position.point),
+                airfoil=plain(getattr(section, "airfoil", None)))
+
+
+def _surface_data(surface):
+    return {"name": surface.name,
+            "n_chordwise": plain(surface.n_chordwise),
+            "chord_spacing": plain(surface.chord_spacing),
+            "n_spanwise": plain(surface.n_spanwise),
+            "span_spacing": plain(surface.span_spacing),
+            "y_duplicate": plain(surface.y_duplicate),
+            "sections": [_section_data(section) for section in surface.sections]}
+
+
+def configuration_key(configuration, case_settings):
+    """
+    This function computes a stable hash of an AVL configuration and the cases that are run on it
+    :param configuration: avl.Configuration
+    :param case_settings: list of (case name, settings) tuples as passed to the Analysis
+    :return: hexadecimal sha256 digest
+    """
+    data = {"reference_area": plain(configuration.reference_area),
+            "reference_span": plain(configuration.reference_span),
+            "reference_chord": plain(configuration.reference_chord),
+            "reference_point": plain(configuration.reference_point),
+            "mach": plain(configuration.mach),
+            "surfaces": [_surface_data(surface) for surface in configuration.surfaces],
+            "cases": plain(case_settings)}
+    return digest(data)
+
+
+class AvlResultCache:
+    """On-disk store of AVL results, keyed by configuration_key and bounded in size by evicting the least recently
+    used entries. Every operation opens its own connection, so the cache can be shared by sweep worker processes."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=256 * 1024 ** 2):
+        self.path = path
+        self.max_bytes = max_bytes
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS results "
+                               "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL)")
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key):
+        """
+        :param key: configuration_key of the requested results
+        :return: the stored results, or None if they are not in the cache
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]).decode())
+
+    def put(self, key, results):
+        """
+        :param key: configuration_key of the results
+        :param results: AVL results as returned by avl.Interface.results
+        :return: None
+        """
+        value = zlib.compress(json.dumps(results).encode())
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                               (key, value, len(value), time.time()))
+            self._evict(connection)
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM results")
@@ -0,0 +1,197 @@
+import json
+import numbers
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+# files of a saved AvlResults directory
+META_FILE = "meta.json"
+TOTALS_FILE = "totals.npy"
+STRIPS_FILE = "strips.npy"
+
+
+class AvlResults(Mapping):
+    """AVL results of all cases of one configuration, held in two contiguous arrays: the totals of shape
+    (number of cases, number of totals) and the strip forces of all surfaces of shape (number of cases, number of
+    strips, number of columns). The strips of a surface are a consecutive block, so looking up a surface or a column
+    returns a view without copying. Indexing with a case name gives the {'Totals': ..., 'StripForces': ...} form of
+    avl.Interface.results, with arrays instead of lists, so existing code keeps working."""
+
+    def __init__(self, case_names, total_names, totals, surface_names, bounds, columns, strips, available=None,
+                 extra=None):
+        self.case_names = list(case_names)
+        self.total_names = list(total_names)
+        self.totals = totals
+        self.surface_names = list(surface_names)
+        self.bounds = {name: (int(start), int(stop)) for name, (start, stop) in zip(self.surface_names, bounds)}
+        self.columns = list(columns)
+        self.strips = strips
+        # columns written for every surface; the others hold NaN
+        self.available = available or {name: list(self.columns) for name in self.surface_names}
+        # other parts of the results of every case (e.g. the stability derivatives of avl.Interface), kept as they are
+        self.extra = extra or {}
+        self._total_index = {name: i for i, name in enumerate(self.total_names)}
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._case_index = {name: i for i, name in enumerate(self.case_names)}
+
+    @classmethod
+    def from_dict(cls, results):
+        """
+        :param results: {case name: result} as returned by avl.Interface.results or AvlSession.run
+        :return: AvlResults
+        """
+        if isinstance(results, cls):
+            return results
+        case_names = list(results.keys())
+        total_names = []
+        columns = []
+        surfaces = {}
+        for case_name in case_names:
+            for name, value in results[case_name]['Totals'].items():
+                if isinstance(value, numbers.Number) and name not in total_names:
+                    total_names.append(name)
+            for surface_name, strips in results[case_name]['StripForces'].items():
+                surfaces.setdefault(surface_name, [])
+                for column, values in strips.items():
+                    if column not in columns:
+                        columns.append(column)
+                    if column not in surfaces[surface_name]:
+                        surfaces[surface_name].append(column)
+
+        surface_names = list(surfaces)
+        first = results[case_names[0]]['StripForces'] if case_names else {}
+        bounds, start = [], 0
+        for name in surface_names:
+            n_strips = max(len(values) for values in first[name].values()) if first.get(name) else 0
+            bounds.append((start, start + n_strips))
+            start += n_strips
+
+        totals = np.full((len(case_names), len(total_names)), np.nan)
+        strips = np.full((len(case_names), start, len(columns)), np.nan)
+        extra = {}
+        for i, case_name in enumerate(case_names):
+            result = results[case_name]
+            for j, name in enumerate(total_names):
+                value = result['Totals'].get(name)
+                if isinstance(value, numbers.Number):
+                    totals[i, j] = value
+            for surface_name, (start, stop) in zip(surface_names, bounds):
+                for column, values in result['StripForces'].get(surface_name, {}).items():
+                    values = np.asarray(values, dtype=float)
+                    if len(values) != stop - start:
+                        raise ValueError("Surface '{:}' has {:d} strips in case '{:}' and {:d} in case '{:}'".format(
+                            surface_name, len(values), case_name, stop - start, case_names[0]))
+                    strips[i, start:stop, columns.index(column)] = values
+            others = {key: value for key, value in result.items() if key not in ('Totals', 'StripForces')}
+            strings = {name: value for name, value in result['Totals'].items()
+                       if not isinstance(value, numbers.Number)}
+            if strings:
+                others['_totals'] = strings
+            if others:
+                extra[case_name] = others
+        return cls(case_names, total_names, totals, surface_names, bounds, columns, strips, surfaces, extra)
+
+    # ************************** lookup **************************
+
+    def total(self, name):
+        """
+        :param name: name of a total, e.g. 'CLtot'
+        :return: array with the value of every case, in the order of case_names
+        """
+        return self.totals[:, self._total_index[name]]
+
+    def total_dict(self, name):
+        """
+        :return: {case name: value} of a total
+        """
+        return dict(zip(self.case_names, self.total(name).tolist()))
+
+    def surface(self, name):
+        """
+        :param name: name of a surface, e.g. 'wing'
+        :return: view of shape (number of cases, number of strips, number of columns)
+        """
+        start, stop = self.bounds[name]
+        return self.strips[:, start:stop, :]
+
+    def strip(self, name, column):
+        """
+        :param name: name of a surface
+        :param column: strip force column, e.g. 'c cl'
+        :return: view of shape (number of cases, number of strips)
+        """
+        start, stop = self.bounds[name]
+        return self.strips[:, start:stop, self._column_index[column]]
+
+    def has_column(self, name, column):
+        return column in self.available.get(name, ())
+
+    # ************************** Mapping of case names **************************
+
+    def __getitem__(self, case_name):
+        i = self._case_index[case_name]
+        extra = dict(self.extra.get(case_name, {}))
+        totals = dict(zip(self.total_names, self.totals[i].tolist()))
+        totals.update(extra.pop('_totals', {}))
+        strip_forces = {name: {column: self.strips[i, start:stop, self._column_index[column]]
+                               for column in self.available[name]}
+                        for name, (start, stop) in self.bounds.items()}
+        return dict(extra, Totals=totals, StripForces=strip_forces)
+
+    def __iter__(self):
+        return iter(self.case_names)
+
+    def __len__(self):
+        return len(self.case_names)
+
+    def to_dict(self):
+        """
+        :return: {case name: result} with plain lists, as stored in the AvlResultCache
+        """
+        results = {}
+        for case_name in self.case_names:
+            result = self[case_name]
+            result['StripForces'] = {name: {column: values.tolist() for column, values in strips.items()}
+                                     for name, strips in result['StripForces'].items()}
+            results[case_name] = result
+        return results
+
+    # ************************** files **************************
+
+    def save(self, directory):
+        """
+        This function writes the results to a directory, with the arrays as .npy files that load() can memory-map
+        :param directory: directory to write to, created when needed
+        :return: directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, TOTALS_FILE), np.ascontiguousarray(self.totals))
+        np.save(os.path.join(directory, STRIPS_FILE), np.ascontiguousarray(self.strips))
+        meta = {'case_names': self.case_names,
+                'total_names': self.total_names,
+                'surface_names': self.surface_names,
+                'bounds': [self.bounds[name] for name in self.surface_names],
+                'columns': self.columns,
+                'available': self.available,
+                'extra': self.extra}
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+        return directory
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        :param directory: directory written by save()
+        :param mmap: memory-map the arrays read-only instead of reading them, so only the strips that are used are
+        read from disk
+        :return: AvlResults
+        """
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        return cls(meta['case_names'], meta['total_names'],
+                   np.load(os.path.join(directory, TOTALS_FILE), mmap_mode=mode),
+                   meta['surface_names'], meta['bounds'], meta['columns'],
+                   np.load(os.path.join(directory, STRIPS_FILE), mmap_mode=mode),
+                   meta['available'], meta['extra'])
@@ -0,0 +1,329 @@
+import atexit
+import collections
+import hashlib
+import math
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+
+# AVL commands that set an operating variable, and the constraints that can drive them
+VARIABLES = {'alpha': 'A', 'beta': 'B', 'roll_rate': 'R', 'pitch_rate': 'P', 'yaw_rate': 'Y'}
+CONSTRAINTS = {'alpha': 'A', 'beta': 'B', 'roll_rate': 'R', 'pitch_rate': 'P', 'yaw_rate': 'Y',
+               'CL': 'C', 'CY': 'S', 'Cl': 'RM', 'Cm': 'PM', 'Cn': 'YM'}
+
+# columns of the strip force table written by the FS command
+STRIP_COLUMNS = ['j', 'Xle', 'Yle', 'Zle', 'Chord', 'Area', 'c cl', 'ai', 'cl_norm', 'cl', 'cd', 'cdv',
+                 'cm_c/4', 'cm_LE', 'C.P.x/c']
+
+
+# ************************** AVL input file **************************
+
+def _spacing(value):
+    # avl.Spacing members are plain numbers or enumerations holding the number
+    try:
+        return float(value)
+    except TypeError:
+        return float(value.value)
+
+
+def _vector(point):
+    return [point.x, point.y, point.z]
+
+
+def _airfoil_lines(avl_section, z_axis):
+    # the airfoil is written as the coordinates of the section curve, as avl.SectionFromCurve gives it to AVL, so
+    # that every airfoil, including 5-digit NACA sections, keeps its camber
+    leading_edge = _vector(avl_section.leading_edge_point)
+    points = [_vector(point) for point in avl_section.curve_in.sample_points]
+    trailing_edge = [0.5 * (a + b) for a, b in zip(points[0], points[-1])]
+    x_axis = [b - a for a, b in zip(leading_edge, trailing_edge)]
+    length = math.sqrt(sum(value ** 2 for value in x_axis))
+    x_axis = [value / length for value in x_axis]
+    # thickness direction of the section, perpendicular to the chord
+    along = sum(a * b for a, b in zip(z_axis, x_axis))
+    z_axis = [a - along * b for a, b in zip(z_axis, x_axis)]
+    length = math.sqrt(sum(value ** 2 for value in z_axis))
+    z_axis = [value / length for value in z_axis]
+    chord = float(avl_section.chord)
+    lines = ["AIRFOIL"]
+    for point in points:
+        offset = [a - b for a, b in zip(point, leading_edge)]
+        lines.append("{:.6f} {:.6f}".format(sum(a * b for a, b in zip(offset, x_axis)) / chord,
+                                            sum(a * b for a, b in zip(offset, z_axis)) / chord))
+    return lines
+
+
+def _section_lines(section):
+    # everything is taken from the avl.Section, which is what avl.Interface writes as well
+    avl_section = section.avl_section
+    point = avl_section.leading_edge_point
+    n_spanwise = avl_section.n_spanwise
+    lines = ["SECTION",
+             "#Xle Yle Zle Chord Ainc" + (" Nspan Sspace" if n_spanwise else ""),
+             "{:.6f} {:.6f} {:.6f} {:.6f} {:.4f}".format(point.x, point.y, point.z, float(avl_section.chord),
+                                                       float(avl_section.angle)) +
+             (" {:d} {:.1f}".format(n_spanwise, _spacing(avl_section.span_spacing)) if n_spanwise else "")]
+    return lines + _airfoil_lines(avl_section, _vector(section.position.Vz))
+
+
+def geometry_text(configuration):
+    """
+    This function writes the AVL input file of a configuration from the same avl.Configuration, avl.Surfaces and
+    avl.Sections that avl.Interface uses
+    :param configuration: avl.Configuration
+    :return: content of the .avl file
+    """
+    ref = configuration.reference_point
+    lines = [configuration.name,
+             "#Mach", "{:.6f}".format(float(configuration.mach)),
+             "#IYsym IZsym Zsym", "{:d} {:d} {:.6f}".format(int(_spacing(getattr(configuration, "y_symmetry", 0))),
+                                                           int(_spacing(getattr(configuration, "z_symmetry", 0))),
+                                                           float(getattr(configuration, "z_symmetry_plane", 0.))),
+             "#Sref Cref Bref", "{:.6f} {:.6f} {:.6f}".format(configuration.reference_area,
+                                                             configuration.reference_chord,
+                                                             configuration.reference_span),
+             "#Xref Yref Zref", "{:.6f} {:.6f} {:.6f}".format(ref.x, ref.y, ref.z)]
+    for surface in configuration.surfaces:
+        # without spanwise panels for the surface, AVL takes those of the sections
+        lines += ["#", "SURFACE", surface.name,
+                  "#Nchord Cspace [Nspan Sspace]",
+                  "{:d} {:.1f}".format(surface.n_chordwise, _spacing(surface.chord_spacing)) +
+                  ("" if surface.n_spanwise is None else
+                   " {:d} {:.1f}".format(surface.n_spanwise, _spacing(surface.span_spacing))),
+                  "YDUPLICATE", "{:.6f}".format(surface.y_duplicate)]
+        for section in surface.parent.sections:
+            lines += _section_lines(section)
+    return "\n".join(lines) + "\n"
+
+
+# ************************** AVL output files **************************
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?"
+
+
+def parse_totals(text):
+    """
+    :param text: content of a file written by the FT command
+    :return: {name: value}, e.g. {'CLtot': 0.5, 'CDtot': 0.012, ...}
+    """
+    return {name: float(value) for name, value in re.findall(r"(\S+)\s*=\s*(" + _NUMBER + ")", text)}
+
+
+def parse_strip_forces(text):
+    """
+    :param text: content of a file written by the FS command
+    :return: {surface name: {column: list of values}}. The strips of a duplicated surface are appended to those of
+    the original surface.
+    """
+    surfaces = collections.OrderedDict()
+    columns = None
+    for line in text.splitlines():
+        match = re.match(r"\s*Surface\s*#\s*\d+\s+(.+?)\s*$", line)
+        if match:
+            name = re.sub(r"\s*\(YDUP\)$", "", match.group(1))
+            columns = surfaces.setdefault(name, collections.OrderedDict())
+            continue
+        tokens = line.split()
+        if columns is None or not tokens or not re.match(r"^\d+$", tokens[0]):
+            continue
+        try:
+            values = [float(token) for token in tokens]
+        except ValueError:
+            continue
+        for column, value in zip(STRIP_COLUMNS, values):
+            columns.setdefault(column, []).append(value)
+    return {name: dict(columns) for name, columns in surfaces.items()}
+
+
+# ************************** persistent AVL process **************************
+
+class AvlSession:
+    """One AVL process that is kept alive over a pipe. The geometry is only reloaded when it changes, and cases that
+    have already been run on the current geometry are answered from memory."""
+
+    def __init__(self, avl_exe="avl", work_dir=None, timeout=60.):
+        self.avl_exe = avl_exe
+        self.work_dir = work_dir if work_dir is not None else tempfile.mkdtemp(prefix="avl_session_")
+        self.timeout = timeout
+        self._process = None
+        self._output = collections.deque(maxlen=200)
+        self._geometry_text = None  # loaded again when AVL has to be restarted
+        self._geometry_key = None
+        self._case_results = {}
+        self._count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _start(self):
+        self._process = subprocess.Popen([self.avl_exe], cwd=self.work_dir, stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                         universal_newlines=True, bufsize=1)
+        # AVL prompts are not terminated by a newline, so the output is drained in the background to keep the pipe
+        # from filling up, and only the last lines are kept for error messages
+        reader = threading.Thread(target=self._drain, args=(self._process.stdout,), daemon=True)
+        reader.start()
+        self._geometry_key = None
+        self._case_results = {}
+        if self._geometry_text is not None:
+            self._load(self._geometry_text)
+
+    def _alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _drain(self, stream):
+        for line in iter(stream.readline, ""):
+            self._output.append(line)
+
+    def _send(self, *commands):
+        # a new AVL process gets the current geometry before anything else
+        if not self._alive():
+            self._start()
+        self._process.stdin.write("\n".join(commands) + "\n")
+        self._process.stdin.flush()
+
+    def _wait_for(self, path):
+        start = time.time()
+        while not os.path.exists(path):
+            if self._process.poll() is not None or time.time() - start > self.timeout:
+                output = "".join(self._output)
+                self.close()
+                raise RuntimeError("AVL did not write {:}. Last output:\n{:}".format(path, output))
+            time.sleep(0.002)
+
+    def _load(self, text):
+        key = hashlib.sha1(text.encode()).hexdigest()
+        path = os.path.join(self.work_dir, "geometry_{:}.avl".format(key[:12]))
+        with open(path, "w") as f:
+            f.write(text)
+        # the empty lines bring AVL back to its main menu from wherever it was
+        self._process.stdin.write("\n".join(["", "", "LOAD", path]) + "\n")
+        self._process.stdin.flush()
+        self._geometry_key = key
+        self._case_results = {}
+
+    def load_geometry(self, text):
+        """
+        :param text: content of the AVL input file, see geometry_text
+        :return: None
+        """
+        self._geometry_text = text
+        if not self._alive():
+            # AVL has not been started yet or has died; the new process loads the geometry
+            self._start()
+        elif hashlib.sha1(text.encode()).hexdigest() != self._geometry_key:
+            self._load(text)
+
+    def run_case(self, settings):
+        """
+        This function runs one case on the loaded geometry
+        :param settings: {variable: value or avl.Parameter}, as in the case_settings of the Analysis
+        :return: {'Totals': {...}, 'StripForces': {...}}
+        """
+        if self._geometry_text is None:
+            raise RuntimeError("No geometry loaded in the AVL session")
+        commands = []
+        for variable, value in sorted(settings.items()):
+            if hasattr(value, "setting"):
+                commands.append("{:} {:} {:}".format(VARIABLES[variable], CONSTRAINTS[value.setting], value.value))
+            else:
+                commands.append("{:} {:} {:}".format(VARIABLES[variable], VARIABLES[variable], value))
+        key = tuple(commands)
+        if key in self._case_results:
+            return self._case_results[key]
+
+        self._count += 1
+        totals_path = os.path.join(self.work_dir, "totals_{:}.txt".format(self._count))
+        strips_path = os.path.join(self.work_dir, "strips_{:}.txt".format(self._count))
+        done_path = os.path.join(self.work_dir, "done_{:}.txt".format(self._count))
+        self._send("OPER", *commands)
+        self._send("X", "FT", totals_path, "FS", strips_path, "FT", done_path, "", "")
+        # AVL writes its files one after the other, so once the last one exists the others are complete
+        self._wait_for(done_path)
+        with open(totals_path) as f:
+            totals = parse_totals(f.read())
+        with open(strips_path) as f:
+            strips = parse_strip_forces(f.read())
+        for path in (totals_path, strips_path, done_path):
+            os.remove(path)
+
+        result = {'Totals': totals, 'StripForces': strips}
+        self._case_results[key] = result
+        return result
+
+    def run(self, text, case_settings):
+        """
+        :param text: content of the AVL input file, see geometry_text
+        :param case_settings: list of (case name, settings) tuples as passed to the Analysis
+        :return: {case name: result}, in the same form as avl.Interface.results
+        """
+        # this also restarts AVL when it has died since the previous run
+        self.load_geometry(text)
+        return {name: self.run_case(settings) for name, settings in case_settings}
+
+    def close(self):
+        if self._process is not None:
+            if self._process.poll() is None:
+                try:
+                    self._process.stdin.write("\n\nQUIT\n")
+                    self._process.stdin.flush()
+                    self._process.wait(5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._process.kill()
+            self._process = None
+        self._geometry_text = None
+        self._geometry_key = None
+        self._case_results = {}
+
+    def cleanup(self):
+        self.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class AvlSessionPool:
+    """A fixed number of AvlSessions that are shared between threads, e.g. for a thread pool of AVL runs."""
+
+    def __init__(self, size, avl_exe="avl"):
+        self._sessions = queue.Queue()
+        self._all = [AvlSession(avl_exe) for _ in range(size)]
+        for session in self._all:
+            self._sessions.put(session)
+
+    @contextmanager
+    def session(self):
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def close(self):
+        for session in self._all:
+            session.cleanup()
+
+
+_process_sessions = {}
+
+
+def get_session(avl_exe="avl"):
+    """
+    This function returns the AvlSession of the current process, so that every sweep worker keeps one AVL process
+    alive for all design points it evaluates
+    :param avl_exe: AVL executable
+    :return: AvlSession
+    """
+    key = (os.getpid(), avl_exe)
+    if key not in _process_sessions:
+        _process_sessions[key] = AvlSession(avl_exe)
+        atexit.register(_process_sessions[key].cleanup)
+    return _process_sessions[key]
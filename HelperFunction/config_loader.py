@@ -0,0 +1,210 @@
+import collections
+import csv
+import glob
+import json
+import os
+
+# Aircraft input slots that can be given in a configuration file, with their types
+_STRINGS = ['name', 'airfoil_root', 'airfoil_kink', 'airfoil_tip', 'htp_root_airfoil', 'htp_tip_airfoil',
+            'vtp_root_airfoil', 'vtp_tip_airfoil', 'ct_airfoil_root', 'ct_airfoil_tip', 'wtf_name', 'wtf_airfoil_up',
+            'wtf_airfoil_root', 'wtf_airfoil_down', 'rkt_name', 'rkt_airfoil_start', 'rkt_airfoil_tip',
+            'skt_airfoil_start', 'skt_airfoil_mid', 'skt_airfoil_tip']
+_INTEGERS = ['TYPE_wing_airfoil', 'TYPE_winglet', 'skt_nu_blended_sections']
+_BOOLEANS = ['winglet_ON', 'analysis_only', 'use_avl_session', 'mirror_left_side']
+_FLOATS = ['M_cruise', 'altitude', 'ln_d', 'lt_d', 'fuselage_length', 'cabin_d', 'wing_span', 'incidence', 'twist',
+           'wing_c_root', 'wing_taper_ratio_inboard', 'htp_area', 'htp_taper', 'htp_dihedral', 'vtp_aspect_ratio',
+           'vtp_sweep', 'vtp_area', 'Vh', 'Vv', 'ct_chord_root_ratio', 'ct_taper_ratio', 'ct_height_ratio', 'ct_sweep',
+           'ct_cant', 'ct_twist_tip', 'wtf_chord_root_ratio', 'wtf_taper_ratio_up', 'wtf_taper_ratio_down',
+           'wtf_height_up_ratio', 'wtf_height_down_ratio', 'wtf_sweep_up', 'wtf_sweep_down', 'wtf_twist_up',
+           'wtf_twist_down', 'rkt_chord_start', 'rkt_taper_ratio', 'rkt_span_ratio', 'rkt_sweep_le', 'skt_chord_mid',
+           'skt_K_lambda', 'skt_height_ratio', 'skt_KR', 'skt_cant', 'skt_sweep_le', 'skt_sweep_transition_te',
+           'skt_twist']
+
+
+def _boolean(value):
+    if isinstance(value, str):
+        if value.strip().lower() not in ('true', 'false', '1', '0', 'yes', 'no'):
+            raise ValueError("'{:}' is not a boolean".format(value))
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+def _integer(value):
+    number = float(value)
+    if number != int(number):
+        raise ValueError("'{:}' is not an integer".format(value))
+    return int(number)
+
+
+def _panel_policy(value):
+    # panel policies are given by the name of a preset in configuration files. The name is kept, so that the design
+    # points can be stored with their results; the sweep resolves it to the PanelPolicy
+    from HelperFunction.panel_policy import resolve_policy, policy_label
+    return policy_label(resolve_policy(value))
+
+
+FIELDS = dict([('panel_policy', _panel_policy)] + [(name, str) for name in _STRINGS] + [(name, _integer) for name in _INTEGERS] +
+              [(name, _boolean) for name in _BOOLEANS] + [(name, float) for name in _FLOATS])
+
+# data of the input.txt blocks that are not Aircraft inputs; they are kept as reference data of the record
+REFERENCE_FIELDS = {'M_tech_factor': float,
+                    'vt_chord_root': float, 'vt_chord_tip': float, 'vt_height': float, 'vt_sweep': float,
+                    'vt_position': float,
+                    'ht_chord_root': float, 'ht_chord_tip': float, 'ht_sweep': float, 'ht_dihedral': float,
+                    'ht_position': float}
+
+# the lines of the #Wing and #Winglet blocks of input.txt: airfoil names first, numbers second
+WING_BLOCK = (['airfoil_root', 'airfoil_kink', 'airfoil_tip'],
+              ['wing_span', 'M_cruise', 'M_tech_factor', 'wing_c_root', 'incidence', 'twist',
+               'wing_taper_ratio_inboard'])
+WINGLET_BLOCKS = {0: (['ct_airfoil_root', 'ct_airfoil_tip'],
+                      ['ct_chord_root_ratio', 'ct_taper_ratio', 'ct_height_ratio', 'ct_sweep', 'ct_cant',
+                       'ct_twist_tip']),
+                  1: (['wtf_airfoil_up', 'wtf_airfoil_root', 'wtf_airfoil_down'],
+                      ['wtf_chord_root_ratio', 'wtf_taper_ratio_up', 'wtf_taper_ratio_down', 'wtf_height_up_ratio',
+                       'wtf_height_down_ratio', 'wtf_sweep_up', 'wtf_sweep_down', 'wtf_twist_up', 'wtf_twist_down']),
+                  2: (['rkt_airfoil_start', 'rkt_airfoil_tip'],
+                      ['rkt_chord_start', 'rkt_taper_ratio', 'rkt_span_ratio', 'rkt_sweep_le']),
+                  3: (['skt_airfoil_start', 'skt_airfoil_mid', 'skt_airfoil_tip'],
+                      ['skt_chord_mid', 'skt_K_lambda', 'skt_height_ratio', 'skt_KR', 'skt_cant', 'skt_sweep_le',
+                       'skt_sweep_transition_te', 'skt_twist', 'skt_nu_blended_sections'])}
+# the #VT and #HT blocks hold "keyword value" lines
+KEYWORD_BLOCKS = {'#VT': 'vt_', '#HT': 'ht_'}
+DEFAULT_NAME = "A320"
+
+AircraftConfig = collections.namedtuple("AircraftConfig", ["name", "inputs", "reference", "source"])
+AircraftConfig.__doc__ = """One aircraft definition: name, Aircraft input slots, reference data that are not Aircraft
+inputs (e.g. the #VT and #HT blocks) and where it was read from"""
+
+
+def _typed(name, value, source):
+    if name in FIELDS:
+        convert, group = FIELDS[name], 'inputs'
+    elif name in REFERENCE_FIELDS:
+        convert, group = REFERENCE_FIELDS[name], 'reference'
+    else:
+        raise ValueError("{:}: '{:}' is not an input of the Aircraft".format(source, name))
+    try:
+        return group, convert(value)
+    except (TypeError, ValueError):
+        raise ValueError("{:}: {:} = '{:}' is not a valid {:}".format(source, name, value,
+                                                                     getattr(convert, '__name__', convert)))
+
+
+def make_config(name, values, source=""):
+    """
+    This function checks and converts raw values into an AircraftConfig
+    :param name: name of the aircraft
+    :param values: dictionary {field: value}, the values may be strings
+    :param source: description of where the values come from, used in error messages
+    :return: AircraftConfig
+    """
+    inputs, reference = {}, {}
+    for field, value in values.items():
+        group, value = _typed(field, value, source)
+        (inputs if group == 'inputs' else reference)[field] = value
+    return AircraftConfig(name, inputs, reference, source)
+
+
+def _block_values(fields, lines, source):
+    airfoils, numbers = fields
+    if len(lines) < 2:
+        raise ValueError("{:}: the block ends before its airfoils and numbers".format(source))
+    values = dict(zip(airfoils, lines[0].split()))
+    values.update(zip(numbers, lines[1].split()))
+    if len(values) != len(airfoils) + len(numbers):
+        raise ValueError("{:}: expected {:d} airfoils and {:d} numbers".format(source, len(airfoils), len(numbers)))
+    return values
+
+
+def _parse_input_file(path):
+    # input.txt holds the blocks of one aircraft; more aircraft are defined in one file by starting each of them
+    # with a line "#Aircraft <name>"
+    with open(path) as f:
+        lines = [line.split('%')[0].strip() for line in f]
+
+    name, values, block, i = DEFAULT_NAME, {}, None, 0
+    while i < len(lines):
+        line, source = lines[i], "{:}:{:d}".format(path, i + 1)
+        if line.startswith("#Aircraft"):
+            if values:
+                yield make_config(name, values, path)
+            name, values, block = line[len("#Aircraft"):].strip() or DEFAULT_NAME, {}, None
+        elif line == "#Wing":
+            values.update(_block_values(WING_BLOCK, lines[i + 1:i + 3], source))
+            block, i = None, i + 2
+        elif line == "#Winglet":
+            TYPE_winglet = _integer(lines[i + 1])
+            if TYPE_winglet not in WINGLET_BLOCKS:
+                raise ValueError("{:}: unknown winglet type {:}".format(source, TYPE_winglet))
+            values.update(_block_values(WINGLET_BLOCKS[TYPE_winglet], lines[i + 2:i + 4], source))
+            block, i = None, i + 3
+        elif line in KEYWORD_BLOCKS:
+            block = KEYWORD_BLOCKS[line]
+        elif line.startswith("#"):
+            block = None
+        elif line and block is not None:
+            keyword, value = line.split()[:2]
+            values[block + keyword] = value
+        i += 1
+    if values:
+        yield make_config(name, values, path)
+
+
+def _parse_csv(path):
+    # one aircraft per row, the header holds the field names; an optional 'label' column names the rows
+    with open(path, newline='') as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=2):
+            label = row.pop('label', None) or "{:}_{:d}".format(os.path.splitext(os.path.basename(path))[0],
+                                                                row_number - 1)
+            yield make_config(label, {field: value for field, value in row.items() if value != ''},
+                              "{:}:{:d}".format(path, row_number))
+
+
+def _parse_json(path):
+    # a list of {field: value} objects (with an optional 'label'), or an object {label: {field: value}}
+    with open(path) as f:
+        data = json.load(f)
+    items = data.items() if isinstance(data, dict) else \
+        [(item.pop('label', "{:}_{:d}".format(os.path.splitext(os.path.basename(path))[0], i + 1)), item)
+         for i, item in enumerate(data)]
+    for label, values in items:
+        yield make_config(label, values, path)
+
+
+PARSERS = {'.txt': _parse_input_file, '.csv': _parse_csv, '.json': _parse_json}
+
+
+def iter_configs(path):
+    """
+    This function streams the aircraft definitions of an input file in the input.txt format (several aircraft
+    separated by "#Aircraft <name>" lines), a CSV table, a JSON file or a directory holding such files
+    :param path: file or directory
+    :return: generator of AircraftConfig
+    """
+    if os.path.isdir(path):
+        for file_path in sorted(glob.glob(os.path.join(path, "*"))):
+            if os.path.splitext(file_path)[1].lower() in PARSERS:
+                yield from iter_configs(file_path)
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PARSERS:
+        raise ValueError("{:}: unknown configuration file type".format(path))
+    yield from PARSERS[extension](path)
+
+
+def load_configs(path):
+    """
+    :return: list of AircraftConfig, see iter_configs
+    """
+    return list(iter_configs(path))
+
+
+def sweep_points(configs, **common):
+    """
+    This function turns aircraft definitions into design points for sweep.run_sweep
+    :param configs: iterable of AircraftConfig
+    :param common: Aircraft inputs that are added to every point, e.g. altitude=9000
+    :return: list of dictionaries of Aircraft inputs
+    """
+    return [dict(common, **config.inputs) for config in configs]
@@ -0,0 +1,40 @@
+import hashlib
+import json
+
+# Stable hashes of ParaPy/AVL data, shared by the AVL result cache and the STEP export manifest. The keys must not
+# change between runs, so everything is converted to plain JSON data first.
+
+
+def plain(value):
+    """
+    This function converts the ParaPy/AVL objects found in a configuration into plain, json-serializable data
+    :param value: number, string, Point, Vector, enumeration, container or object of these
+    :return: plain data
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        # rounding makes the key insensitive to the last bits of floating point noise
+        return round(float(value), 10)
+    if isinstance(value, dict):
+        return {str(key): plain(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(val) for val in value]
+    if hasattr(value, "x") and hasattr(value, "y") and hasattr(value, "z"):
+        # Point and Vector
+        return [plain(value.x), plain(value.y), plain(value.z)]
+    if hasattr(value, "value") and hasattr(value, "name") and not hasattr(value, "setting"):
+        # enumerations such as avl.Spacing
+        return plain(value.value)
+    if hasattr(value, "__dict__"):
+        return {type(value).__name__: plain({key: val for key, val in vars(value).items()
+                                             if not key.startswith("_")})}
+    return repr(value)
+
+
+def digest(data):
+    """
+    :param data: plain data, see plain
+    :return: hexadecimal sha256 digest of its JSON form with sorted keys
+    """
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
@@ -1,5 +1,45 @@
-from tkinter import Tk, messagebox
+import os
 import warnings
+from collections import namedtuple
+from contextlib import contextmanager
+
+# In headless mode no dialog boxes are shown and tkinter is never imported, so that batch runs can evaluate
+# configurations unattended. It is switched on with set_headless() or with the environment variable KBE_HEADLESS=1
+_headless = os.environ.get("KBE_HEADLESS", "0") not in ("", "0")
+_collectors = []
+
+# record of an input value that was out of range and has been replaced: the value given by the user and the value that
+# is used instead
+ClampEvent = namedtuple("ClampEvent", ["slot", "given", "used", "correct_range", "message"])
+
+
+def set_headless(headless=True):
+    """
+    This function switches the headless (batch) mode of the whole process on or off
+    :param headless: True to suppress all dialog boxes
+    :return: None
+    """
+    global _headless
+    _headless = headless
+
+
+def is_headless():
+    return _headless
+
+
+@contextmanager
+def collect_diagnostics():
+    """
+    Context manager that collects the ClampEvents raised by the validators while it is active
+    :return: list to which the ClampEvents are appended
+    """
+    events = []
+    _collectors.append(events)
+    try:
+        yield events
+    finally:
+        # by identity: nested collectors may hold equal lists of events
+        del _collectors[next(i for i, collector in enumerate(_collectors) if collector is events)]
 
 
 def generate_warning(warning_header, msg):
@@ -9,6 +49,9 @@ def generate_warning(warning_header, msg):
     :param msg: the message to be shown in dialog box
     :return: None as it is GUI operation
     """
+    if _headless:
+        return
+    from tkinter import Tk, messagebox
 
     # initialization
     window = Tk()
@@ -23,12 +66,30 @@ def generate_warning(warning_header, msg):
     window.quit()
 
 
+def report_clamp(slot_name, given, used, correct_range, msg, popup=True):
+    """
+    This function reports an input value that is out of range and is replaced by another value
+    :param slot_name: name of the input slot
+    :param given: the value given by the user
+    :param used: the value that is used instead
+    :param correct_range: [min, max] of the accepted values
+    :param msg: the message explaining the change
+    :param popup: show a dialog box, unless the process runs headless
+    :return: None
+    """
+    warnings.warn(msg)
+    event = ClampEvent(slot_name, given, used, tuple(correct_range), msg)
+    for events in _collectors:
+        events.append(event)
+    if popup:
+        generate_warning("Warning: {:} value changed".format(slot_name), msg)
+
+
 def check_slot_change(slot_name, new_value, old_value, correct_range):
+    # new_value is the value given to the slot; out of range, the slot keeps its old value
     if not correct_range[0] <= new_value <= correct_range[1]:
-        msg = "The parameter '{:}' must be between {:} - {:}"
-
-        warnings.warn(msg)
-        generate_warning("Warning: ", msg.format(slot_name, correct_range[0], correct_range[1]))
+        msg = "The parameter '{:}' must be between {:} - {:}".format(slot_name, correct_range[0], correct_range[1])
+        report_clamp(slot_name, given=new_value, used=old_value, correct_range=correct_range, msg=msg)
         return old_value
     else:
         return new_value
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+
+from HelperFunction.atmosphere import isa, dynamic_viscosity, g0
+
+# thickness to chord ratio of the components, used for their wetted area and form factor
+THICKNESS = {'wing': 0.12, 'htp': 0.10, 'vtp': 0.12, 'winglet': 0.08}
+# interference factors of the components (Raymer)
+INTERFERENCE = {'fuselage': 1.0, 'wing': 1.0, 'htp': 1.04, 'vtp': 1.04, 'winglet': 1.1}
+# drag of everything that is not in the build-up (leakage, protuberances, ...) as a fraction of the parasite drag
+EXCRESCENCE = 0.05
+
+# cruise of the default mission: A320 class aircraft at the start of the cruise
+MISSION = {'range': 3000e3,        # cruise distance [m]
+           'mass': 70000.,         # mass at the start of the cruise [kg]
+           'tsfc': 1.6e-5}         # thrust specific fuel consumption [kg/(N s)]
+
+
+# ************************** parasite drag **************************
+
+def skin_friction(reynolds, mach):
+    """
+    :param reynolds: Reynolds number based on the component length
+    :param mach: Mach number
+    :return: turbulent flat plate skin friction coefficient, with the compressibility correction
+    """
+    reynolds = np.asarray(reynolds, dtype=float)
+    return 0.455 / (np.log10(reynolds) ** 2.58 * (1 + 0.144 * np.asarray(mach, dtype=float) ** 2) ** 0.65)
+
+
+def lifting_surface_form_factor(thickness_ratio, sweep, mach, x_max=0.3):
+    """
+    :param thickness_ratio: thickness to chord ratio
+    :param sweep: sweep of the line of maximum thickness [deg]
+    :param mach: Mach number
+    :param x_max: chordwise position of the maximum thickness
+    :return: form factor of a wing or tail
+    """
+    thickness_ratio = np.asarray(thickness_ratio, dtype=float)
+    return ((1 + 0.6 / x_max * thickness_ratio + 100 * thickness_ratio ** 4) *
+            1.34 * np.asarray(mach, dtype=float) ** 0.18 * np.cos(np.radians(sweep)) ** 0.28)
+
+
+def body_form_factor(length, diameter):
+    """
+    :return: form factor of a fuselage with this length and diameter
+    """
+    fineness = np.asarray(length, dtype=float) / np.asarray(diameter, dtype=float)
+    return 1 + 60 / fineness ** 3 + fineness / 400
+
+
+def lifting_surface_wetted_area(area, thickness_ratio):
+    """
+    :param area: exposed planform area [m2]
+    :return: wetted area of both sides [m2]
+    """
+    return np.asarray(area, dtype=float) * (1.977 + 0.52 * np.asarray(thickness_ratio, dtype=float))
+
+
+def drag_components(fuselage, wing, htp, vtp, winglet_area=0., winglet_chord=1., winglet_sweep=0.,
+                    thickness=THICKNESS):
+    """
+    This function collects the wetted area, reference length and form factor data of all components, for arrays of
+    designs at once
+    :param fuselage: dictionary as returned by planform.fuselage_planform, or the Fuselage itself
+    :param wing: dictionary as returned by planform.wing_planform, or the Wing
+    :param htp: dictionary as returned by planform.htp_planform, or the HorizontalTail
+    :param vtp: dictionary as returned by planform.vtp_planform, or the VerticalTail
+    :param winglet_area: planform area of one winglet [m2], 0 without winglets
+    :param winglet_chord: mean chord of the winglet [m]
+    :param winglet_sweep: sweep of the winglet [deg]
+    :param thickness: thickness to chord ratio of the lifting surfaces
+    :return: {component: {'wetted_area', 'length', and 'diameter' or 'thickness_ratio' and 'sweep'}}
+    """
+    get = (lambda data, name: data[name]) if isinstance(fuselage, dict) else getattr
+    fuselage_length = get(fuselage, 'nose_length') + get(fuselage, 'cabin_l') + get(fuselage, 'tail_length')
+    # the part of the wing inside the fuselage is not wetted
+    exposed_wing = get(wing, 'wing_area_total') - get(wing, 'chord_wingroot') * get(fuselage, 'cabin_d')
+    return {'fuselage': {'wetted_area': get(fuselage, 'wetted_area'),
+                         'length': fuselage_length,
+                         'diameter': get(fuselage, 'cabin_d')},
+            'wing': {'wetted_area': lifting_surface_wetted_area(exposed_wing, thickness['wing']),
+                     'length': get(wing, 'MAC_chord_length'),
+                     'thickness_ratio': thickness['wing'],
+                     'sweep': get(wing, 'wing_sweep_025c')},
+            'htp': {'wetted_area': lifting_surface_wetted_area(get(htp, 'ht_area'), thickness['htp']),
+                    'length': get(htp, 'htp_mac'),
+                    'thickness_ratio': thickness['htp'],
+                    'sweep': get(htp, 'htp_sweep')},
+            'vtp': {'wetted_area': lifting_surface_wetted_area(get(vtp, 'area_vtp'), thickness['vtp']),
+                    'length': get(vtp, 'MAC_length_vtp'),
+                    'thickness_ratio': thickness['vtp'],
+                    'sweep': get(vtp, 'sweep_vtp')},
+            'winglet': {'wetted_area': 2 * lifting_surface_wetted_area(winglet_area, thickness['winglet']),
+                        'length': winglet_chord,
+                        'thickness_ratio': thickness['winglet'],
+                        'sweep': winglet_sweep}}
+
+
+def surface_area(sections):
+    """
+    :param sections: Section parts of a surface, from root to tip
+    :return: planform area measured along the surface [m2] and mean chord [m]
+    """
+    points = [section.position.point for section in sections]
+    chords = [section.chord for section in sections]
+    lengths = [math.sqrt((b.y - a.y) ** 2 + (b.z - a.z) ** 2) for a, b in zip(points[:-1], points[1:])]
+    area = sum(0.5 * (c1 + c2) * length for c1, c2, length in zip(chords[:-1], chords[1:], lengths))
+    return area, area / sum(lengths) if sum(lengths) > 0 else max(chords)
+
+
+def aircraft_drag_components(aircraft):
+    """
+    :param aircraft: Aircraft
+    :return: drag_components of its fuselage, wing, tails and winglets, without building any solid
+    """
+    winglet_area, winglet_chord = 0., 1.
+    if aircraft.winglet_ON:
+        winglet_area, winglet_chord = surface_area(aircraft.right_winglet.sections)
+    return drag_components(aircraft.fuselage, aircraft.right_wing, aircraft.htp_right_wing, aircraft.vtp_wing,
+                           winglet_area, winglet_chord)
+
+
+def parasite_drag(components, reference_area, altitude, mach, interference=INTERFERENCE, excrescence=EXCRESCENCE):
+    """
+    This function computes the zero-lift drag coefficient by a component build-up, CD0 = sum(Cf FF Q Swet) / Sref,
+    for arrays of designs and flight conditions at once
+    :param components: see drag_components
+    :param reference_area: wing reference area [m2]
+    :param altitude: altitude [m]
+    :param mach: Mach number
+    :return: CD0 and {component: contribution to CD0}
+    """
+    temperature, pressure, density, speed_of_sound = isa(altitude)
+    mach = np.asarray(mach, dtype=float)
+    reynolds_per_meter = density * mach * speed_of_sound / dynamic_viscosity(temperature)
+    contributions = {}
+    for name, data in components.items():
+        if 'diameter' in data:
+            form_factor = body_form_factor(data['length'], data['diameter'])
+        else:
+            form_factor = lifting_surface_form_factor(data['thickness_ratio'], data['sweep'], mach)
+        cf = skin_friction(reynolds_per_meter * np.asarray(data['length'], dtype=float), mach)
+        contributions[name] = (cf * form_factor * interference.get(name, 1.) * np.asarray(data['wetted_area']) /
+                               np.asarray(reference_area, dtype=float))
+    return (1 + excrescence) * sum(contributions.values()), contributions
+
+
+# ************************** cruise **************************
+
+def induced_drag_factor(CL, CD):
+    """
+    :param CL: lift coefficient of an AVL case, e.g. the fixed_cl case
+    :param CD: inviscid drag coefficient (CDtot) of the same case
+    :return: k of CDi = k * CL^2
+    """
+    return np.asarray(CD, dtype=float) / np.asarray(CL, dtype=float) ** 2
+
+
+def cruise_fuel(CD0, k, reference_area, altitude, mach, mass=MISSION['mass'], distance=MISSION['range'],
+                tsfc=MISSION['tsfc'], segments=20):
+    """
+    This function integrates the Breguet range equation over the cruise, with the lift coefficient and thus L/D
+    updated for the decreasing mass in every segment, for arrays of designs at once
+    :param CD0: zero-lift drag coefficient
+    :param k: induced drag factor, see induced_drag_factor
+    :param reference_area: wing reference area [m2]
+    :param altitude: cruise altitude [m]
+    :param mach: cruise Mach number
+    :param mass: mass at the start of the cruise [kg]
+    :param distance: cruise distance [m]
+    :param tsfc: thrust specific fuel consumption [kg/(N s)]
+    :param segments: number of cruise segments
+    :return: dictionary of arrays: 'fuel' [kg], 'L_over_D' (mean over the cruise) and 'CL' at the start of the cruise
+    """
+    temperature, pressure, density, speed_of_sound = isa(altitude)
+    velocity = np.asarray(mach, dtype=float) * speed_of_sound
+    q = 0.5 * density * velocity ** 2
+    CD0, k, reference_area = [np.asarray(value, dtype=float) for value in (CD0, k, reference_area)]
+    start = current = np.asarray(mass, dtype=float) * np.ones(np.broadcast(CD0, k, reference_area, q).shape)
+    step = distance / segments
+    lift_to_drag = 0.
+    for _ in range(segments):
+        CL = current * g0 / (q * reference_area)
+        segment_lift_to_drag = CL / (CD0 + k * CL ** 2)
+        lift_to_drag = lift_to_drag + segment_lift_to_drag / segments
+        current = current * np.exp(-step * tsfc * g0 / (velocity * segment_lift_to_drag))
+    return {'fuel': start - current,
+            'L_over_D': lift_to_drag,
+            'CL': start * g0 / (q * reference_area)}
+
+
+def mission_fuel(data, case_name='fixed_cl', **mission):
+    """
+    This function evaluates the mission of every design of a table of sweep records at once, e.g. the columns read
+    from the ResultsStore, which hold CD0 and the AVL results
+    :param data: {column: array}, with 'CD0', 'reference_area', 'altitude', 'mach' and CL and CD of the case
+    :param case_name: AVL case of which the induced drag factor is taken
+    :param mission: mass, distance and tsfc of cruise_fuel
+    :return: see cruise_fuel
+    """
+    k = induced_drag_factor(data['CL_' + case_name], data['CD_' + case_name])
+    return cruise_fuel(data['CD0'], k, data['reference_area'], data['altitude'], data['mach'], **mission)
+
+
+def rank_winglets(data, fuel):
+    """
+    :param data: {column: array} with 'TYPE_winglet'
+    :param fuel: fuel of every design, see mission_fuel
+    :return: list of (TYPE_winglet, lowest fuel [kg], index of that design in data), from the best type to the worst
+    """
+    types = np.asarray(data['TYPE_winglet'])
+    ranking = []
+    for TYPE_winglet in np.unique(types):
+        indices = np.flatnonzero(types == TYPE_winglet)
+        best = indices[np.argmin(fuel[indices])]
+        ranking.append((int(TYPE_winglet), float(fuel[best]), int(best)))
+    return sorted(ranking, key=lambda entry: entry[1])
+
+
+if __name__ == '__main__':
+    from HelperFunction.planform import aircraft_planform
+
+    # default aircraft with a range of winglet sizes, CD and CL of the fixed_cl case in the order of AVL results
+    planform = aircraft_planform(34., 0.78, 7., 0.4)
+    winglet_area = np.linspace(0., 3., 7)
+    components = drag_components(planform['fuselage'], planform['wing'], planform['htp'], planform['vtp'],
+                                 winglet_area, 1.2, 40.)
+    CD0, contributions = parasite_drag(components, planform['wing']['wing_area_total'], 11000., 0.78)
+    k = induced_drag_factor(0.5, 0.0115 - 0.0004 * winglet_area)
+    result = cruise_fuel(CD0, k, planform['wing']['wing_area_total'], 11000., 0.78)
+    for area, cd0, fuel, lift_to_drag in zip(winglet_area, CD0, result['fuel'], result['L_over_D']):
+        print("winglet {:4.1f} m2   CD0 {:.5f}   L/D {:5.2f}   fuel {:8.0f} kg".format(area, cd0, lift_to_drag, fuel))
@@ -0,0 +1,323 @@
+import collections
+import json
+import math
+import os
+
+import numpy as np
+
+from HelperFunction.sweep import make_executor, run_sweep
+
+DesignVariable = collections.namedtuple("DesignVariable", ["name", "lower", "upper"])
+
+
+class Problem:
+    """Optimization problem on the Aircraft: design variables with bounds, an objective column of the sweep records
+    (e.g. 'l_over_d_fixed_cl') and constraints that limit the absolute value of other columns (e.g. the root bending
+    moment). Variables are handled scaled to [0, 1] by the optimizers."""
+
+    def __init__(self, baseline, variables, objective, maximize=False, constraints=None, penalty=100.):
+        self.baseline = dict(baseline)              # Aircraft inputs that are not optimized
+        self.variables = [DesignVariable(*variable) for variable in variables]
+        self.objective = objective
+        self.maximize = maximize
+        self.constraints = dict(constraints or {})  # {column: largest accepted absolute value}
+        self.penalty = penalty                      # added per unit of relative constraint violation
+
+    @property
+    def lower(self):
+        return np.array([variable.lower for variable in self.variables], dtype=float)
+
+    @property
+    def upper(self):
+        return np.array([variable.upper for variable in self.variables], dtype=float)
+
+    def point(self, x):
+        """
+        :param x: scaled design vector, clipped to the bounds
+        :return: dictionary of Aircraft inputs
+        """
+        values = self.lower + np.clip(x, 0., 1.) * (self.upper - self.lower)
+        return dict(self.baseline, **{variable.name: float(value) for variable, value in zip(self.variables, values)})
+
+    def scaled(self, values):
+        return (np.asarray(values, dtype=float) - self.lower) / (self.upper - self.lower)
+
+    def violations(self, record):
+        """
+        :return: relative violation of every constraint, positive when violated
+        """
+        return np.array([abs(record[column]) / limit - 1. for column, limit in self.constraints.items()])
+
+    def merit(self, record, x=None):
+        """
+        :return: value to minimize: the objective (negated when maximized), plus penalties for violated constraints,
+        failed analyses and design vectors outside the bounds
+        """
+        if record["error"] is not None:
+            return float("inf")
+        value = -record[self.objective] if self.maximize else record[self.objective]
+        value += self.penalty * float(np.sum(np.maximum(self.violations(record), 0.)))
+        if x is not None:
+            value += self.penalty * float(np.sum((np.asarray(x) - np.clip(x, 0., 1.)) ** 2))
+        return value
+
+
+class Evaluator:
+    """Evaluates design vectors in parallel on the sweep workers, and remembers every result, so that a resumed or
+    restarted optimization never analyses the same design twice."""
+
+    def __init__(self, problem, executor, store=None):
+        self.problem = problem
+        self.executor = executor
+        self.store = store
+        self.history = collections.OrderedDict()  # {design key: record}
+
+    @staticmethod
+    def key(point):
+        # inputs that are no JSON values, e.g. a PanelPolicy, are keyed by their (stable) repr
+        return json.dumps(point, sort_keys=True, default=repr)
+
+    def __call__(self, xs):
+        points = [self.problem.point(x) for x in xs]
+        new = [point for point in collections.OrderedDict((self.key(point), point) for point in points).values()
+               if self.key(point) not in self.history]
+        for point, record in zip(new, run_sweep(new, executor=self.executor, store=self.store)):
+            record.pop("diagnostics", None)
+            self.history[self.key(point)] = record
+        return [self.history[self.key(point)] for point in points]
+
+    @property
+    def best(self):
+        """
+        :return: (record with the lowest merit, merit)
+        """
+        merits = [(self.problem.merit(record), i) for i, record in enumerate(self.history.values())]
+        if not merits:
+            return None, float("inf")
+        merit, i = min(merits)
+        return list(self.history.values())[i], merit
+
+
+class CMAES:
+    """Covariance matrix adaptation evolution strategy (Hansen's standard (mu/mu_w, lambda) formulation), with an
+    ask/tell interface and a state that can be written to JSON. The random numbers of every generation follow from the
+    seed and the generation number, so a resumed run continues exactly as the original would have."""
+
+    def __init__(self, x0, sigma0=0.3, population=None, seed=0):
+        n = len(x0)
+        self.seed = seed
+        self.population = population or 4 + int(3 * math.log(n))
+        mu = self.population // 2
+        weights = math.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1. / np.sum(self.weights ** 2)
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0., math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.mean = np.asarray(x0, dtype=float)
+        self.sigma = sigma0
+        self.C = np.eye(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.generation = 0
+
+    def _eigen(self):
+        eigenvalues, B = np.linalg.eigh(self.C)
+        return np.sqrt(np.maximum(eigenvalues, 1e-20)), B
+
+    def ask(self):
+        """
+        :return: array of shape (population, n) with the design vectors of the next generation
+        """
+        D, B = self._eigen()
+        z = np.random.RandomState(self.seed + self.generation).standard_normal((self.population, len(self.mean)))
+        return self.mean + self.sigma * (z * D) @ B.T
+
+    def tell(self, xs, merits):
+        """
+        :param xs: the design vectors returned by ask
+        :param merits: their values, lower is better
+        """
+        n = len(self.mean)
+        y = (np.asarray(xs) - self.mean) / self.sigma
+        y_best = y[np.argsort(merits)[:len(self.weights)]]
+        y_w = self.weights @ y_best
+        self.mean = self.mean + self.sigma * y_w
+
+        D, B = self._eigen()
+        inv_sqrt_C_y_w = B @ ((B.T @ y_w) / D)
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt_C_y_w
+        h_sigma = float(np.linalg.norm(self.ps) / math.sqrt(1 - (1 - self.cs) ** (2 * (self.generation + 1))) /
+                        self.chi_n < 1.4 + 2 / (n + 1))
+        self.pc = (1 - self.cc) * self.pc + h_sigma * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+        self.C = ((1 - self.c1 - self.cmu) * self.C +
+                  self.c1 * (np.outer(self.pc, self.pc) + (1 - h_sigma) * self.cc * (2 - self.cc) * self.C) +
+                  self.cmu * (y_best.T * self.weights) @ y_best)
+        self.sigma *= math.exp((self.cs / self.damps) * (np.linalg.norm(self.ps) / self.chi_n - 1))
+        self.generation += 1
+
+    def state(self):
+        return {'mean': self.mean.tolist(), 'sigma': self.sigma, 'C': self.C.tolist(), 'pc': self.pc.tolist(),
+                'ps': self.ps.tolist(), 'generation': self.generation, 'seed': self.seed,
+                'population': self.population}
+
+    @classmethod
+    def from_state(cls, state):
+        strategy = cls(state['mean'], state['sigma'], state['population'], state['seed'])
+        strategy.C = np.array(state['C'])
+        strategy.pc = np.array(state['pc'])
+        strategy.ps = np.array(state['ps'])
+        strategy.generation = state['generation']
+        return strategy
+
+
+def _write_checkpoint(path, data):
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, default=repr)
+    os.replace(path + ".tmp", path)
+
+
+def _read_checkpoint(path, method):
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    if data['method'] != method:
+        raise ValueError("{:} is a checkpoint of the {:} optimizer".format(path, data['method']))
+    return data
+
+
+def _restore_history(evaluator, data):
+    for key, record in data['history']:
+        evaluator.history[key] = record
+
+
+def optimize_cma(problem, generations=50, sigma0=0.3, population=None, x0=None, seed=0, checkpoint=None,
+                 executor=None, max_workers=None, store=None, tol_sigma=1e-4):
+    """
+    This function minimizes the merit of a Problem with CMA-ES. Every generation is analysed at once by the sweep
+    workers, and the state is written to the checkpoint file after every generation. When the checkpoint file
+    exists, the optimization resumes from it.
+    :param problem: Problem
+    :param generations: number of generations (including those of a resumed run)
+    :param sigma0: initial step size, in scaled variables
+    :param population: number of designs per generation, by default 4 + 3 ln(n)
+    :param x0: initial design vector in scaled variables, by default the middle of the bounds
+    :param checkpoint: path of the JSON checkpoint file
+    :param store: ResultsStore to which all analysed designs are appended
+    :param tol_sigma: the optimization stops when the step size drops below this value
+    :return: (best record, its merit, Evaluator holding all analysed designs)
+    """
+    if executor is None:
+        with make_executor(max_workers) as pool:
+            return optimize_cma(problem, generations, sigma0, population, x0, seed, checkpoint, pool,
+                                store=store, tol_sigma=tol_sigma)
+
+    evaluator = Evaluator(problem, executor, store)
+    data = _read_checkpoint(checkpoint, 'cma')
+    if data is not None:
+        strategy = CMAES.from_state(data['state'])
+        _restore_history(evaluator, data)
+    else:
+        strategy = CMAES(np.full(len(problem.variables), 0.5) if x0 is None else x0, sigma0, population, seed)
+
+    while strategy.generation < generations and strategy.sigma > tol_sigma:
+        xs = strategy.ask()
+        records = evaluator(xs)
+        strategy.tell(xs, [problem.merit(record, x) for record, x in zip(records, xs)])
+        if checkpoint is not None:
+            _write_checkpoint(checkpoint, {'method': 'cma', 'state': strategy.state(),
+                                           'history': list(evaluator.history.items())})
+    best, merit = evaluator.best
+    return best, merit, evaluator
+
+
+def optimize_scipy(problem, method="SLSQP", x0=None, relative_step=1e-2, checkpoint=None, executor=None,
+                   max_workers=None, store=None, options=None):
+    """
+    This function optimizes a Problem with a gradient based method of scipy.optimize, with the gradients of the
+    objective and the constraints from parallel finite differences (see sensitivity.gradients). All analysed designs
+    are written to the checkpoint file; a restarted optimization starts from the best design in it and takes all
+    earlier analyses from there.
+    :param problem: Problem
+    :param method: 'SLSQP', 'trust-constr' or 'COBYLA' (the latter without gradients)
+    :param x0: initial design vector in scaled variables, by default the middle of the bounds
+    :param relative_step: finite difference step, relative to the range of every variable
+    :param checkpoint: path of the JSON checkpoint file
+    :param options: options of scipy.optimize.minimize
+    :return: (best record, its merit, Evaluator holding all analysed designs)
+    """
+    from scipy.optimize import minimize
+
+    if executor is None:
+        with make_executor(max_workers) as pool:
+            return optimize_scipy(problem, method, x0, relative_step, checkpoint, pool, store=store,
+                                  options=options)
+
+    evaluator = Evaluator(problem, executor, store)
+    data = _read_checkpoint(checkpoint, 'scipy')
+    if data is not None:
+        _restore_history(evaluator, data)
+    if x0 is None:
+        best, _ = evaluator.best
+        x0 = problem.scaled([best[variable.name] for variable in problem.variables]) if best is not None else \
+            np.full(len(problem.variables), 0.5)
+    sign = -1. if problem.maximize else 1.
+    columns = [problem.objective] + list(problem.constraints)
+    uses_gradients = method.upper() != "COBYLA"
+    memo = {}  # {x.tobytes(): (values, gradient)} of the last design, shared by the objective and the constraints
+
+    def values_and_gradients(x):
+        x = np.asarray(x, dtype=float)
+        if x.tobytes() in memo:
+            return memo[x.tobytes()]
+        # the design and one step per variable are analysed together. The step is taken backward at the upper
+        # bound, since Problem.point clips the design to the bounds and a forward step would change nothing
+        steps = np.where(x + relative_step > 1., -relative_step, relative_step) if uses_gradients else []
+        analysed = len(evaluator.history)
+        records = evaluator([x] + [x + step for step in np.diag(steps)])
+        if checkpoint is not None and len(evaluator.history) > analysed:
+            _write_checkpoint(checkpoint, {'method': 'scipy', 'history': list(evaluator.history.items())})
+        if records[0]["error"] is not None:
+            raise RuntimeError("Analysis failed at {:}: {:}".format(problem.point(x), records[0]["error"]))
+        values = np.array([records[0][column] for column in columns])
+        gradient = np.array([[(record[column] - records[0][column]) / step for record, step in zip(records[1:], steps)]
+                             for column in columns])
+        memo.clear()
+        memo[x.tobytes()] = values, gradient
+        return values, gradient
+
+    def objective(x):
+        values, gradient = values_and_gradients(x)
+        return sign * values[0], sign * gradient[0]
+
+    constraints = []
+    for i, (column, limit) in enumerate(problem.constraints.items(), start=1):
+        # limit - |value| >= 0
+        constraint = {'type': 'ineq', 'fun': lambda x, i=i, limit=limit: limit - abs(values_and_gradients(x)[0][i])}
+        if uses_gradients:
+            constraint['jac'] = lambda x, i=i: -np.sign(values_and_gradients(x)[0][i]) * values_and_gradients(x)[1][i]
+        constraints.append(constraint)
+    if uses_gradients:
+        minimize(objective, x0, jac=True, method=method, bounds=[(0., 1.)] * len(x0), constraints=constraints,
+                 options=options)
+    else:
+        # COBYLA takes no bounds, they are constraints as well
+        constraints += [{'type': 'ineq', 'fun': lambda x, j=j: x[j]} for j in range(len(x0))]
+        constraints += [{'type': 'ineq', 'fun': lambda x, j=j: 1. - x[j]} for j in range(len(x0))]
+        minimize(lambda x: objective(x)[0], x0, method=method, constraints=constraints, options=options)
+    best, merit = evaluator.best
+    return best, merit, evaluator
+
+
+if __name__ == '__main__':
+    problem = Problem({'TYPE_winglet': 0, 'altitude': 9000},
+                      [('ct_cant', 0., 40.), ('ct_height_ratio', 0.05, 0.1), ('ct_sweep', 30., 50.)],
+                      objective='l_over_d_fixed_cl', maximize=True,
+                      constraints={'M_root_fixed_cl': 2.5e6})
+    record, merit, _ = optimize_cma(problem, generations=20, checkpoint="optimizer_checkpoint.json")
+    print({variable.name: record[variable.name] for variable in problem.variables}, merit)
@@ -0,0 +1,139 @@
+import math
+
+import kbeutils.avl as avl
+
+# panel counts of the AVL surfaces when no policy is given
+DEFAULT_PANELS = (12, avl.Spacing.equal, 20, avl.Spacing.equal)
+
+
+def _spacing_value(spacing):
+    # avl.Spacing members are plain numbers or enumerations holding the number
+    return float(getattr(spacing, "value", spacing))
+
+
+class PanelPolicy:
+    """Discretization of the AVL surfaces from their physical size: the number of spanwise panels follows from a
+    target panel width along the span and the number of chordwise panels from the mean chord, both within limits.
+    Long wings and small winglets then get panels of similar size."""
+
+    def __init__(self, panel_width=1.0, chordwise_per_meter=2.0, min_chordwise=4, max_chordwise=24,
+                 min_spanwise=2, max_spanwise=60, chord_spacing=avl.Spacing.cosine, span_spacing=avl.Spacing.equal,
+                 name="custom"):
+        self.panel_width = panel_width                  # target spanwise panel width [m]
+        self.chordwise_per_meter = chordwise_per_meter  # chordwise panels per meter of mean chord
+        self.min_chordwise = min_chordwise
+        self.max_chordwise = max_chordwise
+        self.min_spanwise = min_spanwise
+        self.max_spanwise = max_spanwise
+        self.chord_spacing = chord_spacing
+        self.span_spacing = span_spacing
+        self.name = name
+
+    def __repr__(self):
+        # stable text of all parameters, used as the key of a custom policy in design point keys
+        return ("PanelPolicy(panel_width={!r}, chordwise_per_meter={!r}, min_chordwise={!r}, max_chordwise={!r}, "
+                "min_spanwise={!r}, max_spanwise={!r}, chord_spacing={:g}, span_spacing={:g}, name={!r})").format(
+            self.panel_width, self.chordwise_per_meter, self.min_chordwise, self.max_chordwise, self.min_spanwise,
+            self.max_spanwise, _spacing_value(self.chord_spacing), _spacing_value(self.span_spacing), self.name)
+
+    def counts(self, span, mean_chord):
+        """
+        :param span: length of the surface along its sections [m]
+        :param mean_chord: mean chord of the surface [m]
+        :return: (n_chordwise, chord_spacing, n_spanwise, span_spacing) of the avl.Surface
+        """
+        n_chordwise = min(max(int(math.ceil(self.chordwise_per_meter * mean_chord)), self.min_chordwise),
+                          self.max_chordwise)
+        n_spanwise = min(max(int(math.ceil(span / self.panel_width)), self.min_spanwise), self.max_spanwise)
+        return n_chordwise, self.chord_spacing, n_spanwise, self.span_spacing
+
+    def refined(self, factor=2.):
+        """
+        :return: a policy with panels that are this factor smaller in both directions
+        """
+        return PanelPolicy(self.panel_width / factor, self.chordwise_per_meter * factor,
+                           self.min_chordwise, int(self.max_chordwise * factor),
+                           self.min_spanwise, int(self.max_spanwise * factor),
+                           self.chord_spacing, self.span_spacing, "{:}/{:g}".format(self.name, factor))
+
+
+COARSE = PanelPolicy(panel_width=2.0, chordwise_per_meter=1.0, max_chordwise=8, max_spanwise=20, name="coarse")
+MEDIUM = PanelPolicy(panel_width=1.0, chordwise_per_meter=2.0, max_chordwise=16, max_spanwise=40, name="medium")
+FINE = PanelPolicy(panel_width=0.5, chordwise_per_meter=4.0, max_chordwise=32, max_spanwise=80, name="fine")
+PRESETS = {'coarse': COARSE, 'medium': MEDIUM, 'fine': FINE}
+
+
+def resolve_policy(value):
+    """
+    :param value: PanelPolicy, name of a preset ('coarse', 'medium' or 'fine') or None
+    :return: PanelPolicy, or None for the default panel counts
+    """
+    if value is None or isinstance(value, PanelPolicy):
+        return value
+    if str(value).lower() not in PRESETS:
+        raise ValueError("'{:}' is not one of {:}".format(value, ", ".join(PRESETS)))
+    return PRESETS[str(value).lower()]
+
+
+def policy_label(value):
+    """
+    :param value: PanelPolicy, name of a preset or None
+    :return: text that is stored with the results instead of the policy: the name of a preset, the repr of a custom
+    policy, or None
+    """
+    if value is None or isinstance(value, str):
+        return value
+    for name, preset in PRESETS.items():
+        if value is preset:
+            return name
+    return repr(value)
+
+
+def surface_panels(policy, sections):
+    """
+    This function computes the panel counts of an avl.Surface through the given sections
+    :param policy: PanelPolicy or name of a preset, or None for the default counts
+    :param sections: Section parts of the surface, from root to tip
+    :return: (n_chordwise, chord_spacing, n_spanwise, span_spacing)
+    """
+    policy = resolve_policy(policy)
+    if policy is None:
+        return DEFAULT_PANELS
+    points = [section.position.point for section in sections]
+    span = sum(math.hypot(b.y - a.y, b.z - a.z) for a, b in zip(points[:-1], points[1:]))
+    chords = [section.chord for section in sections]
+    mean_chord = sum(0.5 * (c1 + c2) * math.hypot(b.y - a.y, b.z - a.z)
+                     for c1, c2, a, b in zip(chords[:-1], chords[1:], points[:-1], points[1:])) / span \
+        if span > 0 else max(chords)
+    return policy.counts(span, mean_chord)
+
+
+def converge_panels(params, policies=(COARSE, MEDIUM, FINE), tolerance=0.01):
+    """
+    This function analyses one design with ever finer panels, until CL, induced drag and root bending moment of all
+    cases change less than the tolerance between two levels
+    :param params: dictionary of Aircraft input slots
+    :param policies: PanelPolicies from coarse to fine
+    :param tolerance: largest accepted relative change
+    :return: (the coarsest converged policy, or the finest one; list of (policy, results) of every level analysed)
+    """
+    from full_aircraft import Aircraft
+
+    history = []
+    for policy in policies:
+        analysis = Aircraft(label="Convergence aircraft", **dict(params, analysis_only=True,
+                                                                 panel_policy=policy)).avl_analysis
+        results = {'CL': analysis.CL,
+                   'CDi': {case_name: result['Totals'].get('CDind', result['Totals']['CDtot'])
+                           for case_name, result in analysis.cached_results.items()},
+                   'M_root': dict(zip(analysis.load_distributions.case_names, analysis.rootBendingMoment))}
+        history.append((policy, results))
+        if len(history) > 1:
+            previous = history[-2][1]
+            changes = [abs(results[name][case_name] - previous[name][case_name]) /
+                       max(abs(previous[name][case_name]), 1e-12)
+                       for name in results for case_name in results[name]]
+            if max(changes) < tolerance:
+                # the previous level gives the same answer within the tolerance, for less work
+                return history[-2][0], history
+    return policies[-1], history
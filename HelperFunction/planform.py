@@ -0,0 +1,304 @@
+import numpy as np
+
+# The functions in this file compute the same sizing quantities as the Wing, HorizontalTail, VerticalTail and Fuselage
+# classes, with the same names, but for arrays of designs at once and without building any geometry. Out of range
+# inputs are replaced by the same default values as the validators of those classes do (without warnings).
+
+
+def clamp(value, low, high, default):
+    """
+    :param value: array of input values
+    :param low: lowest accepted value
+    :param high: highest accepted value
+    :param default: value used instead of the values that are out of range
+    :return: array of accepted values
+    """
+    value = np.asarray(value, dtype=float)
+    return np.where((value < low) | (value > high), default, value)
+
+
+# scaling of the nose sections of the Fuselage, from the tip of the nose to the start of the cabin
+FU_SECTIONS = (0.1, 0.55, 0.8, 0.9, 0.96, 1.)
+
+
+def fuselage_profile(nose_length, cabin_l, tail_length, cabin_d, fu_sections=FU_SECTIONS, fraction_r=0.1,
+                     upsweep_angle=10., cabin_sections=3):
+    """
+    This function computes the circular cross-sections of the Fuselage loft, from the nose to the tail, for arrays of
+    designs at once
+    :param fu_sections: radii of the nose sections as a fraction of the cabin radius, equally spaced along the nose
+    :param fraction_r: radius of the tail end as a fraction of the cabin radius
+    :param upsweep_angle: angle of the tail centreline with the cabin centreline [deg]
+    :param cabin_sections: number of sections along the cabin, including its ends, that keep the loft cylindrical
+    :return: x and z of the centre and radius of every section, arrays of shape (..., number of sections)
+    """
+    nose_length, cabin_l, tail_length, cabin_d = [np.asarray(value, dtype=float)[..., None] for value in
+                                                  np.broadcast_arrays(nose_length, cabin_l, tail_length, cabin_d)]
+    radius = cabin_d / 2.
+    nose = np.linspace(0., 1., len(fu_sections))
+    cabin = np.linspace(0., 1., cabin_sections)[1:]  # the first one is the last nose section
+    ones = np.ones_like(cabin)
+    tail_start = nose_length + cabin_l
+    x = np.concatenate([nose_length * nose, nose_length + cabin_l * cabin,
+                        tail_start + 0.25, tail_start + tail_length], axis=-1)
+    # the top of the first tail section stays on the cabin top line, the tail end is swept up
+    z = np.concatenate([np.zeros_like(nose_length * nose), np.zeros_like(cabin_l * ones),
+                        0.01 * radius, tail_length * np.tan(np.radians(upsweep_angle))], axis=-1)
+    r = np.concatenate([radius * np.asarray(fu_sections, dtype=float), radius * ones,
+                        0.99 * radius, fraction_r * radius], axis=-1)
+    return x, z, r
+
+
+def revolution_properties(x, z, r, n_angles=64):
+    """
+    This function computes the surface area and volume of a closed body that is ruled (straight lines) between
+    circular cross-sections. The centres may be offset (upsweep). For the smooth Fuselage loft, pass the samples of
+    smooth_profile.
+    :param x: axial position of the sections, array of shape (..., number of sections)
+    :param z: vertical offset of the centres
+    :param r: radius of the sections
+    :param n_angles: number of angles of the integration around the circumference
+    :return: surface area [m2] including both end faces, volume [m3]
+    """
+    dx, dz, dr = np.diff(x, axis=-1), np.diff(z, axis=-1), np.diff(r, axis=-1)
+    r1, r2 = r[..., :-1], r[..., 1:]
+    # the area element of the ruled surface between two sections is r(t) * sqrt(dx^2 + (dr + dz sin(theta))^2);
+    # its mean over the periodic angle is integrated exactly enough with equally spaced angles
+    sin = np.sin(np.linspace(0., 2 * np.pi, n_angles, endpoint=False))
+    slant = np.mean(np.hypot(dx[..., None], dr[..., None] + dz[..., None] * sin), axis=-1)
+    area = np.pi * np.sum((r1 + r2) * slant, axis=-1) + np.pi * (r[..., 0] ** 2 + r[..., -1] ** 2)
+    # every cross-section of the ruled surface is a circle, so the offset does not change the volume
+    volume = np.pi / 3. * np.sum(dx * (r1 ** 2 + r1 * r2 + r2 ** 2), axis=-1)
+    return area, volume
+
+
+def smooth_profile(x, z, r, points_per_section=20):
+    """
+    This function samples the smooth Fuselage loft between its cross-sections, so that revolution_properties of the
+    samples gives the area and volume of the smooth loft. The centre height and radius are natural cubic splines in x
+    through the sections, like the loft through the circles.
+    :param x: axial position of the sections, increasing, array of shape (..., number of sections)
+    :param z: vertical offset of the centres
+    :param r: radius of the sections
+    :param points_per_section: number of samples from one section up to the next one
+    :return: x, z and r of the samples, arrays of shape (..., (number of sections - 1) * points_per_section + 1)
+    """
+    x, z, r = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (x, z, r)])
+    y = np.stack([z, r], axis=-1)
+    h = np.diff(x, axis=-1)
+    slope = np.diff(y, axis=-2) / h[..., None]
+    # second derivatives at the sections, zero at both ends
+    n = x.shape[-1]
+    matrix = np.zeros(x.shape[:-1] + (n - 2, n - 2))
+    index = np.arange(n - 2)
+    matrix[..., index, index] = 2. * (h[..., :-1] + h[..., 1:])
+    matrix[..., index[1:], index[:-1]] = h[..., 1:-1]
+    matrix[..., index[:-1], index[1:]] = h[..., 1:-1]
+    second = np.zeros(y.shape)
+    if n > 2:
+        second[..., 1:-1, :] = np.linalg.solve(matrix, 6. * np.diff(slope, axis=-2))
+    t = np.linspace(0., 1., points_per_section, endpoint=False)[:, None]
+    h, second = h[..., None, None], second[..., None, :]
+    samples = ((1. - t) * y[..., :-1, None, :] + t * y[..., 1:, None, :] +
+               h ** 2 / 6. * (((1. - t) ** 3 - (1. - t)) * second[..., :-1, :, :] + (t ** 3 - t) * second[..., 1:, :, :]))
+    samples = np.concatenate([samples.reshape(y.shape[:-2] + (-1, 2)), y[..., -1:, :]], axis=-2)
+    x = np.concatenate([(x[..., :-1, None] + t[:, 0] * h[..., 0]).reshape(x.shape[:-1] + (-1,)), x[..., -1:]],
+                       axis=-1)
+    return x, samples[..., 0], samples[..., 1]
+
+
+def fuselage_planform(ln_d=1.22, lt_d=2.724, fuselage_length=37.57, cabin_d=4.14):
+    nose_slenderness_ratio = clamp(ln_d, 1.22, 2.0, 1.22)
+    tail_slenderness_ratio = clamp(lt_d, 2.5, 3.2, 2.724)
+    nose_length = cabin_d * nose_slenderness_ratio
+    tail_length = tail_slenderness_ratio * cabin_d
+    cabin_l = fuselage_length - (nose_length + tail_length)
+    wetted_area, volume = revolution_properties(*smooth_profile(*fuselage_profile(nose_length, cabin_l, tail_length,
+                                                                                  cabin_d)))
+    return {'nose_slenderness_ratio': nose_slenderness_ratio,
+            'tail_slenderness_ratio': tail_slenderness_ratio,
+            'nose_length': nose_length,
+            'tail_length': tail_length,
+            'cabin_l': cabin_l,
+            'cabin_d': cabin_d * np.ones_like(nose_length),
+            'wetted_area': wetted_area,
+            'volume': volume}
+
+
+def wing_planform(wing_span, M_cruise, wing_c_root, wing_taper_ratio_inboard, TYPE_airfoil=1, cabin_l=21.242,
+                  twist=-5., incidence=3.):
+    """
+    This function computes the Wing sizing for arrays of input vectors
+    :return: dictionary of arrays, with the names of the Wing attributes
+    """
+    cruise_mach = clamp(M_cruise, 0.68, 0.92, 0.756)
+    span_wing = clamp(wing_span, 32, 34.5, 34)
+    chord_wingroot = clamp(wing_c_root, 6.3, 7.5, 7)
+    inboard_taper = clamp(wing_taper_ratio_inboard, 0.38, 0.48, 0.48)
+    TYPE_airfoil = np.asarray(TYPE_airfoil)
+    M_tech_factor = np.where(TYPE_airfoil == 1, 0.935, np.where(TYPE_airfoil == 2, 0.87, 1.))
+
+    M_dd = cruise_mach + 0.03
+    cos_sweep = 0.75 * M_tech_factor / M_dd
+    wing_sweep_025c = np.where(cos_sweep < 1, np.degrees(np.arccos(np.minimum(cos_sweep, 1.))), 0.)
+    full_wing_taper_ratio = 0.156 * (2 - np.radians(wing_sweep_025c))
+    wing_dihedral = 5. - (wing_sweep_025c - wing_sweep_025c % 10.) / 10.
+
+    kink_span = 0.4 * span_wing / 2
+    wing_c_tip = full_wing_taper_ratio * chord_wingroot
+    wing_c_kink = chord_wingroot * inboard_taper
+    wing_area_inboard = 0.5 * (chord_wingroot + wing_c_kink) * 2 * kink_span
+    wing_area_outboard = 0.5 * (wing_c_kink + wing_c_tip) * (span_wing - 2 * kink_span)
+    wing_area_total = wing_area_outboard + wing_area_inboard
+    wing_aspect_ratio = (2 * span_wing) / \
+        (chord_wingroot * (((1 - full_wing_taper_ratio) * (2 * kink_span / span_wing)) +
+                           (inboard_taper + full_wing_taper_ratio)))
+    wing_taper_ratio_outboard = wing_c_tip / wing_c_kink
+
+    mac_in = (2 * chord_wingroot / 3) * ((1 + inboard_taper + inboard_taper ** 2) / (1 + inboard_taper))
+    mac_out = (2 * wing_c_kink / 3) * ((1 + wing_taper_ratio_outboard + wing_taper_ratio_outboard ** 2) /
+                                       (1 + wing_taper_ratio_outboard))
+    MAC_chord_length = (mac_in * wing_area_inboard + mac_out * wing_area_outboard) / wing_area_total
+
+    y_mac_in = (span_wing / 15) * ((chord_wingroot + 2 * wing_c_kink) / (chord_wingroot + wing_c_kink))
+    y_mac_out = ((span_wing / 13500) * ((1330 * wing_c_tip - 117 * wing_c_kink) / (wing_c_kink + wing_c_tip))) + \
+        kink_span
+    y_mac = (y_mac_in * wing_area_inboard + y_mac_out * wing_area_outboard) / wing_area_total
+    starting_point_mac = (y_mac * np.tan(np.radians(wing_sweep_025c)) - 0.25 * MAC_chord_length +
+                          0.25 * chord_wingroot) + 0.48 * cabin_l
+
+    return {'cruise_mach': cruise_mach,
+            'span_wing': span_wing,
+            'chord_wingroot': chord_wingroot,
+            'inboard_taper': inboard_taper,
+            'wing_twist': clamp(twist, -5, 0, -5),
+            'wing_incidence': clamp(incidence, 0, 5, 3),
+            'M_tech_factor': M_tech_factor,
+            'M_dd': M_dd,
+            'wing_sweep_025c': wing_sweep_025c,
+            'full_wing_taper_ratio': full_wing_taper_ratio,
+            'wing_dihedral': wing_dihedral,
+            'kink_span': kink_span,
+            'wing_c_kink': wing_c_kink,
+            'wing_c_tip': wing_c_tip,
+            'wing_area_inboard': wing_area_inboard,
+            'wing_area_outboard': wing_area_outboard,
+            'wing_area_total': wing_area_total,
+            'wing_aspect_ratio': wing_aspect_ratio,
+            'wing_taper_ratio_outboard': wing_taper_ratio_outboard,
+            'mac_in': mac_in,
+            'mac_out': mac_out,
+            'MAC_chord_length': MAC_chord_length,
+            'y_mac_in': y_mac_in,
+            'y_mac_out': y_mac_out,
+            'y_mac': y_mac,
+            'starting_point_mac': starting_point_mac}
+
+
+def htp_planform(wing_area, starting_point_mac, wing_sweep_025c, MAC_chord_length, htp_area=31, htp_taper=0.256,
+                 Vh=1., htp_aspect=5.):
+    """
+    This function computes the HorizontalTail sizing for arrays of input vectors
+    :return: dictionary of arrays, with the names of the HorizontalTail attributes
+    """
+    ht_area = clamp(htp_area, 30, 37, 31)
+    h_taper_ratio = clamp(htp_taper, 0.24, 0.4, 0.256)
+    htp_span = (ht_area * htp_aspect) ** 0.5
+    lh = (Vh * wing_area * MAC_chord_length) / ht_area
+    htp_c_root = (2 * htp_span) / (htp_aspect * (1 + h_taper_ratio))
+    htp_mac = (2 * htp_c_root / 3) * ((1 + h_taper_ratio + h_taper_ratio ** 2) / (1 + h_taper_ratio))
+    return {'ht_area': ht_area,
+            'h_taper_ratio': h_taper_ratio,
+            'Vh': Vh * np.ones_like(ht_area),
+            'htp_span': htp_span,
+            'htp_sweep': np.asarray(wing_sweep_025c, dtype=float) + 10.,
+            'lh': lh,
+            'htp_c_root': htp_c_root,
+            'htp_c_tip': htp_c_root * h_taper_ratio,
+            'htp_mac': htp_mac,
+            'htp_mac_y_pos': (htp_span / 6) * ((1 + 2 * h_taper_ratio) / (1 + h_taper_ratio)),
+            'starting_point_mac_htp': starting_point_mac + MAC_chord_length * 0.25 + lh - 0.25 * htp_mac}
+
+
+def vtp_planform(wing_area, MAC_chord_length, starting_point_mac, wing_span, vtp_aspect_ratio=1.82, vtp_sweep=35,
+                 vtp_area=21.5, Vv=0.083, vtp_taper=0.3):
+    """
+    This function computes the VerticalTail sizing for arrays of input vectors
+    :return: dictionary of arrays, with the names of the VerticalTail attributes
+    """
+    sweep_vtp = clamp(vtp_sweep, 35, 40, 35)
+    aspect_vtp = clamp(vtp_aspect_ratio, 1.7, 1.95, 1.82)
+    area_vtp = clamp(vtp_area, 21.5, 26.5, 21.5)
+    vtp_span = np.sqrt(aspect_vtp * area_vtp)
+    vtp_c_root = (2. * vtp_span) / (aspect_vtp * (1 + vtp_taper))
+    vtp_tailarm = (Vv * wing_area * wing_span) / area_vtp
+    MAC_length_vtp = (2. / 3.) * vtp_c_root * (1. + vtp_taper + vtp_taper ** 2.) / (1 + vtp_taper)
+    return {'sweep_vtp': sweep_vtp,
+            'aspect_vtp': aspect_vtp,
+            'area_vtp': area_vtp,
+            'vtp_span': vtp_span,
+            'vtp_c_root': vtp_c_root,
+            'vtp_c_tip': vtp_c_root * vtp_taper,
+            'Vv': Vv * np.ones_like(vtp_span),
+            'vtp_tailarm': vtp_tailarm,
+            'mac_y_pos_vtp': (vtp_span / 3) * ((1 + 2 * vtp_taper) / (1 + vtp_taper)),
+            'MAC_length_vtp': MAC_length_vtp,
+            'starting_pt_mac_vtp': starting_point_mac + 0.25 * MAC_chord_length + vtp_tailarm -
+                                   0.25 * MAC_length_vtp}
+
+
+def tail_sizing(wing, wing_span, htp_area=31, htp_taper=0.256, vtp_aspect_ratio=1.82, vtp_sweep=35, vtp_area=21.5,
+                Vh=1., Vv=0.083):
+    """
+    This function sizes and places both tails for arrays of wing planforms at once. The tail arms follow in closed
+    form from the volume coefficients, lh = Vh * S * c / Sh and lv = Vv * S * b / Sv, so no iteration between the
+    tails is needed. Geometry is only built afterwards, by the Aircraft of the selected design.
+    :param wing: dictionary of arrays as returned by wing_planform
+    :param wing_span: wing span [m], array that broadcasts with the wing arrays
+    :param Vh: horizontal tail volume coefficient, scalar or array
+    :param Vv: vertical tail volume coefficient, scalar or array
+    :return: dictionary with a dictionary of arrays for 'htp' and 'vtp'
+    """
+    htp = htp_planform(wing['wing_area_total'], wing['starting_point_mac'], wing['wing_sweep_025c'],
+                       wing['MAC_chord_length'], htp_area, htp_taper, np.asarray(Vh, dtype=float))
+    vtp = vtp_planform(wing['wing_area_total'], wing['MAC_chord_length'], wing['starting_point_mac'],
+                       np.asarray(wing_span, dtype=float), vtp_aspect_ratio, vtp_sweep, vtp_area,
+                       np.asarray(Vv, dtype=float))
+    return {'htp': htp, 'vtp': vtp}
+
+
+def aircraft_planform(wing_span, M_cruise, wing_c_root, wing_taper_ratio_inboard, TYPE_wing_airfoil=1,
+                      twist=-5., incidence=3., ln_d=1.22, lt_d=2.724, htp_area=31, htp_taper=0.3,
+                      vtp_aspect_ratio=1.82, vtp_sweep=35, vtp_area=21.5, Vh=1., Vv=0.083):
+    """
+    This function computes the fuselage, wing and tail sizing of the Aircraft class for arrays of its inputs, wired
+    together in the same way as the parts of the Aircraft
+    :return: dictionary with a dictionary of arrays for 'fuselage', 'wing', 'htp' and 'vtp'
+    """
+    fuselage = fuselage_planform(ln_d, lt_d)
+    wing = wing_planform(wing_span, M_cruise, wing_c_root, wing_taper_ratio_inboard, TYPE_wing_airfoil,
+                         fuselage['cabin_l'], twist, incidence)
+    tails = tail_sizing(wing, wing_span, htp_area, htp_taper, vtp_aspect_ratio, vtp_sweep, vtp_area, Vh, Vv)
+    return {'fuselage': fuselage, 'wing': wing, 'htp': tails['htp'], 'vtp': tails['vtp']}
+
+
+if __name__ == '__main__':
+    # consistency check against the ParaPy classes, for the default aircraft and a few variations
+    from full_aircraft import Aircraft
+    from HelperFunction.help_fucntions import set_headless
+
+    set_headless(True)
+    variations = [{}, {'wing_span': 32.5, 'M_cruise': 0.72}, {'TYPE_wing_airfoil': 3, 'htp_taper': 0.25},
+                  {'wing_c_root': 6.5, 'wing_taper_ratio_inboard': 0.4, 'ln_d': 1.8, 'vtp_area': 24}]
+    for variation in variations:
+        aircraft = Aircraft(**variation)
+        inputs = {name: getattr(aircraft, name) for name in
+                  ['wing_span', 'M_cruise', 'wing_c_root', 'wing_taper_ratio_inboard', 'TYPE_wing_airfoil',
+                   'twist', 'incidence', 'ln_d', 'lt_d', 'htp_area', 'htp_taper', 'vtp_aspect_ratio', 'vtp_sweep',
+                   'vtp_area', 'Vh', 'Vv']}
+        planform = aircraft_planform(**inputs)
+        for group, part in [('fuselage', aircraft.fuselage), ('wing', aircraft.right_wing),
+                            ('htp', aircraft.htp_right_wing), ('vtp', aircraft.vtp_wing)]:
+            for name, value in planform[group].items():
+                assert np.isclose(value, getattr(part, name)), (variation, group, name, value, getattr(part, name))
+    print("planform engine consistent with the ParaPy classes")
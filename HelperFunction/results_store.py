@@ -0,0 +1,124 @@
+import glob
+import os
+import time
+import uuid
+
+import numpy as np
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "results_store")
+
+
+def flatten_record(record):
+    """
+    This function turns nested results, e.g. {'CL': {'fixed_aoa': 0.6}}, into flat columns, e.g. {'CL_fixed_aoa': 0.6}
+    :param record: dictionary of scalars and dictionaries of scalars
+    :return: flat dictionary
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in flatten_record(value).items():
+                flat["{:}_{:}".format(key, sub_key)] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _column(values):
+    array = np.asarray(["" if value is None else value for value in values]
+                       if any(isinstance(value, str) for value in values) else
+                       [np.nan if value is None else value for value in values])
+    if array.dtype.kind not in "biufU":
+        raise TypeError("Results can only hold numbers and strings, not {:}".format(array.dtype))
+    return array
+
+
+def _chunk_name():
+    # chunk names start with the time of writing, so sorting them gives the order in which they were appended
+    return "chunk_{:020d}_{:}_{:}".format(time.time_ns(), os.getpid(), uuid.uuid4().hex)
+
+
+def _missing(dtype, length):
+    if np.dtype(dtype).kind == "U":
+        return np.full(length, "", dtype=dtype)
+    return np.full(length, np.nan)
+
+
+class ResultsStore:
+    """Append-only columnar log of analysis results. Every append writes one chunk (.npz file with one array per
+    column) under a unique name, so any number of processes can write to the same store at the same time."""
+
+    def __init__(self, directory=DEFAULT_RESULTS_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def chunks(self):
+        return sorted(glob.glob(os.path.join(self.directory, "chunk_*.npz")))
+
+    def append(self, records):
+        """
+        :param records: one record or a list of records; every record is a flat dictionary of numbers and strings
+        :return: path of the written chunk
+        """
+        if isinstance(records, dict):
+            records = [records]
+        if not records:
+            return None
+        names = []
+        for record in records:
+            names += [name for name in record if name not in names]
+        columns = {name: _column([record.get(name) for record in records]) for name in names}
+
+        name = _chunk_name()
+        temp_path = os.path.join(self.directory, "." + name + ".npz")
+        # a chunk only gets its final name once it is completely written, so readers never see half a chunk
+        np.savez(temp_path, **columns)
+        path = os.path.join(self.directory, name + ".npz")
+        os.replace(temp_path, path)
+        return path
+
+    def read(self, columns=None, **filters):
+        """
+        :param columns: names of the columns to read, all columns when None
+        :param filters: column=value to select equal rows, or column=function returning a boolean mask
+        :return: dictionary of column arrays
+        """
+        chunks = []
+        for path in self.chunks:
+            with np.load(path) as chunk:
+                wanted = chunk.files if columns is None else list(columns) + list(filters)
+                # npz files only load an array when it is accessed, so unused columns are never read from disk
+                chunks.append((len(chunk[chunk.files[0]]),
+                               {name: chunk[name] for name in set(wanted) if name in chunk.files}))
+
+        names = list(columns) if columns is not None else sorted({name for _, chunk in chunks for name in chunk})
+        data = {name: self._concatenate(chunks, name) for name in set(names) | set(filters)}
+
+        mask = np.ones(sum(length for length, _ in chunks), dtype=bool)
+        for name, condition in filters.items():
+            mask &= condition(data[name]) if callable(condition) else data[name] == condition
+        return {name: data[name][mask] for name in names}
+
+    @staticmethod
+    def _concatenate(chunks, name):
+        dtype = next((chunk[name].dtype for _, chunk in chunks if name in chunk), float)
+        if not chunks:
+            return np.array([], dtype=dtype)
+        return np.concatenate([chunk[name] if name in chunk else _missing(dtype, length) for length, chunk in chunks])
+
+    def compact(self):
+        """
+        This function merges all chunks into a single one, which makes reading a large store faster
+        :return: None
+        """
+        old_chunks = self.chunks
+        if len(old_chunks) < 2:
+            return
+        data = self.read()
+        name = _chunk_name()
+        temp_path = os.path.join(self.directory, "." + name + ".npz")
+        np.savez(temp_path, **data)
+        os.replace(temp_path, os.path.join(self.directory, name + ".npz"))
+        for path in old_chunks:
+            os.remove(path)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from HelperFunction.sweep import make_executor, run_sweep
+
+# results of which the sensitivities are computed by default, one column per AVL case in the sweep records
+OUTPUTS = ['l_over_d', 'CL', 'M_root']
+
+
+def read_inputs(task):
+    """
+    This function returns the values that Aircraft input slots take for the given inputs, e.g. the defaults read from
+    input.txt. It is executed inside a sweep worker, which has full_aircraft imported from the project root.
+    :param task: (dictionary of Aircraft input slots, list of slot names)
+    :return: dictionary {slot name: value}
+    """
+    from full_aircraft import Aircraft
+    params, names = task
+    aircraft = Aircraft(label="Sensitivity baseline", **dict(params, analysis_only=True))
+    return {name: getattr(aircraft, name) for name in names}
+
+
+def perturbations(baseline, values, steps, scheme="central"):
+    """
+    :param baseline: dictionary of Aircraft input slots of the baseline design
+    :param values: baseline values of the design variables
+    :param steps: dictionary {design variable: finite difference step}
+    :param scheme: 'forward' or 'central'
+    :return: list of (design variable, step, design point); the baseline itself is not included
+    """
+    points = []
+    for name, step in steps.items():
+        for sign in ([1., -1.] if scheme == "central" else [1.]):
+            points.append((name, sign * step, dict(baseline, **{name: values[name] + sign * step})))
+    return points
+
+
+def _check(record):
+    if record["error"] is not None:
+        raise RuntimeError("Analysis failed for {:}: {:}".format(
+            {key: value for key, value in record.items() if key not in ("error", "diagnostics")}, record["error"]))
+    return record
+
+
+def gradients(baseline, variables, steps=None, relative_step=1e-2, scheme="central", outputs=OUTPUTS,
+              baseline_record=None, executor=None, max_workers=None):
+    """
+    This function computes finite difference derivatives of the analysis results with respect to Aircraft inputs.
+    All perturbed designs are analysed at the same time by the sweep workers; solves that are already in the AVL
+    cache are not repeated. Steps that take a variable out of the range accepted by its validator give wrong
+    derivatives, since the input is then replaced by its default; such replacements are listed in the diagnostics of
+    the sweep records.
+    :param baseline: dictionary of Aircraft input slots of the baseline design
+    :param variables: names of the Aircraft inputs, e.g. ['ct_cant', 'ct_height_ratio', 'wing_span', 'twist']
+    :param steps: dictionary {variable: step}; by default relative_step * max(|value|, 1)
+    :param relative_step: see steps
+    :param scheme: 'forward' (one analysis per variable, plus the baseline) or 'central' (two per variable)
+    :param outputs: result names, every AVL case of them is differentiated (e.g. l_over_d_fixed_cl)
+    :param baseline_record: sweep record of the baseline when it has been analysed before, e.g. in the previous
+    iteration of an optimizer
+    :param executor: running pool of sweep workers, which is reused (see sweep.make_executor)
+    :param max_workers: number of worker processes, when no executor is given
+    :return: (dictionary {result column: {variable: derivative}}, baseline record). The baseline is analysed together
+    with the perturbed designs when no baseline_record is given, also for the central scheme, which does not need it
+    for the derivatives.
+    """
+    if executor is None:
+        with make_executor(max_workers) as pool:
+            return gradients(baseline, variables, steps, relative_step, scheme, outputs, baseline_record, pool)
+    if scheme not in ("forward", "central"):
+        raise ValueError("Unknown finite difference scheme '{:}'".format(scheme))
+
+    values = {name: baseline[name] for name in variables if name in baseline}
+    missing = [name for name in variables if name not in values]
+    if missing:
+        values.update(executor.submit(read_inputs, (baseline, missing)).result())
+    if steps is None:
+        steps = {name: relative_step * max(abs(float(values[name])), 1.) for name in variables}
+
+    points = perturbations(baseline, values, steps, scheme)
+    design_points = [point for _, _, point in points]
+    if baseline_record is None:
+        design_points.append(dict(baseline))
+    records = [_check(record) for record in run_sweep(design_points, executor=executor)]
+    if baseline_record is None:
+        baseline_record = records.pop()
+
+    columns = [column for column in baseline_record
+               if any(column.startswith(output + "_") for output in outputs)]
+    derivatives = {column: {} for column in columns}
+    for column in columns:
+        for name in variables:
+            if scheme == "central":
+                (_, step_up, _), (_, step_down, _) = [point for point in points if point[0] == name]
+                up, down = [record for point, record in zip(points, records) if point[0] == name]
+                derivative = (up[column] - down[column]) / (step_up - step_down)
+            else:
+                (_, step, _), = [point for point in points if point[0] == name]
+                up, = [record for point, record in zip(points, records) if point[0] == name]
+                derivative = (up[column] - baseline_record[column]) / step
+            derivatives[column][name] = float(derivative)
+    return derivatives, baseline_record
+
+
+def jacobian(derivatives, columns, variables):
+    """
+    :return: array of shape (len(columns), len(variables)) with the derivatives, e.g. for an optimizer
+    """
+    return np.array([[derivatives[column][name] for name in variables] for column in columns])
+
+
+if __name__ == '__main__':
+    result, _ = gradients({'TYPE_winglet': 0, 'altitude': 9000},
+                          ['ct_cant', 'ct_height_ratio', 'wing_span', 'twist'])
+    for column, values in sorted(result.items()):
+        print(column, values)
@@ -0,0 +1,168 @@
+import collections
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SlotProfiler:
+    """Opt-in profiler of the Attributes, Parts and other functions of this project. Used as a context manager, it
+    records for every function how often it was evaluated, its total and self wall time and which other functions it
+    evaluated. ParaPy itself is not profiled, only the time spent in it is counted in the calling function.
+    profile_change also records how many slots an input change invalidated (the invalidation fan-out), and which
+    slots could not be checked."""
+
+    def __init__(self, root_dir=ROOT_DIR):
+        self.root_dir = os.path.normcase(root_dir)
+        self.counts = collections.Counter()
+        self.total_time = collections.Counter()
+        self.self_time = collections.Counter()
+        self.callees = collections.defaultdict(collections.Counter)
+        self.stacks = collections.Counter()  # self time per call stack, for flame graphs
+        self.slots = {}  # (id of the object, slot name): (object, slot name) of every evaluated slot
+        self.invalidated = collections.Counter()  # number of objects of which the slot was invalidated, by name
+        self.failures = {}  # (id of the object, slot name): (object, slot name, error), see profile_change
+        self._stack = []  # (frame, name, start time, time spent in callees)
+        self._files = {}
+
+    def __enter__(self):
+        self._previous = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *args):
+        sys.setprofile(self._previous)
+        self._stack = []
+
+    def _in_project(self, filename):
+        if filename not in self._files:
+            path = os.path.normcase(os.path.abspath(filename))
+            self._files[filename] = path.startswith(self.root_dir) and path != os.path.normcase(__file__) and \
+                os.sep + "site-packages" + os.sep not in path
+        return self._files[filename]
+
+    @staticmethod
+    def _name_of(instance, name):
+        # Attributes and Parts are methods, so the class of self gives e.g. "Wing.section_positions"
+        return "{:}.{:}".format(type(instance).__name__, name) if instance is not None else name
+
+    def _name(self, frame):
+        return self._name_of(frame.f_locals.get("self"), frame.f_code.co_name)
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            if self._in_project(frame.f_code.co_filename):
+                self._stack.append([frame, self._name(frame), time.perf_counter(), 0.])
+                instance = frame.f_locals.get("self")
+                if instance is not None:
+                    self.slots[(id(instance), frame.f_code.co_name)] = (instance, frame.f_code.co_name)
+        elif event == "return":
+            if self._stack and self._stack[-1][0] is frame:
+                _, name, start, in_callees = self._stack.pop()
+                elapsed = time.perf_counter() - start
+                self.counts[name] += 1
+                self.self_time[name] += elapsed - in_callees
+                self.stacks[";".join([entry[1] for entry in self._stack] + [name])] += elapsed - in_callees
+                if self._stack:
+                    self._stack[-1][3] += elapsed
+                    self.callees[self._stack[-1][1]][name] += 1
+                # recursive calls are only counted once in the total time
+                if all(entry[1] != name for entry in self._stack):
+                    self.total_time[name] += elapsed
+
+    @property
+    def fan_out(self):
+        """
+        :return: number of slots invalidated by the change of profile_change, over all objects
+        """
+        return sum(self.invalidated.values())
+
+    def rows(self, sort="total"):
+        """
+        :param sort: 'total', 'self', 'count' or 'invalidated'
+        :return: list of (name, count, total time, self time, invalidated), sorted from high to low
+        """
+        rows = [(name, self.counts[name], self.total_time[name], self.self_time[name], self.invalidated[name])
+                for name in set(self.counts) | set(self.invalidated)]
+        column = {'count': 1, 'total': 2, 'self': 3, 'invalidated': 4}[sort]
+        return sorted(rows, key=lambda row: row[column], reverse=True)
+
+    def table(self, sort="total", limit=30):
+        lines = ["{:<50} {:>8} {:>12} {:>12} {:>11}".format("slot", "count", "total (s)", "self (s)", "invalidated")]
+        for name, count, total, own, invalidated in self.rows(sort)[:limit]:
+            lines.append("{:<50} {:>8d} {:>12.5f} {:>12.5f} {:>11d}".format(name, count, total, own, invalidated))
+        if self.failures:
+            lines.append("{:d} slots could not be checked for invalidation:".format(len(self.failures)))
+            lines += ["  {:<48} {!r}".format(self._name_of(instance, slot), error)
+                      for instance, slot, error in self.failures.values()]
+        return "\n".join(lines)
+
+    def write_collapsed(self, path):
+        """
+        This function writes the profile in the collapsed stack format ("a;b;c weight" per line, weights in
+        microseconds), which can be read by flamegraph.pl and speedscope
+        :param path: path of the output file
+        :return: path
+        """
+        with open(path, "w") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                if seconds > 0:
+                    f.write("{:} {:d}\n".format(stack, int(round(seconds * 1e6))))
+        return path
+
+    def write_table(self, path, sort="total"):
+        """
+        :return: path of a CSV file with one row per function, which can be sorted in any spreadsheet
+        """
+        with open(path, "w") as f:
+            f.write("slot,count,total_s,self_s,invalidated\n")
+            for row in self.rows(sort):
+                f.write("{:},{:d},{:.6f},{:.6f},{:d}\n".format(*row))
+        return path
+
+
+def profile_change(obj, evaluate, **changes):
+    """
+    This function changes input slots of a ParaPy object and profiles the re-evaluation that follows. Everything is
+    evaluated once before the change, so the profile only holds what the change invalidated. To count the invalidated
+    slots, every slot that was evaluated before the change is requested again afterwards: only the invalidated ones
+    run again. This check is not part of the timings. Slots that fail when requested again, e.g. those of an object
+    that the change removed from the tree such as the previous winglet, are not counted; they are listed with their
+    error in failures and in the table.
+    :param obj: e.g. an Aircraft
+    :param evaluate: function of obj that evaluates the slots of interest, e.g. lambda a: a.avl_analysis.record
+    :param changes: input slots and their new values, e.g. wing_span=33
+    :return: SlotProfiler, with the invalidated slots in invalidated and their number in fan_out
+    """
+    with SlotProfiler() as before:
+        evaluate(obj)
+    for slot, value in changes.items():
+        setattr(obj, slot, value)
+    with SlotProfiler() as profiler:
+        evaluate(obj)
+    with SlotProfiler() as check:
+        for key, (instance, slot) in before.slots.items():
+            if key not in profiler.slots:
+                try:
+                    getattr(instance, slot)
+                except Exception as error:
+                    profiler.failures[key] = (instance, slot, error)
+    for key, (instance, slot) in before.slots.items():
+        if key in profiler.slots or (key in check.slots and key not in profiler.failures):
+            profiler.invalidated[SlotProfiler._name_of(instance, slot)] += 1
+    return profiler
+
+
+if __name__ == '__main__':
+    os.chdir(ROOT_DIR)
+    from full_aircraft import Aircraft
+    from HelperFunction.help_fucntions import set_headless
+
+    set_headless(True)
+    aircraft = Aircraft(label="Profiled aircraft", analysis_only=True)
+    result = profile_change(aircraft, lambda a: a.avl_configuration, wing_span=33.)
+    print("{:d} slots invalidated and {:d} re-evaluated after changing wing_span".format(result.fan_out,
+                                                                                        len(result.counts)))
+    print(result.table())
+    print("flame graph data written to", result.write_collapsed(os.path.join(ROOT_DIR, "profile.folded")))
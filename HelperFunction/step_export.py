@@ -0,0 +1,170 @@
+import json
+import os
+
+from HelperFunction.hashing import digest, plain
+from HelperFunction.sweep import make_executor
+
+# components of the Aircraft that are exported, each to its own STEP file
+COMPONENTS = ['fuselage', 'right_wing', 'left_wing', 'right_winglet', 'left_winglet', 'htp_right_wing',
+              'htp_left_wing', 'vtp_wing']
+# mirrored components and the components they are mirrored from
+MIRRORS = {'left_wing': 'right_wing', 'left_winglet': 'right_winglet', 'htp_left_wing': 'htp_right_wing'}
+WINGLETS = ['right_winglet', 'left_winglet']
+# the fuselage has no sections, its shape follows from its cross-sections
+FUSELAGE_DATA = ['profile']
+MANIFEST = "manifest.json"
+
+
+def _position(position):
+    return [plain(position.point), plain(position.Vx), plain(position.Vz)]
+
+
+def geometry_key(aircraft, name):
+    """
+    This function computes a hash of everything the shape of a component depends on, without building its solid
+    :param aircraft: Aircraft, which may be built with analysis_only=True
+    :param name: name of the component, one of COMPONENTS
+    :return: hexadecimal sha256 digest
+    """
+    component = getattr(aircraft, MIRRORS.get(name, name))
+    data = {'component': name,
+            'type': type(component).__name__,
+            'position': _position(component.position)}
+    if hasattr(component, 'sections'):
+        data['sections'] = [{'airfoil': section.airfoil_name,
+                             'chord': plain(section.chord),
+                             'position': _position(section.position)} for section in component.sections]
+    else:
+        data.update({attribute: plain(getattr(component, attribute)) for attribute in FUSELAGE_DATA})
+    return digest(data)
+
+
+_last_aircraft = [None, None]  # inputs and Aircraft of the last task of this process
+
+
+def _aircraft(params, analysis_only):
+    # the tasks of one variant are handed to the same worker one after the other, so the Aircraft is only built once
+    # per variant
+    from full_aircraft import Aircraft
+    key = json.dumps([params, analysis_only], sort_keys=True)
+    if _last_aircraft[0] != key:
+        _last_aircraft[:] = [key, Aircraft(label="Exported aircraft", analysis_only=analysis_only, **params)]
+    return _last_aircraft[1]
+
+
+def component_keys(task):
+    """
+    This function computes the geometry keys of the components of one aircraft variant, from an Aircraft built with
+    analysis_only=True, so without any solid. It is executed inside the worker processes, but can be called directly
+    as well.
+    :param task: (aircraft inputs, list of component names)
+    :return: list of geometry keys, one per component
+    """
+    params, names = task
+    aircraft = _aircraft(params, analysis_only=True)
+    return [geometry_key(aircraft, name) for name in names]
+
+
+def export_component(task):
+    """
+    This function writes one component of one aircraft variant to a STEP file. It is executed inside the worker
+    processes, but can be called directly as well.
+    :param task: (aircraft inputs, component name, path of the STEP file)
+    :return: path
+    """
+    from parapy.exchange.step import STEPWriter
+
+    params, name, path = task
+    aircraft = _aircraft(params, analysis_only=False)
+    STEPWriter(trees=[getattr(aircraft, name)], default_directory=os.path.dirname(path)).write(path)
+    return path
+
+
+def _read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def assemble(paths, path):
+    """
+    This function merges component STEP files into one STEP file
+    :param paths: paths of the component files
+    :param path: path of the assembled file
+    :return: path
+    """
+    from parapy.exchange.step import STEPReader, STEPWriter
+    STEPWriter(trees=[STEPReader(filename=component_path) for component_path in paths],
+               default_directory=os.path.dirname(path)).write(path)
+    return path
+
+
+def export_variants(variants, directory, components=COMPONENTS, max_workers=None, executor=None, assembled=False):
+    """
+    This function exports the components of many aircraft variants in parallel. A manifest in the output directory
+    keeps the geometry key of every file, so components that did not change since the last export are skipped.
+    :param variants: dictionary {label: dictionary of Aircraft input slots}; the files are named label_component.stp
+    :param directory: output directory
+    :param components: names of the components to export
+    :param max_workers: number of worker processes, when no executor is given
+    :param executor: existing pool of sweep workers, see sweep.make_executor
+    :param assembled: also write one label.stp file per variant with all its components
+    :return: dictionary {label: list of (path, written)}
+    """
+    directory = os.path.abspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    if executor is None:
+        with make_executor(max_workers) as pool:
+            return export_variants(variants, directory, components, executor=pool, assembled=assembled)
+
+    manifest = _read_manifest(directory)
+    names = {label: [name for name in components if name not in WINGLETS or params.get('winglet_ON', True)]
+             for label, params in variants.items()}
+    # the keys of all components follow from Aircraft without solids; only the changed components are built and
+    # written, the Aircraft with solids of a variant of which nothing changed is never built
+    keys = dict(zip(variants, executor.map(component_keys, [(dict(params), names[label])
+                                                            for label, params in variants.items()])))
+    tasks, changed, written = [], [], {}
+    for label, params in variants.items():
+        for name, key in zip(names[label], keys[label]):
+            filename = "{:}_{:}.stp".format(label, name)
+            written[filename] = False
+            if manifest.get(filename) != key or not os.path.exists(os.path.join(directory, filename)):
+                tasks.append((dict(params), name, os.path.join(directory, filename)))
+                changed.append((filename, key))
+
+    try:
+        for (filename, key), _ in zip(changed, executor.map(export_component, tasks,
+                                                            chunksize=max(len(components), 1))):
+            manifest[filename] = key
+            written[filename] = True
+    finally:
+        # the keys of the files that were written before a failure are kept as well
+        _write_manifest(directory, manifest)
+
+    exported = {label: [(os.path.join(directory, "{:}_{:}.stp".format(label, name)),
+                         written["{:}_{:}.stp".format(label, name)]) for name in names[label]] for label in variants}
+    if assembled:
+        for label, files in exported.items():
+            if any(written for _, written in files) or not os.path.exists(os.path.join(directory, label + ".stp")):
+                assemble([path for path, _ in files], os.path.join(directory, label + ".stp"))
+    return exported
+
+
+if __name__ == '__main__':
+    from HelperFunction.sweep import ROOT_DIR
+
+    result = export_variants({'A320_winglet{:}'.format(TYPE_winglet): {'TYPE_winglet': TYPE_winglet}
+                              for TYPE_winglet in [0, 1, 2, 3]},
+                             os.path.join(ROOT_DIR, "Output", "step"), assembled=True)
+    for label, files in result.items():
+        print(label, "{:d} of {:d} files written".format(sum(written for _, written in files), len(files)))
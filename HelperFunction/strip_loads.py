@@ -0,0 +1,164 @@
+import numpy as np
+
+from HelperFunction.avl_results import AvlResults
+
+# AVL strip force quantities needed for the load distributions
+STRIP_QUANTITIES = ("c cl", "Yle", "Zle", "Chord", "Area", "cm_c/4")
+
+
+def _suffix_sum(values):
+    # sum over all strips outboard of (and including) each strip, for every case at once
+    return np.cumsum(values[..., ::-1], axis=-1)[..., ::-1]
+
+
+def section_leading_edges(configuration):
+    """
+    :param configuration: avl.Configuration of which the surfaces belong to components with sections
+    :return: {surface name: array of shape (number of sections, 2) with y and z of the leading edge of every section,
+    from root to tip}
+    """
+    return {surface.name: np.array([[section.position.point.y, section.position.point.z]
+                                    for section in surface.parent.sections])
+            for surface in configuration.surfaces}
+
+
+def strip_dihedral(y, z, leading_edges):
+    """
+    This function takes the local dihedral angle of every strip from the sections of its surface, which is the cant
+    of a winglet, the dihedral of the wing or the local angle of a blended surface
+    :param y: y of the leading edge of every strip
+    :param z: z of the leading edge of every strip
+    :param leading_edges: y and z of the section leading edges of the surface, see section_leading_edges
+    :return: angle of the segment between the two sections of every strip [rad]
+    """
+    start, segment = leading_edges[:-1], np.diff(leading_edges, axis=0)
+    strips = np.stack([y, z], axis=-1)[:, None, :] - start
+    # the segment closest to the leading edge of the strip
+    t = np.clip(np.sum(strips * segment, axis=-1) / np.sum(segment ** 2, axis=-1), 0., 1.)
+    distance = np.linalg.norm(strips - t[..., None] * segment, axis=-1)
+    segment = segment[np.argmin(distance, axis=-1)]
+    return np.arctan2(segment[:, 1], segment[:, 0])
+
+
+def _right_side(yle, duplicated):
+    # the strips of the right half of a surface mirrored with y_duplicate, as a slice when they are consecutive
+    if not duplicated:
+        return slice(None)
+    index = np.flatnonzero(np.asarray(yle) >= 0.)
+    if len(index) and index[-1] - index[0] + 1 == len(index):
+        return slice(index[0], index[-1] + 1)
+    return index
+
+
+def stack_strip_forces(results, surface_names, leading_edges, duplicated=True):
+    """
+    This function stacks the strip forces of several surfaces, for all AVL cases, into 2-D arrays
+    :param results: AVL results, {case name: result}
+    :param surface_names: names of the surfaces from root to tip, e.g. ['wing', 'Canted Winglet']. Surfaces that are
+    not in the results are skipped.
+    :param leading_edges: section leading edges of the surfaces, see section_leading_edges
+    :param duplicated: the surfaces are mirrored with y_duplicate, in which case only the strips of the right half
+    (Yle >= 0) are used
+    :return: list of case names, {quantity: array of shape (number of cases, number of strips)} and the local dihedral
+    angle of every strip [rad]
+    """
+    if isinstance(results, AvlResults):
+        return _stack_arrays(results, surface_names, leading_edges, duplicated)
+    case_names = list(results.keys())
+    first = results[case_names[0]]["StripForces"]
+    names = [name for name in surface_names if name in first]
+
+    columns = {quantity: [] for quantity in STRIP_QUANTITIES}
+    dihedral = []
+    for name in names:
+        right = _right_side(first[name]["Yle"], duplicated)
+        y = np.asarray(first[name]["Yle"], dtype=float)[right]
+        for quantity in STRIP_QUANTITIES:
+            block = np.zeros((len(case_names), len(y)))
+            for i, case_name in enumerate(case_names):
+                strips = results[case_name]["StripForces"][name]
+                if quantity in strips:
+                    block[i, :] = np.asarray(strips[quantity], dtype=float)[right]
+            columns[quantity].append(block)
+        dihedral.append(strip_dihedral(y, np.asarray(first[name]["Zle"], dtype=float)[right], leading_edges[name]))
+
+    stacked = {quantity: np.concatenate(blocks, axis=1) for quantity, blocks in columns.items()}
+    return case_names, stacked, np.concatenate(dihedral)
+
+
+def _stack_arrays(results, surface_names, leading_edges, duplicated):
+    # same as stack_strip_forces, with the strips taken as views of the AvlResults arrays when they are consecutive
+    names = [name for name in surface_names if name in results.bounds]
+    columns = {quantity: [] for quantity in STRIP_QUANTITIES}
+    dihedral = []
+    for name in names:
+        right = _right_side(results.strip(name, "Yle")[0], duplicated)
+        y = results.strip(name, "Yle")[0, right]
+        for quantity in STRIP_QUANTITIES:
+            if results.has_column(name, quantity):
+                columns[quantity].append(results.strip(name, quantity)[:, right])
+            else:
+                columns[quantity].append(np.zeros((len(results), len(y))))
+        dihedral.append(strip_dihedral(y, results.strip(name, "Zle")[0, right], leading_edges[name]))
+
+    stacked = {quantity: np.concatenate(blocks, axis=1) for quantity, blocks in columns.items()}
+    return results.case_names, stacked, np.concatenate(dihedral)
+
+
+class StripLoads:
+    """Shear force, bending moment and torsion distributions along a half wing, for all AVL cases at once.
+    All distributions are arrays of shape (number of cases, number of strips), evaluated at the inboard edge of
+    every strip, so the first column holds the values at the wing root."""
+
+    def __init__(self, case_names, stacked, dihedral, q=1.):
+        self.case_names = case_names
+        self.q = q
+        self.y = stacked["Yle"]
+        self.z = stacked["Zle"]
+        self.chord = stacked["Chord"]
+        self.dihedral = dihedral
+        # strip width measured along the surface, exact for any spanwise spacing
+        self.width = np.divide(stacked["Area"], self.chord, out=np.zeros_like(self.chord), where=self.chord != 0)
+        # force normal to the surface and pitching moment about the quarter chord, per strip
+        self.force = q * stacked["c cl"] * self.width
+        self.moment = q * stacked["cm_c/4"] * self.chord ** 2 * self.width
+
+        cos, sin = np.cos(dihedral), np.sin(dihedral)
+        y_edge = self.y - 0.5 * self.width * cos
+        z_edge = self.z - 0.5 * self.width * sin
+
+        force_cos = _suffix_sum(self.force * cos)
+        force_sin = _suffix_sum(self.force * sin)
+        # shear force normal to the local surface
+        self.shear = cos * force_cos + sin * force_sin
+        # moment about the local x-axis through the inboard edge of each strip
+        self.bending = (_suffix_sum(self.force * (self.y * cos + self.z * sin))
+                        - y_edge * force_cos - z_edge * force_sin)
+        # pitching moments projected on the local spanwise direction
+        self.torsion = cos * _suffix_sum(self.moment * cos) + sin * _suffix_sum(self.moment * sin)
+
+    @property
+    def root_bending(self):
+        return self.bending[:, 0]
+
+    @property
+    def root_shear(self):
+        return self.shear[:, 0]
+
+    @property
+    def root_torsion(self):
+        return self.torsion[:, 0]
+
+
+def strip_loads(results, surface_names, leading_edges, q=1., duplicated=True):
+    """
+    This function computes the load distributions of the given surfaces for all AVL cases
+    :param results: AVL results, {case name: result}
+    :param surface_names: names of the surfaces from root to tip
+    :param leading_edges: section leading edges of the surfaces, see section_leading_edges
+    :param q: dynamic pressure [Pa]
+    :param duplicated: the surfaces are mirrored with y_duplicate
+    :return: StripLoads
+    """
+    case_names, stacked, dihedral = stack_strip_forces(results, surface_names, leading_edges, duplicated)
+    return StripLoads(case_names, stacked, dihedral, q)
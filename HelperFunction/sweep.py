@@ -0,0 +1,178 @@
+import collections
+import itertools
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sweep_grid(**axes):
+    """
+    This function builds the full factorial grid of a design of experiments
+    :param axes: one keyword per Aircraft input, e.g. altitude=[1000, 5000, 9000], TYPE_winglet=[0, 1, 2]
+    :return: list of dictionaries, one per grid point, which can be passed to run_sweep
+    """
+    names = list(axes.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*[axes[name] for name in names])]
+
+
+def _init_worker(root_dir, work_dir):
+    # full_aircraft reads input.txt and the airfoil library relative to the current working directory when it is
+    # imported, so it has to be imported from the project root before moving into the worker's own directory
+    os.chdir(root_dir)
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+    import full_aircraft  # noqa: F401
+    from HelperFunction.help_fucntions import set_headless
+
+    # nobody is watching the workers, so out of range inputs are only collected instead of shown in a dialog box
+    set_headless(True)
+
+    # every worker gets its own AVL working directory, so that input and output files never clash
+    worker_dir = os.path.join(work_dir, "worker_{:}".format(os.getpid()))
+    os.makedirs(worker_dir, exist_ok=True)
+    os.chdir(worker_dir)
+
+
+def _evaluate(params, altitudes=None):
+    from full_aircraft import Aircraft
+    from HelperFunction.help_fucntions import collect_diagnostics
+    from HelperFunction.panel_policy import resolve_policy, policy_label
+
+    if altitudes is None:
+        records = [dict(params)]
+    else:
+        records = [dict(params, altitude=altitude) for altitude in altitudes]
+    if "panel_policy" in params:
+        # the store only holds numbers and strings, so the records keep the name of the policy
+        for record in records:
+            record["panel_policy"] = policy_label(params["panel_policy"])
+    with collect_diagnostics() as diagnostics:
+        try:
+            # the sweep only needs the AVL analysis, so no solids are built unless a design point asks for them
+            inputs = dict({"analysis_only": True}, **records[0])
+            if "panel_policy" in inputs:
+                inputs["panel_policy"] = resolve_policy(params["panel_policy"])
+            analysis = Aircraft(label="Sweep aircraft", **inputs).avl_analysis
+            results = [analysis.record] if altitudes is None else analysis.altitude_records(altitudes)
+            for record, result in zip(records, results):
+                record.update(result)
+                record["error"] = None
+        except Exception as error:
+            # one failing design point should not bring down the whole sweep
+            for record in records:
+                record["error"] = repr(error)
+    # inputs that were out of range and have been replaced while building this design point
+    for record in records:
+        record["diagnostics"] = list(diagnostics)
+    return records
+
+
+def evaluate_point(params):
+    """
+    This function builds one Aircraft from the given inputs and runs its AVL analysis. It is executed inside the
+    worker processes, but can be called directly as well.
+    :param params: dictionary of Aircraft input slots
+    :return: flat dictionary with the inputs and the analysis results of this design point
+    """
+    return _evaluate(params)[0]
+
+
+def evaluate_altitudes(task):
+    """
+    This function evaluates one design point at several altitudes with a single AVL solve, since the AVL results in
+    coefficient form do not depend on the altitude
+    :param task: (dictionary of Aircraft input slots without the altitude, list of altitudes)
+    :return: list of flat dictionaries, one per altitude
+    """
+    params, altitudes = task
+    return _evaluate(params, altitudes)
+
+
+def group_altitudes(points):
+    """
+    This function groups the design points that only differ in altitude
+    :param points: list of dictionaries of Aircraft inputs
+    :return: list of (inputs without the altitude, list of altitudes, list of the indices of the points)
+    """
+    groups = collections.OrderedDict()
+    for index, point in enumerate(points):
+        params = {name: value for name, value in point.items() if name != "altitude"}
+        key = repr(sorted(params.items())) if "altitude" in point else index
+        group = groups.setdefault(key, (params, [] if "altitude" in point else None, []))
+        if group[1] is not None:
+            group[1].append(point["altitude"])
+        group[2].append(index)
+    return list(groups.values())
+
+
+def make_executor(max_workers=None, work_dir=None):
+    """
+    This function creates a pool of worker processes that are ready to evaluate Aircraft design points
+    :param max_workers: number of worker processes, defaults to the number of cores
+    :param work_dir: directory in which the workers create their AVL working directories
+    :return: ProcessPoolExecutor
+    """
+    if work_dir is None:
+        work_dir = tempfile.mkdtemp(prefix="avl_sweep_")
+    os.makedirs(work_dir, exist_ok=True)
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               initializer=_init_worker,
+                               initargs=(ROOT_DIR, os.path.abspath(work_dir)))
+
+
+def _store_records(records, store):
+    # the diagnostics are kept with the returned records only, the store holds numbers and strings
+    store.append([{key: value for key, value in record.items() if key != "diagnostics"} for record in records])
+
+
+def run_sweep(points, max_workers=None, work_dir=None, executor=None, chunksize=1, store=None, store_batch=100,
+              batch_altitudes=True):
+    """
+    This function spreads the evaluation of a list of design points over a pool of worker processes
+    :param points: list of dictionaries of Aircraft inputs, e.g. the output of sweep_grid
+    :param max_workers: number of worker processes, defaults to the number of cores
+    :param work_dir: directory in which the workers create their AVL working directories
+    :param executor: an already running executor (see make_executor), which is then reused and not shut down
+    :param chunksize: number of tasks sent to a worker at once
+    :param store: ResultsStore to which the results are appended while the sweep runs
+    :param store_batch: number of results written to the store at once
+    :param batch_altitudes: design points that only differ in altitude are evaluated with a single AVL solve
+    :return: list of result dictionaries, in the same order as the points
+    """
+    if executor is None:
+        with make_executor(max_workers, work_dir) as pool:
+            return run_sweep(points, executor=pool, chunksize=chunksize, store=store, store_batch=store_batch,
+                             batch_altitudes=batch_altitudes)
+
+    if batch_altitudes:
+        groups = group_altitudes(points)
+        tasks = [(params, altitudes) for params, altitudes, _ in groups]
+    else:
+        groups = [(point, None, [index]) for index, point in enumerate(points)]
+        tasks = [(point, None) for point in points]
+
+    records = [None] * len(points)
+    pending = []
+    for (_, _, indices), group_records in zip(groups, executor.map(evaluate_altitudes, tasks, chunksize=chunksize)):
+        for index, record in zip(indices, group_records):
+            records[index] = record
+        pending += group_records
+        if store is not None and len(pending) >= store_batch:
+            _store_records(pending, store)
+            pending = []
+    if store is not None and pending:
+        _store_records(pending, store)
+    return records
+
+
+if __name__ == '__main__':
+    from HelperFunction.results_store import ResultsStore
+
+    grid = sweep_grid(TYPE_winglet=[0, 1, 2],
+                      altitude=[1000, 5000, 9000],
+                      M_cruise=[0.72, 0.756, 0.78])
+    for result in run_sweep(grid, store=ResultsStore()):
+        print(result)
@@ -0,0 +1,79 @@
+import numpy as np
+
+from HelperFunction.avl_session import STRIP_COLUMNS
+
+# Stand-in for AVL, so that the benchmarks run on machines without the AVL executable. The strips are laid out on the
+# real sections of the configuration and loaded elliptically, which gives results with the same structure and size
+# as those of avl.Interface, although the numbers are only indicative.
+
+
+def _strips(component, n_spanwise):
+    sections = component.sections
+    le = np.array([[s.position.point.x, s.position.point.y, s.position.point.z] for s in sections])
+    chords = np.array([s.chord for s in sections])
+    # spanwise coordinate along the sections, the strips are spread equally over the whole surface
+    distance = np.concatenate([[0.], np.cumsum(np.linalg.norm(np.diff(le[:, 1:], axis=0), axis=1))])
+    edges = np.linspace(0., distance[-1], n_spanwise + 1)
+    centres = 0.5 * (edges[1:] + edges[:-1])
+    strip = {'Xle': np.interp(centres, distance, le[:, 0]),
+             'Yle': np.interp(centres, distance, le[:, 1]),
+             'Zle': np.interp(centres, distance, le[:, 2]),
+             'Chord': np.interp(centres, distance, chords)}
+    strip['Area'] = strip['Chord'] * np.diff(edges)
+    return strip
+
+
+def standin_results(configuration, case_settings):
+    """
+    :param configuration: avl.Configuration of which the surfaces belong to components with sections
+    :param case_settings: list of (case name, settings) tuples as passed to the Analysis
+    :return: {case name: {'Totals': {...}, 'StripForces': {...}}}, as avl.Interface.results
+    """
+    aspect_ratio = configuration.reference_span ** 2 / configuration.reference_area
+    lift_slope = 2 * np.pi * aspect_ratio / (aspect_ratio + 2)
+    # surfaces without spanwise panels of their own, such as the Sharklet, have them per section
+    surfaces = {surface.name: _strips(surface.parent, surface.n_spanwise or
+                                      sum(section.n_spanwise for section in surface.parent.sections[:-1]))
+                for surface in configuration.surfaces}
+    half_span = 0.5 * configuration.reference_span
+
+    results = {}
+    for name, settings in case_settings:
+        alpha = settings.get('alpha', 0.)
+        if hasattr(alpha, 'setting'):
+            cl = float(alpha.value)
+            alpha = np.degrees(cl / lift_slope)
+        else:
+            cl = lift_slope * np.radians(float(alpha))
+        cd = 0.008 + cl ** 2 / (np.pi * aspect_ratio * 0.9)
+        strip_forces = {}
+        for surface_name, strip in surfaces.items():
+            eta = np.clip(np.abs(strip['Yle']) / half_span, 0., 1.)
+            c_cl = cl * configuration.reference_chord * 4 / np.pi * np.sqrt(1 - eta ** 2)
+            mirrored = dict(strip, Yle=-strip['Yle'])
+            forces = {quantity: np.concatenate([strip[quantity], mirrored[quantity]]).tolist()
+                      for quantity in strip}
+            forces['c cl'] = np.concatenate([c_cl, c_cl]).tolist()
+            forces['cm_c/4'] = np.full(2 * len(c_cl), -0.08).tolist()
+            strip_forces[surface_name] = forces
+        results[name] = {'Totals': {'Alpha': float(alpha), 'CLtot': float(cl), 'CDtot': float(cd)},
+                         'StripForces': strip_forces}
+    return results
+
+
+def standin_output_files(results):
+    """
+    This function writes stand-in results in the format of the AVL FT and FS output files
+    :param results: result of one case, see standin_results
+    :return: (text of the FT file, text of the FS file)
+    """
+    totals = "\n".join("  {:} = {:12.6f}".format(name, value) for name, value in results['Totals'].items())
+    lines = []
+    for i, (name, forces) in enumerate(results['StripForces'].items()):
+        lines += ["  Surface # {:}     {:}".format(i + 1, name),
+                  " Strip Forces referred to Strip Area, Chord",
+                  "  " + "  ".join(STRIP_COLUMNS)]
+        n_strips = len(forces['c cl'])
+        for j, values in enumerate(zip(*[forces.get(column, [0.] * n_strips) for column in STRIP_COLUMNS[1:]])):
+            lines.append("  {:4d}".format(j + 1) + "".join(" {:10.4f}".format(value) for value in values))
+    return totals, "\n".join(lines)
@@ -0,0 +1,213 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+_spans = itertools.cycle([32.5, 33., 33.5, 34.])
+
+
+def _case_settings():
+    from kbeutils import avl
+    return [('fixed_aoa', {'alpha': 3}),
+            ('fixed_cl', {'alpha': avl.Parameter(name='alpha', value=0.5, setting='CL')})]
+
+
+def _build(node):
+    # touching every child part and its shape forces ParaPy to build the whole tree
+    getattr(node, "TopoDS_Shape", None)
+    for child in node.children:
+        _build(child)
+
+
+def _analysis_aircraft(**kwargs):
+    from full_aircraft import Aircraft
+    aircraft = Aircraft(label="Benchmark aircraft", analysis_only=True, **kwargs)
+    aircraft.avl_configuration
+    return aircraft
+
+
+def _changed_geometry():
+    from HelperFunction.avl_session import geometry_text
+    # a different wing span for every run, so that the session really has to reload the geometry and solve
+    return geometry_text(_analysis_aircraft(wing_span=next(_spans)).avl_configuration)
+
+
+def _strip_loads_arguments(container):
+    from HelperFunction.analysis import WINGLET_NAMES
+    from HelperFunction.strip_loads import section_leading_edges
+    from benchmarks.avl_standin import standin_results
+    configuration = _analysis_aircraft(TYPE_winglet=1).avl_configuration
+    return (container(standin_results(configuration, _case_settings())), ['wing'] + WINGLET_NAMES,
+            section_leading_edges(configuration))
+
+
+def _altitudes():
+    import numpy as np
+    return np.random.uniform(0., 20000., 1000000)
+
+
+def _write_step(aircraft):
+    # removing the written file with its directory takes little time compared with writing it
+    with tempfile.TemporaryDirectory(prefix="benchmark_step_") as directory:
+        aircraft.step_writer_components.write(os.path.join(directory, "aircraft.stp"))
+
+
+def benchmarks(quick=False):
+    """
+    :param quick: only the cheap benchmarks, without the full geometry and STEP export
+    :return: list of (name, statement, setup) tuples. The setup returns the argument of the statement, and is not
+    part of the timing.
+    """
+    from full_aircraft import Aircraft
+    from HelperFunction.avl_session import geometry_text, parse_totals, parse_strip_forces, get_session
+    from HelperFunction.strip_loads import strip_loads
+    from HelperFunction.avl_results import AvlResults
+    from HelperFunction.atmosphere import atmosphere_table, dynamic_pressure
+    from benchmarks.avl_standin import standin_results, standin_output_files
+
+    case_settings = _case_settings()
+    cases = []
+    for TYPE_winglet in [0, 1, 2, 3]:
+        if not quick:
+            cases.append(("aircraft_build[TYPE_winglet={:}]".format(TYPE_winglet),
+                          _build, lambda t=TYPE_winglet: Aircraft(label="Benchmark aircraft", TYPE_winglet=t)))
+        cases.append(("aircraft_build_analysis_only[TYPE_winglet={:}]".format(TYPE_winglet),
+                      lambda aircraft: aircraft.avl_configuration,
+                      lambda t=TYPE_winglet: Aircraft(label="Benchmark aircraft", TYPE_winglet=t,
+                                                      analysis_only=True)))
+
+    # the input file of the persistent AVL session (use_session); avl.Interface writes its own file as part of the
+    # solve, which is not timed on its own
+    cases.append(("avl_session_input", lambda aircraft: geometry_text(aircraft.avl_configuration),
+                  _analysis_aircraft))
+    cases.append(("avl_solve_standin",
+                  lambda aircraft: standin_results(aircraft.avl_configuration, case_settings),
+                  _analysis_aircraft))
+    cases.append(("avl_output_parsing",
+                  lambda files: [(parse_totals(totals), parse_strip_forces(strips)) for totals, strips in files],
+                  lambda: [standin_output_files(result) for result in
+                           standin_results(_analysis_aircraft().avl_configuration, case_settings).values()]))
+    if shutil.which("avl"):
+        cases.append(("avl_solve_session",
+                      lambda text: get_session().run(text, case_settings),
+                      _changed_geometry))
+    cases.append(("strip_loads",
+                  lambda arguments: strip_loads(*arguments, q=10000.).root_bending,
+                  lambda: _strip_loads_arguments(dict)))
+    cases.append(("strip_loads_arrays",
+                  lambda arguments: strip_loads(*arguments, q=10000.).root_bending,
+                  lambda: _strip_loads_arguments(AvlResults.from_dict)))
+    # a million altitudes, as when post-processing a large sweep
+    cases.append(("dynamic_pressure_isa", lambda altitudes: dynamic_pressure(altitudes, 0.78), _altitudes))
+    cases.append(("dynamic_pressure_table", lambda altitudes: atmosphere_table().dynamic_pressure(altitudes, 0.78),
+                  _altitudes))
+    if not quick:
+        cases.append(("step_export", _write_step, lambda: Aircraft(label="Benchmark aircraft")))
+    return cases
+
+
+def run(cases, repeat=5, pattern=None):
+    """
+    :param cases: list of (name, statement, setup) tuples, see benchmarks
+    :param repeat: number of timed runs of every benchmark, each with a fresh setup
+    :param pattern: only run the benchmarks of which the name contains this text
+    :return: {name: {'min': ..., 'median': ..., 'times': [...]}} in seconds
+    """
+    timings = {}
+    for name, statement, setup in cases:
+        if pattern and pattern not in name:
+            continue
+        times = []
+        for _ in range(repeat):
+            argument = setup()
+            times.append(timeit.timeit(lambda: statement(argument), number=1))
+        times.sort()
+        timings[name] = {'min': times[0], 'median': times[len(times) // 2], 'times': times}
+        print("{:<50} min {:10.5f} s   median {:10.5f} s".format(name, times[0], times[len(times) // 2]))
+    return timings
+
+
+def _commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(timings, directory=RESULTS_DIR):
+    """
+    :return: path of the written JSON file, named after the time of the run
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(path, "w") as f:
+        json.dump({'commit': _commit(),
+                   'python': platform.python_version(),
+                   'machine': platform.platform(),
+                   'processor': platform.processor(),
+                   'timings': timings}, f, indent=1)
+    return path
+
+
+def compare(timings, reference_path, tolerance=0.1):
+    """
+    This function prints the change of every benchmark with respect to an earlier run, based on the minimum times
+    :param tolerance: relative change that is reported as faster or slower
+    :return: list of the names of the benchmarks that became slower
+    """
+    with open(reference_path) as f:
+        reference = json.load(f)['timings']
+    slower = []
+    for name, timing in timings.items():
+        if name not in reference:
+            continue
+        ratio = timing['min'] / reference[name]['min']
+        verdict = "slower" if ratio > 1 + tolerance else "faster" if ratio < 1 - tolerance else ""
+        if verdict == "slower":
+            slower.append(name)
+        print("{:<50} {:6.2f}x {:}".format(name, ratio, verdict))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the aircraft build, AVL export, solve and post-processing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="skip the full geometry build and STEP export")
+    parser.add_argument("-k", dest="pattern", help="only run the benchmarks of which the name contains this text")
+    parser.add_argument("--compare", nargs="?", const="latest",
+                        help="JSON file of an earlier run to compare with, by default the latest one")
+    args = parser.parse_args()
+
+    # full_aircraft reads input.txt and the airfoils relative to the working directory
+    os.chdir(ROOT_DIR)
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    from HelperFunction.help_fucntions import set_headless
+    set_headless(True)
+
+    previous = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    timings = run(benchmarks(args.quick), args.repeat, args.pattern)
+    print("results written to", save(timings))
+    if args.compare:
+        if args.compare == "latest" and not previous:
+            print("no earlier run in {:}, nothing compared".format(RESULTS_DIR))
+            return 0
+        reference = previous[-1] if args.compare == "latest" else args.compare
+        return 1 if compare(timings, reference) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
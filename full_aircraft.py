@@ -1,6 +1,5 @@
 # To Do List (Delete one after finishing it)
 # TODO: Make the HT and VT more object-oriented
-# TODO: Evaluate the effect of the winglet in terms of fuel required for a certain mission
 # TODO: Fix the output 3D model
 # TODO: Output pdf
 # TODO: EMWET
@@ -16,6 +15,7 @@ from HelperFunction.readGeometry import ReadGeometry
 from Geometry.winglet import *
 from parapy.exchange.step import STEPWriter
 from HelperFunction.analysis import Analysis
+from HelperFunction.mission import aircraft_drag_components
 
 DIR = os.path.dirname(__file__)
 
@@ -27,10 +27,20 @@ class Aircraft(GeomBase):
     TYPE_wing_airfoil = Input(1)
     TYPE_winglet = Input(0)
     M_cruise = Input(input.M_cruise)  # cruise mach number
+    altitude = Input(9000)  # cruise altitude used by the AVL analysis [m]
+    # when True, only the parts needed for the AVL analysis are built: no solids, mirrored shapes or markers
+    analysis_only = Input(False)
+    use_avl_session = Input(False)  # solve in one AVL process that is kept alive, instead of a new one per run
+    panel_policy = Input(None)  # discretization of the AVL surfaces (HelperFunction/panel_policy.py)
+    # when False, the left wing, winglet and horizontal tail are not built as mirrored solids. AVL mirrors the
+    # surfaces itself (y_duplicate) and the area and volume queries count the right side twice
+    mirror_left_side = Input(True)
 
     # -------- FUSELAGE -----------#
     ln_d = Input(1.22)  # nose slenderness ratio
     lt_d = Input(2.724)  # tail slenderness ratio
+    fuselage_length = Input(37.57)  # complete fuselage length
+    cabin_d = Input(4.14)  # cabin diameter
 
     # --------- WING --------------#
     name = Input("wing")
@@ -49,6 +59,7 @@ class Aircraft(GeomBase):
     htp_area = Input(31)
     htp_taper = Input(0.3)
     htp_dihedral = Input(5)
+    Vh = Input(1.)  # horizontal tail volume coefficient
 
     # ----------- VERTICAL TAIL ---------------#
     vtp_root_airfoil = Input("NACA0012")
@@ -56,6 +67,7 @@ class Aircraft(GeomBase):
     vtp_aspect_ratio = Input(1.82)
     vtp_sweep = Input(35)
     vtp_area = Input(21.5)
+    Vv = Input(0.083)  # vertical tail volume coefficient
 
     # -------------- Winglet -------------------#
     # --------TYPE 0 Canted Winglet-------------
@@ -111,11 +123,12 @@ class Aircraft(GeomBase):
 
     @Part
     def aircraft_frame(self):
-        return Frame(pos=self.position)  # this helps visualizing the wing local reference frame
+        return Frame(pos=self.position,  # this helps visualizing the wing local reference frame
+                     suppress=self.analysis_only)
 
     @Part
     def fuselage(self):
-        return Fuselage(pass_down="ln_d, lt_d",
+        return Fuselage(pass_down="ln_d, lt_d, fuselage_length, cabin_d, analysis_only",
                         color="Blue")
 
     @Part
@@ -129,6 +142,8 @@ class Aircraft(GeomBase):
                               starting_point_mac=self.right_wing.starting_point_mac,
                               wing_sweep_025c=self.right_wing.wing_sweep_025c,
                               MAC_chord_length=self.right_wing.MAC_chord_length,
+                              Vh=self.Vh,
+                              analysis_only=self.analysis_only,
                               position=self.position.translate('z', 0.3 * self.fuselage.cabin_d))
 
     @Part
@@ -137,7 +152,8 @@ class Aircraft(GeomBase):
                              reference_point=self.htp_right_wing.position,
                              transparency=0.4,
                              vector1=self.htp_right_wing.position.Vz,
-                             vector2=self.htp_right_wing.position.Vx)
+                             vector2=self.htp_right_wing.position.Vx,
+                             suppress=self.analysis_only or not self.mirror_left_side)
 
     @Part
     def right_wing(self):
@@ -153,6 +169,8 @@ class Aircraft(GeomBase):
                     wing_c_root=self.wing_c_root,
                     wing_taper_ratio_inboard=self.wing_taper_ratio_inboard,
                     cabin_l=self.fuselage.cabin_l,
+                    analysis_only=self.analysis_only,
+                    panel_policy=self.panel_policy,
                     position=self.position.translate('x', 0.48 * self.fuselage.cabin_l,
                                                      '-z', 0.40 * self.fuselage.cabin_d))
 
@@ -172,6 +190,8 @@ class Aircraft(GeomBase):
                                  twist_tip=self.ct_twist_tip,
                                  position=self.right_wing.section_positions[2],
                                  avl_duplicate_pos=self.position,
+                                 analysis_only=self.analysis_only,
+                                 panel_policy=self.panel_policy,
                                  suppress=not self.winglet_ON)
 
         elif self.TYPE_winglet == 1:
@@ -195,6 +215,8 @@ class Aircraft(GeomBase):
                                                           self.right_wing.chords[2] * self.wtf_chord_root_ratio),
                                                 'x', np.deg2rad(-90)),
                                 avl_duplicate_pos=self.position,
+                                analysis_only=self.analysis_only,
+                                panel_policy=self.panel_policy,
                                 suppress=not self.winglet_ON)
 
         elif self.TYPE_winglet == 2:
@@ -208,6 +230,8 @@ class Aircraft(GeomBase):
                                 sweep_le=self.rkt_sweep_le,
                                 position=self.right_wing.section_positions[2],
                                 avl_duplicate_pos=self.position,
+                                analysis_only=self.analysis_only,
+                                panel_policy=self.panel_policy,
                                 suppress=not self.winglet_ON)
 
         elif self.TYPE_winglet == 3:
@@ -231,6 +255,8 @@ class Aircraft(GeomBase):
                             position=rotate(self.right_wing.section_positions[2],
                                             'x', np.deg2rad(self.right_wing.wing_dihedral)),
                             avl_duplicate_pos=self.position,
+                            analysis_only=self.analysis_only,
+                            panel_policy=self.panel_policy,
                             suppress=not self.winglet_ON)
 
     @Part
@@ -239,7 +265,8 @@ class Aircraft(GeomBase):
                              reference_point=self.right_wing.position,
                              transparency=0.4,
                              vector1=self.right_wing.position.Vz,
-                             vector2=self.right_wing.position.Vx)
+                             vector2=self.right_wing.position.Vx,
+                             suppress=self.analysis_only or not self.mirror_left_side)
 
     @Part
     def left_winglet(self):
@@ -248,7 +275,7 @@ class Aircraft(GeomBase):
                              # Two vectors to define the mirror plane
                              vector1=self.right_wing.position.Vz,
                              vector2=self.right_wing.position.Vx,
-                             suppress=not self.winglet_ON,
+                             suppress=not self.winglet_ON or self.analysis_only or not self.mirror_left_side,
                              mesh_deflection=0.0001)
 
     @Part
@@ -258,17 +285,63 @@ class Aircraft(GeomBase):
                             vtp_aspect_ratio=self.vtp_aspect_ratio,
                             vtp_sweep=self.vtp_sweep,
                             vtp_area=self.vtp_area,
-                            htp_area=self.htp_right_wing.htp_area,
-                            lh=self.htp_right_wing.lh,
-                            Vh=self.htp_right_wing.Vh,
+                            Vv=self.Vv,
+                            wing_area=self.right_wing.wing_area_total,
                             MAC_chord_length=self.right_wing.MAC_chord_length,
                             starting_point_mac=self.right_wing.starting_point_mac,
                             cabin_d=self.fuselage.cabin_d,
                             wing_span=self.right_wing.wing_span,
+                            analysis_only=self.analysis_only,
                             position=rotate90(self.position.translate('z', (0.48 * self.fuselage.cabin_d)),
                                               'x'),
                             color="blue")
 
+    @Attribute
+    # solids of the right side, of which the left side is the mirror image
+    def right_side_solids(self):
+        self.check_solids_built()
+        solids = [self.right_wing.solid, self.htp_right_wing.solid]
+        if self.winglet_ON:
+            solids.append(self.right_winglet.surface)
+        return solids
+
+    @Attribute
+    # solids on the plane of symmetry
+    def centerline_solids(self):
+        self.check_solids_built()
+        return [self.fuselage.solid, self.vtp_wing.solid]
+
+    def check_solids_built(self):
+        if self.analysis_only:
+            raise RuntimeError("The solids are not built when analysis_only is True; use the wetted areas of "
+                               "drag_components and the volume of the fuselage instead")
+
+    @Attribute
+    # surface area of all solids [m2]; the left side is counted as a copy of the right side, so the mirrored solids
+    # are never built for it
+    def total_area(self):
+        return 2 * sum(solid.area for solid in self.right_side_solids) + \
+            sum(solid.area for solid in self.centerline_solids)
+
+    @Attribute
+    # volume of all solids [m3], see total_area
+    def total_volume(self):
+        return 2 * sum(solid.volume for solid in self.right_side_solids) + \
+            sum(solid.volume for solid in self.centerline_solids)
+
+    @Attribute
+    # components written by step_writer_components; the mirrored ones only when they are built
+    def export_trees(self):
+        if not self.mirror_left_side:
+            return [self.fuselage, self.right_wing, self.right_winglet, self.htp_right_wing, self.vtp_wing]
+        return [self.fuselage, self.right_wing, self.right_winglet, self.left_wing, self.left_winglet,
+                self.htp_right_wing, self.htp_left_wing, self.vtp_wing]
+
+    @Attribute
+    # wetted areas and reference lengths of the parasite drag build-up, without building any solid
+    def drag_components(self):
+        return aircraft_drag_components(self)
+
     @Attribute
     def avl_surfaces(self):  # this scans the product tree and collect all instances of the avl.Surface class
         return self.find_children(lambda o: isinstance(o, avl.Surface))
@@ -286,19 +359,16 @@ class Aircraft(GeomBase):
     @Part
     def step_writer_components(self):
         return STEPWriter(default_directory=DIR,
-                          trees=[self.fuselage,
-                                 self.right_wing,
-                                 self.right_winglet,
-                                 self.left_wing,
-                                 self.left_winglet])
+                          trees=self.export_trees,
+                          suppress=self.analysis_only)
 
     @Part
     def avl_analysis(self):
         return Analysis(aircraft=[self.right_wing,
-                                  self.right_winglet,
-                                  self.left_wing,
-                                  self.left_winglet],
-                        altitude=9000,
+                                  self.right_winglet],
+                        altitude=self.altitude,
+                        use_session=self.use_avl_session,
+                        drag_components=self.drag_components,
                         TYPE_winglet=self.TYPE_winglet,
                         TYPE_wing_airfoil=self.TYPE_wing_airfoil,
                         configuration=self.avl_configuration,
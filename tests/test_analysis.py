@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("parapy")
+pytest.importorskip("kbeutils")
+
+from HelperFunction.analysis import Analysis  # noqa: E402
+
+
+def test_bare_analysis_has_no_drag_build_up():
+    # an Analysis that is not built by the Aircraft gets no drag_components
+    analysis = Analysis(aircraft=[], altitude=9000, case_settings=[], configuration=None)
+    assert analysis.drag_components is None
+    assert analysis.CD0 is None
+    assert analysis.mission is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from HelperFunction.atmosphere import AtmosphereTable, atmosphere_table, dynamic_pressure, dynamic_viscosity, isa
+
+# U.S. Standard Atmosphere 1976 at geopotential altitudes: altitude [m], temperature [K], pressure [Pa],
+# density [kg/m3], speed of sound [m/s]
+REFERENCE = [(0., 288.15, 101325., 1.2250, 340.29),
+             (11000., 216.65, 22632., 0.36392, 295.07),
+             (20000., 216.65, 5474.9, 0.088035, 295.07)]
+
+
+@pytest.mark.parametrize("altitude, temperature, pressure, density, speed_of_sound", REFERENCE)
+def test_isa_reference_values(altitude, temperature, pressure, density, speed_of_sound):
+    assert [float(value) for value in isa(altitude)] == pytest.approx([temperature, pressure, density,
+                                                                       speed_of_sound], rel=1e-4)
+
+
+def test_isa_arrays():
+    altitudes = np.array([row[0] for row in REFERENCE])
+    temperature, pressure, density, speed_of_sound = isa(altitudes)
+    assert pressure == pytest.approx([row[2] for row in REFERENCE], rel=1e-4)
+    assert speed_of_sound.shape == altitudes.shape
+
+
+def test_dynamic_pressure():
+    # 0.5 rho V^2 with V = M a
+    temperature, pressure, density, speed_of_sound = isa(11000.)
+    assert dynamic_pressure(11000., 0.78) == pytest.approx(0.5 * density * (0.78 * speed_of_sound) ** 2)
+    assert dynamic_pressure([0., 11000.], [0.5, 0.78]).shape == (2,)
+
+
+def test_dynamic_viscosity_at_sea_level():
+    assert dynamic_viscosity(288.15) == pytest.approx(1.7894e-5, rel=1e-4)
+
+
+@pytest.mark.parametrize("altitude", [-1., 20001.])
+def test_outside_the_atmosphere(altitude):
+    with pytest.raises(ValueError):
+        isa(altitude)
+    with pytest.raises(ValueError):
+        atmosphere_table().dynamic_pressure(altitude, 0.78)
+
+
+def test_table_matches_isa():
+    altitudes = np.append(np.random.RandomState(0).uniform(0., 20000., 100000), [0., 11000., 20000.])
+    table = atmosphere_table()
+    assert table.dynamic_pressure(altitudes, 0.78) == pytest.approx(dynamic_pressure(altitudes, 0.78), rel=1e-6)
+    # on the grid the table holds the pressure of isa
+    assert table.pressure == pytest.approx(isa(table.altitude)[1], rel=1e-12)
+
+
+def test_table_step():
+    assert atmosphere_table(10.) is atmosphere_table(10.)
+    coarse = AtmosphereTable(step=100.)
+    assert coarse.dynamic_pressure(12345., 0.78) == pytest.approx(dynamic_pressure(12345., 0.78), rel=1e-4)
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+from HelperFunction import avl_cache
+from HelperFunction.avl_cache import AvlResultCache, configuration_key
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# plain stand-ins for the avl.Configuration, avl.Surface and avl.Section objects that configuration_key reads
+CONFIGURATION = '''
+from types import SimpleNamespace as NS
+
+def section(y, chord):
+    return NS(n_spanwise=None, span_spacing=None, chord=chord, position=NS(point=NS(x=0.25 * y, y=y, z=0.)),
+              airfoil=NS(name="NACA2412", camber=[0.02, 0.4]))
+
+surface = NS(name="wing", n_chordwise=12, chord_spacing=1.0, n_spanwise=20, span_spacing=1.0, y_duplicate=0.,
+             sections=[section(0., 6.), section(17., 1.5)])
+configuration = NS(reference_area=122.4, reference_span=34.1, reference_chord=4.19,
+                   reference_point=NS(x=0., y=0., z=0.), mach=0.78, surfaces=[surface])
+cases = [("fixed_aoa", {"alpha": 3}), ("fixed_cl", {"alpha": 0.5, "beta": 0.})]
+'''
+
+
+def stand_in():
+    namespace = {}
+    exec(CONFIGURATION, namespace)
+    return namespace
+
+
+def test_key_is_stable_across_runs():
+    data = stand_in()
+    key = configuration_key(data['configuration'], data['cases'])
+    script = CONFIGURATION + "from HelperFunction.avl_cache import configuration_key\n" \
+                             "print(configuration_key(configuration, cases))\n"
+    for seed in ["1", "2"]:
+        output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT_DIR, universal_newlines=True,
+                                         env=dict(os.environ, PYTHONHASHSEED=seed))
+        assert output.strip() == key
+
+
+def test_key_follows_the_geometry_and_cases():
+    data = stand_in()
+    key = configuration_key(data['configuration'], data['cases'])
+    data['configuration'].surfaces[0].sections[1].chord = 1.6
+    assert configuration_key(data['configuration'], data['cases']) != key
+    data = stand_in()
+    assert configuration_key(data['configuration'], data['cases'][:1]) != key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.
+
+    def time(self):
+        self.now += 1.
+        return self.now
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(avl_cache, "time", Clock())
+    results = {'case': {'Totals': {'CLtot': 0.5}, 'StripForces': {'wing': {'c cl': list(range(200))}}}}
+    cache = AvlResultCache(str(tmp_path / "cache.sqlite"))
+    cache.put("a", results)
+    with cache._connect() as connection:
+        size = connection.execute("SELECT size FROM results").fetchone()[0]
+    cache.max_bytes = 2 * size  # room for two entries
+    cache.put("b", results)
+    assert cache.get("a") == results  # a is now used more recently than b
+    cache.put("c", results)
+    assert cache.get("b") is None
+    assert cache.get("a") == results
+    assert cache.get("c") == results
@@ -0,0 +1,122 @@
+import os
+import stat
+import sys
+
+import pytest
+
+pytest.importorskip("parapy")
+pytest.importorskip("kbeutils")
+
+from full_aircraft import Aircraft  # noqa: E402
+from HelperFunction.avl_session import geometry_text  # noqa: E402
+from HelperFunction.help_fucntions import set_headless  # noqa: E402
+
+
+def data_lines(text):
+    lines = [line.split("!")[0].strip() for line in text.splitlines()]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def header(text):
+    """
+    :return: numbers of the Mach, symmetry and reference lines of an AVL input file, in one list
+    """
+    return [float(v) for line in data_lines(text)[1:5] for v in line.split()]
+
+
+def surface_blocks(text):
+    """
+    :param text: content of an AVL input file
+    :return: {surface name: {'surface': numbers of the Nchord line, 'yduplicate': YDUPLICATE or None,
+    'sections': numbers of every SECTION line}}
+    """
+    lines = data_lines(text)
+    blocks, current = {}, None
+    for i, line in enumerate(lines):
+        keyword = line.upper()[:4]
+        if keyword == "SURF":
+            current = blocks[lines[i + 1]] = {'surface': [float(v) for v in lines[i + 2].split()],
+                                              'yduplicate': None, 'sections': []}
+        elif keyword == "YDUP" and current is not None:
+            current['yduplicate'] = float(lines[i + 1].split()[0])
+        elif keyword == "SECT" and current is not None:
+            current['sections'].append([float(v) for v in lines[i + 1].split()])
+    return blocks
+
+
+# stand-in for the AVL executable that keeps a copy of the input file it is given, either on the command line or
+# with the LOAD command, and then exits
+CAPTURE_AVL = '''#!{python}
+import os
+import shutil
+import sys
+
+def capture(path):
+    shutil.copy(os.path.abspath(path), {target!r})
+    sys.exit(0)
+
+for argument in sys.argv[1:]:
+    if os.path.isfile(argument):
+        capture(argument)
+expect = False
+for line in sys.stdin:
+    if expect and line.strip():
+        capture(line.strip())
+    expect = line.strip().upper() == "LOAD"
+'''
+
+
+def interface_text(aircraft, directory, monkeypatch):
+    """
+    :return: content of the AVL input file that avl.Interface writes for the aircraft
+    """
+    target = os.path.join(str(directory), "interface.avl")
+    exe = os.path.join(str(directory), "avl")
+    with open(exe, "w") as f:
+        f.write(CAPTURE_AVL.format(python=sys.executable, target=target))
+    os.chmod(exe, os.stat(exe).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(directory) + os.pathsep + os.environ.get("PATH", ""))
+    try:
+        aircraft.avl_analysis.results
+    except Exception:
+        pass  # the stand-in gives no results
+    if not os.path.exists(target):
+        pytest.skip("avl.Interface does not run the AVL executable found on PATH")
+    with open(target) as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def sharklet_aircraft():
+    set_headless(True)
+    return Aircraft(label="Sharklet aircraft", TYPE_winglet=3, analysis_only=True)
+
+
+def test_sharklet_sections_carry_the_spanwise_panels(sharklet_aircraft):
+    sharklet = sharklet_aircraft.right_winglet
+    assert sharklet.avl_surface.n_spanwise is None
+    assert [section.avl_section.n_spanwise for section in sharklet.sections] == sharklet.section_n_spanwise
+
+
+def test_sharklet_panels_written_per_section(sharklet_aircraft):
+    sharklet = sharklet_aircraft.right_winglet
+    block = surface_blocks(geometry_text(sharklet_aircraft.avl_configuration))[sharklet.name]
+    # Nchord Cspace only, so that AVL takes Nspan Sspace from the sections
+    assert len(block['surface']) == 2
+    assert [int(numbers[5]) for numbers in block['sections']] == sharklet.section_n_spanwise
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the stand-in AVL executable is a script with a shebang line")
+def test_geometry_text_matches_interface(tmp_path, monkeypatch):
+    set_headless(True)
+    aircraft = Aircraft(label="Default aircraft", analysis_only=True)
+    session, interface = geometry_text(aircraft.avl_configuration), interface_text(aircraft, tmp_path, monkeypatch)
+    assert header(session) == pytest.approx(header(interface), abs=1e-4)
+    session, interface = surface_blocks(session), surface_blocks(interface)
+    assert list(session) == list(interface)
+    for name in session:
+        assert session[name]['surface'] == pytest.approx(interface[name]['surface']), name
+        assert session[name]['yduplicate'] == interface[name]['yduplicate'], name
+        assert len(session[name]['sections']) == len(interface[name]['sections']), name
+        for ours, theirs in zip(session[name]['sections'], interface[name]['sections']):
+            assert ours == pytest.approx(theirs, abs=1e-3), name
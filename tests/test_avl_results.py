@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from HelperFunction.avl_results import AvlResults
+
+
+def case(alpha, cl):
+    # two surfaces with different columns, a total that is not a number and another part of the results
+    return {'Totals': {'Alpha': alpha, 'CLtot': cl, 'CDtot': cl ** 2 / 30., 'Configuration': "A320"},
+            'StripForces': {'wing': {'Yle': [1., 3., 5.], 'c cl': [cl * 3., cl * 2.5, cl * 1.5]},
+                            'winglet': {'Yle': [6.], 'cl': [cl / 2.]}},
+            'StabilityDerivatives': {'CLa': 5.1}}
+
+
+@pytest.fixture
+def results():
+    return {'fixed_aoa': case(3., 0.4), 'fixed_cl': case(2.1, 0.5)}
+
+
+def assert_same(results, dictionary):
+    assert list(results) == list(dictionary)
+    for name, result in dictionary.items():
+        assert results[name]['Totals'] == result['Totals']
+        assert results[name]['StabilityDerivatives'] == result['StabilityDerivatives']
+        assert set(results[name]['StripForces']) == set(result['StripForces'])
+        for surface, strips in result['StripForces'].items():
+            # only the columns written for a surface come back
+            assert set(results[name]['StripForces'][surface]) == set(strips)
+            for column, values in strips.items():
+                assert list(results[name]['StripForces'][surface][column]) == values
+
+
+def test_from_dict(results):
+    converted = AvlResults.from_dict(results)
+    assert AvlResults.from_dict(converted) is converted
+    assert_same(converted, results)
+    assert converted.to_dict() == results
+
+
+def test_views(results):
+    converted = AvlResults.from_dict(results)
+    assert converted.total('CLtot').tolist() == [0.4, 0.5]
+    assert converted.total_dict('Alpha') == {'fixed_aoa': 3., 'fixed_cl': 2.1}
+    assert converted.strip('wing', 'c cl') == pytest.approx(np.array([[1.2, 1., 0.6], [1.5, 1.25, 0.75]]))
+    assert converted.surface('winglet').shape == (2, 1, len(converted.columns))
+    assert converted.has_column('wing', 'c cl') and not converted.has_column('winglet', 'c cl')
+    assert np.isnan(converted.strip('winglet', 'c cl')).all()
+    # the strips of a surface are looked up without copying
+    assert np.shares_memory(converted.strip('wing', 'Yle'), converted.strips)
+
+
+def test_different_number_of_strips(results):
+    results['fixed_cl']['StripForces']['winglet']['cl'] = [0.2, 0.3]
+    with pytest.raises(ValueError, match="winglet"):
+        AvlResults.from_dict(results)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(tmp_path, results, mmap):
+    directory = AvlResults.from_dict(results).save(str(tmp_path / "results"))
+    loaded = AvlResults.load(directory, mmap=mmap)
+    assert isinstance(loaded.strips, np.memmap) == mmap
+    assert_same(loaded, results)
+    assert loaded.to_dict() == results
+    assert loaded.total_dict('CLtot') == {'fixed_aoa': 0.4, 'fixed_cl': 0.5}
+    assert loaded.strip('winglet', 'cl').tolist() == [[0.2], [0.25]]
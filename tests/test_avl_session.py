@@ -0,0 +1,163 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from HelperFunction.avl_session import AvlSession, parse_strip_forces, parse_totals
+
+GEOMETRY = "test\n#Mach\n0.0\n"
+
+TOTALS = """
+ ---------------------------------------------------------------
+ Vortex Lattice Output -- Total Forces
+
+ Configuration: A320
+     # Surfaces =   4
+     # Strips   =  80
+     # Vortices = 960
+
+  Sref = 122.40       Cref =  4.1935      Bref =  34.100
+  Xref =  0.0000      Yref =  0.0000      Zref =  0.0000
+
+ Standard axis orientation,  X fwd, Z down
+
+ Run case: fixed_cl
+
+  Alpha =   2.13456     pb/2V =  -0.00000     p'b/2V =  -0.00000
+  Beta  =   0.00000     qc/2V =   0.00000
+  Mach  =     0.780     rb/2V =  -0.00000     r'b/2V =  -0.00000
+
+  CXtot =   0.00441     Cltot =  -0.00000     Cl'tot =  -0.00000
+  CYtot =   0.00000     Cmtot =  -0.51234
+  CZtot =  -0.49987     Cntot =   0.00000     Cn'tot =   0.00000
+
+  CLtot =   0.50000
+  CDtot =   0.01150
+  CDvis =   0.00000     CDind =   0.0115003
+  e =    0.9873
+ ---------------------------------------------------------------
+"""
+
+STRIPS = """
+  ---------------------------------------------------------------
+  Surface and Strip Forces by surface
+
+  Sref = 122.40       Cref =  4.1935      Bref =  34.100
+  Xref =  0.0000      Yref =  0.0000      Zref =  0.0000
+
+  ---------------------------------------------------------------
+  Surface # 1     wing
+     # Chordwise = 12   # Spanwise =  2     First strip =  1
+     Surface area Ssurf =   61.200     Ave. chord Cave =    3.6000
+
+ Forces referred to Sref, Cref, Bref about Xref, Yref, Zref
+ Standard axis orientation,  X fwd, Z down
+     CLsurf  =   0.25000     Clsurf  =  -0.05000
+     CYsurf  =   0.00000     Cmsurf  =  -0.25000
+     CDsurf  =   0.00575     Cnsurf  =   0.00100
+     CDisurf =   0.00575     CDvsurf =   0.00000
+
+ Strip Forces referred to Strip Area, Chord
+    j     Xle      Yle      Zle      Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+     1  10.0000   2.0000   0.0000   6.0000  24.0000   3.0000  -0.0100   0.5000   0.5000   0.0100   0.0000  -0.1000  -0.2250   0.4500
+     2  12.0000   6.0000   0.1000   4.0000  16.0000   1.6000  -0.0200   0.4000   0.4000   0.0080   0.0000  -0.1000  -0.2000   0.5000
+
+  ---------------------------------------------------------------
+  Surface # 2     wing (YDUP)
+     # Chordwise = 12   # Spanwise =  2     First strip =  3
+
+ Strip Forces referred to Strip Area, Chord
+    j     Xle      Yle      Zle      Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+     3  12.0000  -6.0000   0.1000   4.0000  16.0000   1.6000  -0.0200   0.4000   0.4000   0.0080   0.0000  -0.1000  -0.2000   0.5000
+     4  10.0000  -2.0000   0.0000   6.0000  24.0000   3.0000  -0.0100   0.5000   0.5000   0.0100   0.0000  -0.1000  -0.2250   0.4500
+"""
+
+# stand-in for the AVL executable: it follows the LOAD, FT and FS commands of the session, writes the files above
+# only when a geometry has been loaded, logs what it did and exits after a number of cases
+FAKE_AVL = '''#!{python}
+import sys
+
+log = open({log!r}, "a")
+loaded, expect, written, cases = False, None, 0, 0
+for line in sys.stdin:
+    line = line.strip()
+    if expect == "LOAD":
+        loaded, expect = True, None
+        log.write("LOAD\\n")
+        log.flush()
+    elif expect in ("FT", "FS"):
+        command, written, expect = expect, written + 1, None
+        if written == 3:  # totals, strips and the file that marks the end of the case, which the session waits for,
+            log.write("CASE\\n")  # so the case is logged before that file is written
+            log.flush()
+        if loaded:
+            with open(line, "w") as f:
+                f.write({totals!r} if command == "FT" else {strips!r})
+        if written == 3:
+            written, cases = 0, cases + 1
+            if cases == {die_after}:
+                sys.exit(0)
+    elif line in ("LOAD", "FT", "FS"):
+        expect = line
+    elif line == "QUIT":
+        break
+'''
+
+
+def fake_avl(directory, die_after=0):
+    path = os.path.join(str(directory), "fake_avl")
+    log = os.path.join(str(directory), "fake_avl.log")
+    with open(path, "w") as f:
+        f.write(FAKE_AVL.format(python=sys.executable, log=log, totals=TOTALS, strips=STRIPS, die_after=die_after))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path, log
+
+
+def read_log(log):
+    with open(log) as f:
+        return f.read().split()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the fake AVL executable is a script with a shebang line")
+def test_restart_reloads_geometry(tmp_path):
+    exe, log = fake_avl(tmp_path, die_after=1)
+    with AvlSession(exe, work_dir=str(tmp_path), timeout=10.) as session:
+        session.run(GEOMETRY, [("first", {'alpha': 1.})])
+        session._process.wait(10)  # the fake AVL exits after its first case
+        result = session.run_case({'alpha': 2.})
+    assert read_log(log) == ["LOAD", "CASE", "LOAD", "CASE"]
+    assert result['Totals']['CLtot'] == 0.5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the fake AVL executable is a script with a shebang line")
+def test_run_after_restart_solves_all_cases_again(tmp_path):
+    exe, log = fake_avl(tmp_path)
+    with AvlSession(exe, work_dir=str(tmp_path), timeout=10.) as session:
+        session.run(GEOMETRY, [("first", {'alpha': 1.})])
+        session.run(GEOMETRY, [("first", {'alpha': 1.})])  # answered from memory
+        session._process.kill()
+        session._process.wait(10)
+        results = session.run(GEOMETRY, [("first", {'alpha': 1.}), ("second", {'alpha': 2.})])
+    # the cases solved by the previous process are forgotten with the restart
+    assert read_log(log) == ["LOAD", "CASE", "LOAD", "CASE", "CASE"]
+    assert set(results) == {"first", "second"}
+
+
+def test_parse_totals():
+    totals = parse_totals(TOTALS)
+    assert totals['CLtot'] == 0.5
+    assert totals['CDtot'] == 0.0115
+    assert totals['Alpha'] == 2.13456
+    assert totals["Cn'tot"] == 0.
+    assert totals['Sref'] == 122.4
+
+
+def test_parse_strip_forces():
+    strips = parse_strip_forces(STRIPS)
+    # the strips of the duplicated surface follow those of the surface itself
+    assert list(strips) == ['wing']
+    assert strips['wing']['Yle'] == [2., 6., -6., -2.]
+    assert strips['wing']['c cl'] == [3., 1.6, 1.6, 3.]
+    assert strips['wing']['C.P.x/c'][0] == 0.45
+    assert len(strips['wing']['j']) == 4
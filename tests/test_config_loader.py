@@ -0,0 +1,134 @@
+import csv
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from HelperFunction.config_loader import load_configs, sweep_points
+from HelperFunction.readGeometry import ReadGeometry
+
+INPUT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input.txt")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return ReadGeometry("A320", INPUT_FILE)
+
+
+def values(read):
+    return dict(read.inputs, **read.reference)
+
+
+def write_csv(path, rows):
+    fields = list(dict.fromkeys(field for row in rows for field in row))
+    with open(path, "w", newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def test_input_file_matches_read_geometry(reference):
+    config, = load_configs(INPUT_FILE)
+    assert config.name == "A320"
+    assert config.inputs == reference.inputs
+    assert config.reference == reference.reference
+    assert reference.w_af_root == config.inputs['airfoil_root']
+    assert reference.w_af_tip == config.inputs['airfoil_tip']
+    assert reference.wing_span == 34.
+    assert reference.skt_nu_blended_sections == 10
+    assert reference.vt == {'chord_root': 5.63, 'chord_tip': 2.55, 'height': 6.21, 'sweep': 50., 'position': 35.3}
+    assert reference.ht == {'chord_root': 3.73, 'chord_tip': 1.23, 'sweep': 32., 'dihedral': 6., 'position': 31.6}
+
+
+def test_csv_matches_input_file(tmp_path, reference):
+    # CSV values are strings; they are typed like those of input.txt
+    row = dict({field: str(value) for field, value in values(reference).items()}, label="A320")
+    config, = load_configs(write_csv(str(tmp_path / "aircraft.csv"), [row]))
+    assert config.name == "A320"
+    assert config.inputs == reference.inputs
+    assert config.reference == reference.reference
+
+
+def test_json_matches_input_file(tmp_path, reference):
+    path = str(tmp_path / "aircraft.json")
+    with open(path, "w") as f:
+        json.dump({"A320": values(reference)}, f)
+    config, = load_configs(path)
+    assert config.name == "A320"
+    assert config.inputs == reference.inputs
+    assert config.reference == reference.reference
+
+
+def test_unlabelled_rows_named_after_the_file(tmp_path):
+    path = write_csv(str(tmp_path / "sweep.csv"), [{'wing_span': "33"}, {'wing_span': "34", 'twist': "-4"}])
+    configs = load_configs(path)
+    assert [config.name for config in configs] == ["sweep_1", "sweep_2"]
+    # empty cells are left out
+    assert [config.inputs for config in configs] == [{'wing_span': 33.}, {'wing_span': 34., 'twist': -4.}]
+    assert sweep_points(configs, altitude=9000.) == [{'altitude': 9000., 'wing_span': 33.},
+                                                     {'altitude': 9000., 'wing_span': 34., 'twist': -4.}]
+
+    path = str(tmp_path / "list.json")
+    with open(path, "w") as f:
+        json.dump([{'wing_span': 33}, {'label': "long", 'wing_span': 36}], f)
+    assert [config.name for config in load_configs(path)] == ["list_1", "long"]
+
+
+def test_several_aircraft_in_one_input_file(tmp_path, reference):
+    with open(INPUT_FILE) as f:
+        text = f.read()
+    path = tmp_path / "fleet.txt"
+    path.write_text("#Aircraft A320\n" + text + "\n#Aircraft long\n" +
+                    text.replace("34. 0.756", "36. 0.78", 1).replace("chord_root  5.63", "chord_root  6.0", 1))
+    first, second = load_configs(str(path))
+    assert (first.name, second.name) == ("A320", "long")
+    assert first.inputs == reference.inputs
+    assert (second.inputs['wing_span'], second.inputs['M_cruise'], second.reference['vt_chord_root']) == (36., 0.78, 6.)
+
+    read = ReadGeometry("long", str(path))
+    assert (read.wing_span, read.vt['chord_root']) == (36., 6.)
+    # an unknown name reads the first aircraft
+    assert ReadGeometry("unknown", str(path)).inputs == reference.inputs
+
+
+def test_directory_reads_every_configuration_file(tmp_path):
+    shutil.copy(INPUT_FILE, str(tmp_path / "input.txt"))
+    write_csv(str(tmp_path / "sweep.csv"), [{'wing_span': "33"}])
+    (tmp_path / "notes.md").write_text("not a configuration")
+    assert [config.name for config in load_configs(str(tmp_path))] == ["A320", "sweep_1"]
+
+
+@pytest.mark.parametrize("row, message", [({'wing_spam': "34"}, "not an input"),
+                                          ({'wing_span': "long"}, "not a valid"),
+                                          ({'skt_nu_blended_sections': "2.5"}, "not a valid"),
+                                          ({'winglet_ON': "maybe"}, "not a valid")])
+def test_invalid_values(tmp_path, row, message):
+    path = write_csv(str(tmp_path / "bad.csv"), [row])
+    with pytest.raises(ValueError, match=message) as error:
+        load_configs(path)
+    # the message points at the row
+    assert "bad.csv:2" in str(error.value)
+
+
+def test_unknown_winglet_type(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("#Winglet\n7\nNACA0006 NACA0006\n1 0.2 0.09 60\n")
+    with pytest.raises(ValueError, match="unknown winglet type"):
+        load_configs(str(path))
+
+
+def test_large_csv(tmp_path):
+    rows = [{'label': "point_{:d}".format(i), 'wing_span': str(32. + i * 1e-4), 'M_cruise': "0.78", 'twist': "-4",
+             'TYPE_winglet': str(i % 4), 'winglet_ON': "true", 'airfoil_tip': "NACA0006"} for i in range(10000)]
+    path = write_csv(str(tmp_path / "large.csv"), rows)
+    start = time.perf_counter()
+    configs = load_configs(path)
+    elapsed = time.perf_counter() - start
+    assert len(configs) == 10000
+    assert configs[-1].inputs['wing_span'] == pytest.approx(32.9999)
+    assert configs[-1].inputs['TYPE_winglet'] == 3
+    # about 0.1s on a laptop; the bound only catches a parser that became quadratic
+    assert elapsed < 5.
@@ -0,0 +1,12 @@
+import pytest
+
+pytest.importorskip("parapy")
+
+from Geometry.fuselage import Fuselage  # noqa: E402
+
+
+def test_wetted_area_and_volume_of_the_solid():
+    fuselage = Fuselage(popup_gui=False)
+    # the smooth profile follows the loft through the cross-sections, up to the parametrization of the loft
+    assert fuselage.wetted_area == pytest.approx(fuselage.solid.area, rel=1e-2)
+    assert fuselage.volume == pytest.approx(fuselage.solid.volume, rel=1e-2)
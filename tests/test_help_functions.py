@@ -0,0 +1,33 @@
+import pytest
+
+from HelperFunction import help_fucntions
+from HelperFunction.help_fucntions import check_slot_change, collect_diagnostics, report_clamp
+
+
+@pytest.fixture(autouse=True)
+def headless(monkeypatch):
+    monkeypatch.setattr(help_fucntions, "_headless", True)
+
+
+def test_check_slot_change_records_given_and_used_value():
+    with collect_diagnostics() as events, pytest.warns(UserWarning, match="cant"):
+        value = check_slot_change('cant', 55., 10., [0, 40])
+    assert value == 10.
+    event, = events
+    assert (event.slot, event.given, event.used, event.correct_range) == ('cant', 55., 10., (0, 40))
+
+
+def test_check_slot_change_in_range():
+    with collect_diagnostics() as events:
+        assert check_slot_change('cant', 20., 10., [0, 40]) == 20.
+    assert events == []
+
+
+def test_report_clamp_reaches_every_active_collector():
+    with collect_diagnostics() as outer:
+        with collect_diagnostics() as inner, pytest.warns(UserWarning):
+            report_clamp("twist", -7, -5, [-5, 0], "twist out of range")
+        with pytest.warns(UserWarning):
+            report_clamp("incidence", 6, 3, [0, 5], "incidence out of range")
+    assert [event.slot for event in inner] == ["twist"]
+    assert [(event.slot, event.given, event.used) for event in outer] == [("twist", -7, -5), ("incidence", 6, 3)]
@@ -0,0 +1,58 @@
+import pytest
+
+from HelperFunction import optimizer
+from HelperFunction.optimizer import Evaluator, Problem, optimize_scipy
+
+
+def fake_run_sweep(points, executor=None, store=None):
+    # drag is lowest at a = 3 and b = 0, which lies on the lower bound of b
+    return [dict(point, error=None, drag=(point['a'] - 3.) ** 2 + point['b']) for point in points]
+
+
+@pytest.fixture
+def problem(monkeypatch):
+    monkeypatch.setattr(optimizer, "run_sweep", fake_run_sweep)
+    return Problem({}, [('a', 0., 4.), ('b', 0., 1.)], objective='drag')
+
+
+def test_key_with_panel_policy():
+    pytest.importorskip("kbeutils")  # the panel policies hold avl.Spacing values
+    from HelperFunction.panel_policy import COARSE, PanelPolicy
+
+    key = Evaluator.key({'ct_cant': 10., 'panel_policy': COARSE})
+    assert key == Evaluator.key({'panel_policy': COARSE, 'ct_cant': 10.})
+    assert key != Evaluator.key({'ct_cant': 10., 'panel_policy': PanelPolicy(panel_width=0.5)})
+    assert Evaluator.key({'panel_policy': PanelPolicy(panel_width=0.5)}) == \
+        Evaluator.key({'panel_policy': PanelPolicy(panel_width=0.5)})
+
+
+def test_scipy_from_the_upper_bounds(problem):
+    pytest.importorskip("scipy")
+    # a forward step from the upper bound is clipped back onto it, which would give zero gradients
+    best, merit, evaluator = optimize_scipy(problem, x0=[1., 1.], executor=object())
+    assert best['a'] == pytest.approx(3., abs=0.05)
+    assert best['b'] == pytest.approx(0., abs=0.05)
+
+
+def test_cobyla(problem):
+    pytest.importorskip("scipy")
+    best, merit, evaluator = optimize_scipy(problem, method="COBYLA", x0=[1., 1.], executor=object(),
+                                            options={'maxiter': 200})
+    assert best['a'] == pytest.approx(3., abs=0.05)
+    assert best['b'] == pytest.approx(0., abs=0.05)
+
+
+def test_scipy_evaluates_every_design_once(problem, monkeypatch):
+    pytest.importorskip("scipy")
+    designs = []
+    evaluate = Evaluator.__call__
+
+    def recording_call(self, xs):
+        designs.append(tuple(xs[0]))
+        return evaluate(self, xs)
+
+    monkeypatch.setattr(Evaluator, "__call__", recording_call)
+    problem.constraints = {'drag': 10.}
+    optimize_scipy(problem, x0=[0.5, 0.5], executor=object())
+    # the objective, the constraint and their gradients share the evaluation of a design
+    assert len(designs) == len(set(designs))
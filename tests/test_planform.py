@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from HelperFunction.planform import fuselage_profile, revolution_properties, smooth_profile
+
+
+def ruled_mesh_properties(x, z, r, n_angles=2000, n_lines=200):
+    """ area of a fine triangle mesh of the ruled surface and its end faces, and volume by the divergence theorem """
+    theta = np.linspace(0., 2 * np.pi, n_angles + 1)
+    rings = [np.stack([np.full_like(theta, xi), ri * np.cos(theta), zi + ri * np.sin(theta)], axis=-1)
+             for xi, zi, ri in zip(x, z, r)]
+    area = volume = 0.
+    for ring1, ring2 in zip(rings[:-1], rings[1:]):
+        t = np.linspace(0., 1., n_lines + 1)[:, None, None]
+        grid = ring1 + t * (ring2 - ring1)
+        for a, b, c in [(grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:]), (grid[:-1, :-1], grid[1:, 1:], grid[:-1, 1:])]:
+            normal = np.cross(b - a, c - a)
+            area += 0.5 * np.linalg.norm(normal, axis=-1).sum()
+            volume += np.einsum('...i,...i', a + b + c, normal).sum() / 18.
+    # the end faces are normal to x
+    volume = abs(volume) + np.pi * (x[-1] * r[-1] ** 2 - x[0] * r[0] ** 2) / 3.
+    area += np.pi * (r[0] ** 2 + r[-1] ** 2)
+    return area, volume
+
+
+def test_cylinder():
+    area, volume = revolution_properties(np.array([0., 10.]), np.zeros(2), np.array([2., 2.]))
+    assert area == pytest.approx(2 * np.pi * 2. * 10. + 2 * np.pi * 4.)
+    assert volume == pytest.approx(np.pi * 4. * 10.)
+
+
+def test_offset_ruled_sections():
+    x, z, r = np.array([0., 1., 4., 5.]), np.array([0., 0., 0.3, 1.2]), np.array([0.5, 2., 2., 0.4])
+    area, volume = revolution_properties(x, z, r)
+    mesh_area, mesh_volume = ruled_mesh_properties(x, z, r)
+    assert area == pytest.approx(mesh_area, rel=1e-4)
+    assert volume == pytest.approx(mesh_volume, rel=1e-4)
+
+
+def test_fuselage_profile_arrays():
+    x, z, r = fuselage_profile([5., 6.], [20., 22.], [11., 12.], 4.14)
+    area, volume = revolution_properties(x, z, r)
+    assert area.shape == volume.shape == (2,)
+    assert area[0] == pytest.approx(revolution_properties(x[0], z[0], r[0])[0])
+
+
+def test_smooth_profile_through_sections():
+    x, z, r = fuselage_profile(5., 20., 11., 4.14)
+    xs, zs, rs = smooth_profile(x, z, r, points_per_section=10)
+    assert xs[::10] == pytest.approx(x)
+    assert zs[::10] == pytest.approx(z)
+    assert rs[::10] == pytest.approx(r)
+
+
+def test_smooth_profile_of_a_cone():
+    # a cubic spline through sections on a straight line is that line
+    x, z, r = np.array([0., 1., 3., 4.]), np.zeros(4), np.array([1., 1.5, 2.5, 3.])
+    area, volume = revolution_properties(*smooth_profile(x, z, r))
+    assert area == pytest.approx(np.pi * 4. * np.hypot(4., 2.) + np.pi * (1. + 9.))
+    assert volume == pytest.approx(np.pi / 3. * 4. * (1. + 3. + 9.))
+
+
+def test_smooth_properties_converged():
+    x, z, r = fuselage_profile(5., 20., 11., 4.14)
+    area, volume = revolution_properties(*smooth_profile(x, z, r))
+    fine_area, fine_volume = revolution_properties(*smooth_profile(x, z, r, points_per_section=200))
+    assert area == pytest.approx(fine_area, rel=1e-3)
+    assert volume == pytest.approx(fine_volume, rel=1e-3)
+
+
+def test_smooth_profile_arrays():
+    x, z, r = fuselage_profile([5., 6.], [20., 22.], [11., 12.], 4.14)
+    area, volume = revolution_properties(*smooth_profile(x, z, r))
+    assert area.shape == volume.shape == (2,)
+    assert volume[1] == pytest.approx(revolution_properties(*smooth_profile(x[1], z[1], r[1]))[1])
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from HelperFunction.results_store import ResultsStore, flatten_record
+
+
+def test_flatten_record():
+    assert flatten_record({'altitude': 9000., 'CL': {'fixed_aoa': 0.6, 'fixed_cl': 0.5}}) == \
+        {'altitude': 9000., 'CL_fixed_aoa': 0.6, 'CL_fixed_cl': 0.5}
+
+
+def test_append_read_filter_compact(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    store.append([{'TYPE_winglet': 0, 'altitude': 9000., 'CL_fixed_cl': 0.5},
+                  {'TYPE_winglet': 1, 'altitude': 9000., 'CL_fixed_cl': 0.52}])
+    # a later chunk with a new column and a missing one
+    store.append({'TYPE_winglet': 3, 'altitude': 11000., 'error': "AVL failed"})
+    assert len(store.chunks) == 2
+
+    data = store.read()
+    assert sorted(data) == ['CL_fixed_cl', 'TYPE_winglet', 'altitude', 'error']
+    assert data['TYPE_winglet'].tolist() == [0, 1, 3]
+    assert data['CL_fixed_cl'][:2].tolist() == [0.5, 0.52] and np.isnan(data['CL_fixed_cl'][2])
+    assert data['error'].tolist() == ["", "", "AVL failed"]
+
+    assert store.read(['CL_fixed_cl'], TYPE_winglet=1) == {'CL_fixed_cl': pytest.approx([0.52])}
+    assert store.read(['TYPE_winglet'], altitude=lambda h: h > 10000.)['TYPE_winglet'].tolist() == [3]
+
+    store.compact()
+    assert len(store.chunks) == 1
+    compacted = store.read()
+    for name in data:
+        np.testing.assert_array_equal(compacted[name], data[name])
+
+
+def test_empty_store(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    assert store.append([]) is None
+    assert store.read(['altitude'])['altitude'].shape == (0,)
@@ -0,0 +1,37 @@
+import pytest
+
+from HelperFunction import sensitivity
+from HelperFunction.sensitivity import gradients
+
+BASELINE = {'TYPE_winglet': 1, 'ct_cant': 20., 'wing_span': 34.}
+analysed = []  # design points passed to run_sweep
+
+
+def fake_run_sweep(points, executor=None):
+    analysed.extend(points)
+    return [dict(point, error=None, l_over_d_fixed_cl=0.5 * point['ct_cant'] + point['wing_span'] ** 2)
+            for point in points]
+
+
+
+@pytest.fixture(autouse=True)
+def sweep(monkeypatch):
+    del analysed[:]
+    monkeypatch.setattr(sensitivity, "run_sweep", fake_run_sweep)
+
+
+@pytest.mark.parametrize("scheme", ["forward", "central"])
+def test_baseline_record_in_both_schemes(scheme):
+    derivatives, baseline_record = gradients(BASELINE, ['ct_cant', 'wing_span'], scheme=scheme, executor=object())
+    assert baseline_record['l_over_d_fixed_cl'] == 0.5 * 20. + 34. ** 2
+    assert derivatives['l_over_d_fixed_cl']['ct_cant'] == pytest.approx(0.5)
+    # the forward difference of the square is off by the step, the central one is exact
+    assert derivatives['l_over_d_fixed_cl']['wing_span'] == pytest.approx(68., abs=0.35 if scheme == "forward" else 1e-6)
+    assert len(analysed) == (3 if scheme == "forward" else 5)
+
+
+def test_given_baseline_record_is_not_analysed_again():
+    record = dict(BASELINE, error=None, l_over_d_fixed_cl=1166.)
+    _, baseline_record = gradients(BASELINE, ['ct_cant'], scheme="central", baseline_record=record, executor=object())
+    assert baseline_record is record
+    assert all(point['ct_cant'] != BASELINE['ct_cant'] for point in analysed)
@@ -0,0 +1,31 @@
+from HelperFunction.slot_profiler import profile_change
+
+
+class Tip:
+    def __init__(self, wing):
+        self.wing = wing
+
+    @property
+    def load(self):
+        if not self.wing.with_tip:
+            raise RuntimeError("the tip is no longer part of the wing")
+        return 1.
+
+
+class Wing:
+    def __init__(self):
+        self.with_tip = True
+        self.tip = Tip(self)
+
+    @property
+    def total(self):
+        return 2. + (self.tip.load if self.with_tip else 0.)
+
+
+def test_failures_are_reported():
+    wing = Wing()
+    profiler = profile_change(wing, lambda w: w.total, with_tip=False)
+    assert profiler.counts["Wing.total"] == 1
+    assert profiler.invalidated == {"Wing.total": 1}
+    assert [(slot, type(error)) for _, slot, error in profiler.failures.values()] == [("load", RuntimeError)]
+    assert "Tip.load" in profiler.table()
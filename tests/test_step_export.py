@@ -0,0 +1,47 @@
+import json
+import os
+
+from HelperFunction import step_export
+from HelperFunction.step_export import MANIFEST, export_variants
+
+
+class SerialExecutor:
+    def map(self, function, tasks, chunksize=1):
+        return map(function, tasks)
+
+
+def test_only_changed_components_are_built(tmp_path, monkeypatch):
+    geometry = {}  # shapes that changed, by component
+    built = []
+
+    def component_keys(task):
+        params, names = task
+        return ["{:}-{:}".format(name, geometry.get(name, params['wing_span'])) for name in names]
+
+    def export_component(task):
+        params, name, path = task
+        built.append(name)
+        with open(path, "w") as f:
+            f.write(name)
+        return path
+
+    monkeypatch.setattr(step_export, "component_keys", component_keys)
+    monkeypatch.setattr(step_export, "export_component", export_component)
+    variants = {'a': {'wing_span': 34.}}
+    components = ['fuselage', 'right_wing']
+
+    exported = export_variants(variants, str(tmp_path), components, executor=SerialExecutor())
+    assert built == components
+    assert [written for _, written in exported['a']] == [True, True]
+
+    del built[:]
+    exported = export_variants(variants, str(tmp_path), components, executor=SerialExecutor())
+    assert built == []
+    assert exported['a'] == [(os.path.join(str(tmp_path), "a_fuselage.stp"), False),
+                             (os.path.join(str(tmp_path), "a_right_wing.stp"), False)]
+
+    geometry['fuselage'] = 'longer'
+    export_variants(variants, str(tmp_path), components, executor=SerialExecutor())
+    assert built == ['fuselage']
+    with open(os.path.join(str(tmp_path), MANIFEST)) as f:
+        assert json.load(f)['a_fuselage.stp'] == 'fuselage-longer'
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from HelperFunction.avl_results import AvlResults
+from HelperFunction.strip_loads import strip_dihedral, strip_loads
+
+# flat wing of 5 strips of 2 m from y = 0 to 10, with a winglet of 2 strips of 1 m standing at 90 deg on its tip
+LEADING_EDGES = {'wing': np.array([[0., 0.], [10., 0.]]),
+                 'winglet': np.array([[10., 0.], [10., 2.]])}
+
+
+def surface(y, z, chord, width, c_cl):
+    right = {'Yle': y, 'Zle': z, 'Chord': [chord] * len(y), 'Area': [chord * width] * len(y), 'c cl': c_cl,
+             'cm_c/4': [-0.1] * len(y)}
+    # the strips of the mirrored left half follow those of the right half
+    return {quantity: values + (list(-np.array(values)) if quantity == 'Yle' else values)
+            for quantity, values in right.items()}
+
+
+RESULTS = {'case': {'Totals': {'CLtot': 0.5},
+                    'StripForces': {'wing': surface([1., 3., 5., 7., 9.], [0.] * 5, 2., 2., [5., 4., 3., 2., 1.]),
+                                    'winglet': surface([10., 10.], [0.5, 1.5], 1., 1., [1., 0.5])}}}
+
+
+def test_dihedral_from_the_sections():
+    # the strips next to the junction take the angle of their own surface
+    assert strip_dihedral(np.array([1., 9.]), np.zeros(2), LEADING_EDGES['wing']) == pytest.approx([0., 0.])
+    assert strip_dihedral(np.array([10., 10.]), np.array([0.5, 1.5]), LEADING_EDGES['winglet']) == \
+        pytest.approx([np.pi / 2] * 2)
+
+
+@pytest.mark.parametrize("results", [RESULTS, AvlResults.from_dict(RESULTS)], ids=["dict", "arrays"])
+def test_wing_with_vertical_winglet(results):
+    loads = strip_loads(results, ['wing', 'winglet'], LEADING_EDGES, q=2.)
+    # all 5 strips of the right wing and both of the winglet
+    assert loads.y[0] == pytest.approx([1., 3., 5., 7., 9., 10., 10.])
+    # strip forces q c_cl width: wing 20, 16, 12, 8, 4 N upwards, winglet 2, 1 N inboard
+    # pitching moments q cm c^2 width: -1.6 Nm per wing strip, -0.2 Nm per winglet strip
+    # at the root, the winglet forces are horizontal and its moments have no component along y
+    assert loads.root_shear[0] == pytest.approx(60.)
+    assert loads.root_bending[0] == pytest.approx(20 * 1 + 16 * 3 + 12 * 5 + 8 * 7 + 4 * 9 + 2 * 0.5 + 1 * 1.5)
+    assert loads.root_torsion[0] == pytest.approx(-8.)
+    # at the winglet root (10, 0), bending is about the x-axis and torsion about z
+    assert loads.shear[0, 5] == pytest.approx(3.)
+    assert loads.bending[0, 5] == pytest.approx(2 * 0.5 + 1 * 1.5)
+    assert loads.torsion[0, 5] == pytest.approx(-0.4)
+    # the last wing strip carries the winglet loads as well
+    assert loads.shear[0, 4] == pytest.approx(4.)
+    assert loads.bending[0, 4] == pytest.approx(4 * 1 + 2 * 0.5 + 1 * 1.5)
@@ -0,0 +1,55 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+pytest.importorskip("kbeutils")  # the panel policies hold avl.Spacing values
+
+from HelperFunction.panel_policy import COARSE, PanelPolicy, policy_label, resolve_policy  # noqa: E402
+from HelperFunction.results_store import ResultsStore  # noqa: E402
+from HelperFunction.sweep import _store_records, group_altitudes, sweep_grid  # noqa: E402
+
+# the sweep workers build ParaPy aircraft; without ParaPy only the bookkeeping can be tested
+requires_parapy = pytest.mark.skipif(importlib.util.find_spec("parapy") is None,
+                                     reason="ParaPy is needed to build the aircraft")
+
+
+def test_policy_label_round_trip():
+    assert policy_label(COARSE) == "coarse"
+    assert resolve_policy(policy_label(COARSE)) is COARSE
+    assert resolve_policy("FINE").name == "fine"
+    assert policy_label(None) is None
+    custom = PanelPolicy(panel_width=0.75)
+    assert policy_label(custom) == repr(custom) == repr(PanelPolicy(panel_width=0.75))
+    with pytest.raises(ValueError):
+        resolve_policy("finest")
+
+
+def test_group_altitudes_with_panel_policy():
+    points = sweep_grid(panel_policy=[COARSE], TYPE_winglet=[0, 1], altitude=[1000, 9000])
+    groups = group_altitudes(points)
+    assert [altitudes for _, altitudes, _ in groups] == [[1000, 9000], [1000, 9000]]
+
+
+def test_store_records_with_panel_policy(tmp_path):
+    records = [{'panel_policy': policy_label(COARSE), 'altitude': 1000., 'CL_fixed_cl': 0.5, 'error': None,
+                'diagnostics': []},
+               {'panel_policy': policy_label(PanelPolicy(panel_width=0.5)), 'altitude': 9000., 'CL_fixed_cl': 0.5,
+                'error': None, 'diagnostics': []}]
+    store = ResultsStore(str(tmp_path))
+    _store_records(records, store)
+    data = store.read(['panel_policy', 'altitude'])
+    assert data['panel_policy'][0] == "coarse"
+    assert np.allclose(data['altitude'], [1000., 9000.])
+
+
+@requires_parapy
+def test_stored_sweep_with_panel_policy(tmp_path):
+    from HelperFunction.sweep import run_sweep
+
+    store = ResultsStore(str(tmp_path / "store"))
+    points = sweep_grid(panel_policy=[COARSE], TYPE_winglet=[0], altitude=[1000, 9000])
+    records = run_sweep(points, max_workers=1, work_dir=str(tmp_path / "work"), store=store)
+    assert [record['panel_policy'] for record in records] == ["coarse", "coarse"]
+    data = store.read(['panel_policy', 'altitude'])
+    assert list(data['panel_policy']) == ["coarse", "coarse"]